@@ -2,6 +2,8 @@
 ASGI config for Team_Production_Report project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The JSON APIs of the tree pages are async views; see "ASGI profile" in the
+README for serving them with an ASGI server.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
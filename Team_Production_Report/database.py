@@ -0,0 +1,125 @@
+"""
+Database settings from the environment (python-decouple: environment
+variables or a ``.env`` file next to ``manage.py``).
+
+``DB_ENGINE`` picks the profile:
+
+``sqlite`` (default)
+    The project file (``DB_NAME``) in WAL mode, so readers never wait for the
+    writer, with ``synchronous=NORMAL`` (safe in WAL, one fsync per
+    checkpoint instead of per commit) and a busy timeout. Transactions start
+    ``IMMEDIATE``: a deferred transaction that reads and then writes cannot
+    wait for the write lock and fails with "database is locked" at once.
+
+``postgres``
+    ``DB_NAME`` / ``DB_USER`` / ``DB_PASSWORD`` / ``DB_HOST`` / ``DB_PORT``,
+    with psycopg's native connection pool (``DB_POOL``, needs
+    ``psycopg[pool]``).
+
+Without a pool, connections are kept for ``DB_CONN_MAX_AGE`` seconds and
+checked before reuse (``DB_CONN_HEALTH_CHECKS``). Django refuses persistent
+connections together with a pool, so ``CONN_MAX_AGE`` is 0 when pooling.
+Use ``DB_CONN_MAX_AGE=0`` under ASGI.
+
+Setting ``DB_REPLICA_NAME`` (and ``DB_REPLICA_HOST`` etc. for PostgreSQL,
+defaulting to the primary's) adds a ``replica`` database with the same
+profile, which ``projects.replica`` sends the reporting reads to. Two SQLite
+files stand in for a primary and its replica locally; ``manage.py
+sync_replica`` copies one into the other.
+"""
+from decouple import config
+
+REPLICA_ALIAS = 'replica'
+
+SQLITE_JOURNAL_MODES = ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF')
+SQLITE_SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def sqlite_database(name, journal_mode='WAL', synchronous='NORMAL', busy_timeout=5000,
+                    transaction_mode='IMMEDIATE'):
+    """Settings of a SQLite database; the pragmas run on every new connection."""
+    journal_mode, synchronous = journal_mode.upper(), synchronous.upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unknown SQLite journal mode {journal_mode!r}")
+    if synchronous not in SQLITE_SYNCHRONOUS:
+        raise ValueError(f"Unknown SQLite synchronous setting {synchronous!r}")
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': {
+            'init_command': (
+                f'PRAGMA journal_mode={journal_mode};'
+                f'PRAGMA synchronous={synchronous};'
+                f'PRAGMA busy_timeout={int(busy_timeout)}'
+            ),
+            # sqlite3's own wait for locks (seconds), used before the pragma runs
+            'timeout': busy_timeout / 1000,
+            'transaction_mode': transaction_mode,
+        },
+    }
+
+
+def postgres_database(name, user='', password='', host='localhost', port='5432', pool=True,
+                      pool_min_size=2, pool_max_size=10, pool_timeout=10):
+    """Settings of a PostgreSQL database, with psycopg's connection pool when ``pool`` is set."""
+    options = {}
+    if pool:
+        options['pool'] = {'min_size': pool_min_size, 'max_size': pool_max_size, 'timeout': pool_timeout}
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': name,
+        'USER': user,
+        'PASSWORD': password,
+        'HOST': host,
+        'PORT': port,
+        'OPTIONS': options,
+    }
+
+
+def database_from_env(base_dir):
+    """The ``default`` database configured by the DB_* variables."""
+    engine = config('DB_ENGINE', default='sqlite')
+    if engine == 'sqlite':
+        database = sqlite_database(
+            config('DB_NAME', default=str(base_dir / 'db.sqlite3')),
+            journal_mode=config('DB_SQLITE_JOURNAL_MODE', default='WAL'),
+            synchronous=config('DB_SQLITE_SYNCHRONOUS', default='NORMAL'),
+            busy_timeout=config('DB_SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+            transaction_mode=config('DB_SQLITE_TRANSACTION_MODE', default='IMMEDIATE'),
+        )
+    elif engine == 'postgres':
+        database = postgres_database(
+            config('DB_NAME', default='team_production_report'),
+            user=config('DB_USER', default=''),
+            password=config('DB_PASSWORD', default=''),
+            host=config('DB_HOST', default='localhost'),
+            port=config('DB_PORT', default='5432'),
+            pool=config('DB_POOL', default=True, cast=bool),
+            pool_min_size=config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            pool_max_size=config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            pool_timeout=config('DB_POOL_TIMEOUT', default=10, cast=int),
+        )
+    else:
+        raise ValueError(f"DB_ENGINE must be 'sqlite' or 'postgres', not {engine!r}")
+
+    pooled = bool(database['OPTIONS'].get('pool'))
+    database['CONN_MAX_AGE'] = 0 if pooled else config('DB_CONN_MAX_AGE', default=60, cast=int)
+    database['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+    return database
+
+
+def replica_from_env(primary):
+    """A read replica of ``primary`` when ``DB_REPLICA_NAME`` or ``DB_REPLICA_HOST`` is set, else None."""
+    name = config('DB_REPLICA_NAME', default='')
+    host = config('DB_REPLICA_HOST', default='')
+    if not (name or host):
+        return None
+    replica = {**primary, 'OPTIONS': dict(primary['OPTIONS']), 'NAME': name or primary['NAME']}
+    if 'postgresql' in primary['ENGINE']:
+        replica['HOST'] = host or primary['HOST']
+        replica['PORT'] = config('DB_REPLICA_PORT', default=primary['PORT'])
+        replica['USER'] = config('DB_REPLICA_USER', default=primary['USER'])
+        replica['PASSWORD'] = config('DB_REPLICA_PASSWORD', default=primary['PASSWORD'])
+    # Tests read the primary's test database through the replica alias
+    replica['TEST'] = {'MIRROR': 'default'}
+    return replica
@@ -13,6 +13,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from decouple import config
+
+from .database import REPLICA_ALIAS, database_from_env, replica_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +49,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "projects.replica.replica_stickiness_middleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -75,13 +80,27 @@ WSGI_APPLICATION = "Team_Production_Report.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Configured from the DB_* environment variables (see database.py):
+# SQLite in WAL mode by default, DB_ENGINE=postgres for PostgreSQL with pooling
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_from_env(BASE_DIR),
 }
 
+# Read replica (DB_REPLICA_NAME / DB_REPLICA_HOST). The reporting views read
+# it (projects.replica); writes, sessions and requests that follow a POST
+# within REPLICA_STICKY_SECONDS stay on the primary. Cached reports computed
+# from the replica live at most REPLICA_CACHE_TIMEOUT seconds, so replication
+# lag cannot pin a stale copy under a fresh version.
+
+_replica = replica_from_env(DATABASES["default"])
+if _replica:
+    DATABASES[REPLICA_ALIAS] = _replica
+
+DATABASE_ROUTERS = ["projects.replica.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=10, cast=int)
+REPLICA_CACHE_TIMEOUT = config("DB_REPLICA_CACHE_TIMEOUT", default=60, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,3 +145,60 @@ STATICFILES_DIRS = [
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Productivity pie chart
+# Cached PNGs are dropped whenever a Project/Resource of their period is saved;
+# set PRODUCTIVITY_CHART_PRERENDER to re-render them in a background thread.
+
+PRODUCTIVITY_CHART_CACHE_TIMEOUT = 60 * 60 * 24
+PRODUCTIVITY_CHART_PRERENDER = False
+
+
+# Server-rendered project tree (projects.tree_html), cached per period and
+# dropped when a Project/Resource of the period or a project membership changes
+
+PROJECT_TREE_HTML_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# Caches
+# "default" holds the rendered charts and tree fragments. "reports" is the
+# versioned per-period read cache of the reporting endpoints
+# (projects.read_cache). READ_CACHE_BACKEND defaults to locmem, which is per
+# process: with several workers, pick file (shared on one host), memcached or
+# redis so every worker sees the version bumps of a write.
+
+READ_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'report-reads'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache' / 'reports')),
+    'memcached': ('django.core.cache.backends.memcached.PyMemcacheCache', '127.0.0.1:11211'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+READ_CACHE_BACKEND = config('READ_CACHE_BACKEND', default='locmem')
+_read_cache_backend, _read_cache_location = READ_CACHE_BACKENDS[READ_CACHE_BACKEND]
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reports': {
+        'BACKEND': _read_cache_backend,
+        'LOCATION': config('READ_CACHE_LOCATION', default=_read_cache_location),
+        'TIMEOUT': config('READ_CACHE_TIMEOUT', default=60 * 60, cast=int),
+        # Entry cap for the backends that evict by themselves (memcached and redis use their own limits)
+        'OPTIONS': (
+            {'MAX_ENTRIES': config('READ_CACHE_MAX_ENTRIES', default=1000, cast=int)}
+            if READ_CACHE_BACKEND in ('locmem', 'file') else {}
+        ),
+    },
+}
+READ_CACHE_ALIAS = 'reports'
+
+
+# Working-day calendar (resources.working_days)
+# ISO dates; holidays are not worked, half days count as 0.5.
+
+WORKING_CALENDAR = {
+    'HOLIDAYS': [],
+    'HALF_DAYS': [],
+}
@@ -17,10 +17,11 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
+from projects.periods import period_paths
 from projects.views import dashboard_home
 
 urlpatterns = [
-    path("", dashboard_home, name="home"),
+    *period_paths("", dashboard_home, "home"),
     path("admin/", admin.site.urls),
     path("resources/", include("resources.urls")),
     path("projects/", include("projects.urls")),
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project
+from .models import MonthlyProductionSummary, Project
 
 # Register your models here.
 
@@ -24,3 +24,27 @@ class ProjectAdmin(admin.ModelAdmin):
     filter_horizontal = ('resources',)  # For ManyToMany field
     readonly_fields = ('billable_hours', 'non_billable_hours', 'created_at', 'updated_at')
     ordering = ['-year', '-month', 'project_name']
+
+
+@admin.register(MonthlyProductionSummary)
+class MonthlyProductionSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        'year',
+        'month',
+        'project_type',
+        'billable_hours',
+        'non_billable_hours',
+        'resource_present_hours',
+        'working_days',
+        'productivity_percentage',
+        'updated_at',
+    )
+    list_filter = ('year', 'month', 'project_type')
+    ordering = ['-year', '-month', 'project_type']
+
+    # Rows are derived data, maintained by signals and rebuild_monthly_summary
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,179 @@
+"""
+Batched edits from the project list grid.
+
+A batch is a list of rows ``{"id": <project>, "<field>": <days>, ...}`` with
+any of the ``BULK_EDIT_FIELDS``; fields left out keep their stored value.
+``apply_batch`` checks every row before writing any: a single query loads
+(and locks) the projects, the checks and the hours run on whole numpy
+columns, and the changed projects are written with one ``bulk_update`` in
+the same transaction. Like
+the Excel import, it then refreshes the edited periods itself, since bulk
+writes send no model signals.
+"""
+import math
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Project
+
+BULK_EDIT_FIELDS = ['present_day', 'billable_days', 'non_billable_days']
+BULK_EDIT_MAX_ROWS = 1000
+HOURS_PER_DAY = 8
+
+
+class BatchError(ValueError):
+    """The batch was rejected; ``errors`` lists ``{'row', 'id', 'field', 'message'}`` entries."""
+
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} invalid value(s)')
+        self.errors = errors
+
+
+def hours_from_days(billable_days, non_billable_days):
+    """(billable_hours, non_billable_hours) arrays for whole columns of days, by ``Project.save()``'s rule."""
+    import numpy as np
+
+    billable_days = np.asarray(billable_days, dtype=float)
+    non_billable_days = np.asarray(non_billable_days, dtype=float)
+    billable = billable_days > 0
+    return (
+        np.where(billable, billable_days * HOURS_PER_DAY, 0.0),
+        np.where(billable | (non_billable_days > 0), non_billable_days * HOURS_PER_DAY, 0.0),
+    )
+
+
+def _error(errors, row, project_id, field, message):
+    errors.append({'row': row, 'id': project_id, 'field': field, 'message': message})
+
+
+def _parse(rows):
+    """
+    Project ids, a row × field list of floats (None where not sent) and the
+    matching list of flags for the values already reported, with the errors.
+    """
+    errors = []
+    if not isinstance(rows, list) or not rows:
+        raise BatchError([{'row': None, 'id': None, 'field': None, 'message': 'Send a non-empty list of rows'}])
+    if len(rows) > BULK_EDIT_MAX_ROWS:
+        raise BatchError([{
+            'row': None, 'id': None, 'field': None, 'message': f'At most {BULK_EDIT_MAX_ROWS} rows per batch',
+        }])
+
+    ids, values, reported, seen = [], [], [], set()
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            _error(errors, index, None, None, 'Each row must be an object')
+            ids.append(None)
+            values.append([None] * len(BULK_EDIT_FIELDS))
+            reported.append([False] * len(BULK_EDIT_FIELDS))
+            continue
+        project_id = row.get('id')
+        if not isinstance(project_id, int) or isinstance(project_id, bool):
+            _error(errors, index, project_id, 'id', 'Project id must be an integer')
+            project_id = None  # Lists and objects aren't hashable; the row is rejected anyway
+        elif project_id in seen:
+            _error(errors, index, project_id, 'id', 'Project appears twice in the batch')
+        else:
+            seen.add(project_id)
+        for field in sorted(set(row) - {'id', *BULK_EDIT_FIELDS}):
+            _error(errors, index, project_id, field, 'Field cannot be edited here')
+
+        cells, bad = [], []
+        for field in BULK_EDIT_FIELDS:
+            value = row.get(field)
+            invalid = False
+            if value is not None:
+                try:
+                    if isinstance(value, bool):
+                        raise TypeError(value)
+                    value = float(value)
+                    if not math.isfinite(value):  # "nan", "inf", 1e309
+                        raise ValueError(value)
+                except (TypeError, ValueError, OverflowError):
+                    _error(errors, index, project_id, field, 'Enter a number')
+                    value, invalid = 0.0, True
+            cells.append(value)
+            bad.append(invalid)
+        ids.append(project_id)
+        values.append(cells)
+        reported.append(bad)
+    return ids, values, reported, errors
+
+
+def apply_batch(rows):
+    """
+    Validate and save a batch of grid edits, all or nothing. Returns the
+    counts and the recomputed hours of every row; raises ``BatchError``.
+    """
+    import numpy as np
+    from .signals import period_changed
+
+    ids, cells, reported, errors = _parse(rows)
+    with transaction.atomic():
+        # The rows stay locked until the batch is written, so no save in between is lost
+        projects = Project.active_objects.select_for_update().in_bulk(
+            [project_id for project_id in ids if isinstance(project_id, int)]
+        )
+        for index, project_id in enumerate(ids):
+            if isinstance(project_id, int) and project_id not in projects:
+                _error(errors, index, project_id, 'id', 'No active project with this id')
+
+        # rows × fields: the sent values, the stored ones where nothing was sent
+        sent = np.array([[math.nan if value is None else value for value in row] for row in cells], dtype=float)
+        stored = np.array([
+            [getattr(projects[project_id], field) for field in BULK_EDIT_FIELDS]
+            if project_id in projects else [0.0] * len(BULK_EDIT_FIELDS)
+            for project_id in ids
+        ], dtype=float)
+        was_sent = np.array([[value is not None for value in row] for row in cells], dtype=bool)
+        days = np.where(was_sent, sent, stored)
+
+        # Unparseable values are reported already
+        unchecked = was_sent & ~np.array(reported, dtype=bool)
+        bad_rows, bad_fields = np.nonzero(unchecked & (days < 0))
+        for index, field_index in zip(bad_rows.tolist(), bad_fields.tolist()):
+            _error(errors, index, ids[index], BULK_EDIT_FIELDS[field_index], 'Enter a number of days, 0 or more')
+        if errors:
+            raise BatchError(sorted(errors, key=lambda error: error['row']))
+
+        billable_column = BULK_EDIT_FIELDS.index('billable_days')
+        non_billable_column = BULK_EDIT_FIELDS.index('non_billable_days')
+        billable_hours, non_billable_hours = hours_from_days(days[:, billable_column], days[:, non_billable_column])
+        current_hours = np.array(
+            [[projects[project_id].billable_hours, projects[project_id].non_billable_hours] for project_id in ids],
+            dtype=float,
+        )
+        new_hours = np.column_stack([billable_hours, non_billable_hours])
+        changed = (days != stored).any(axis=1) | (new_hours != current_hours).any(axis=1)
+
+        # bulk_update skips auto_now, so updated_at is stamped explicitly
+        now = timezone.now()
+        updated = []
+        for index in np.flatnonzero(changed).tolist():
+            project = projects[ids[index]]
+            for field, value in zip(BULK_EDIT_FIELDS, days[index].tolist()):
+                setattr(project, field, value)
+            project.billable_hours, project.non_billable_hours = new_hours[index].tolist()
+            project.updated_at = now
+            updated.append(project)
+
+        Project.objects.bulk_update(
+            updated, BULK_EDIT_FIELDS + ['billable_hours', 'non_billable_hours', 'updated_at'], batch_size=500,
+        )
+    for year, month in sorted({(project.year, project.month) for project in updated}):
+        period_changed(year, month)
+
+    return {
+        'updated': len(updated),
+        'unchanged': len(ids) - len(updated),
+        'rows': [
+            {
+                'id': project_id,
+                **dict(zip(BULK_EDIT_FIELDS, days[index].tolist())),
+                'billable_hours': billable_hours[index].item(),
+                'non_billable_hours': non_billable_hours[index].item(),
+            }
+            for index, project_id in enumerate(ids)
+        ],
+    }
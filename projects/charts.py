@@ -0,0 +1,102 @@
+"""
+Productivity pie chart rendering and caching.
+
+Charts are drawn with matplotlib's object-oriented ``Figure`` API (no pyplot
+global state, so rendering is safe under a threaded server) and cached as PNG
+bytes keyed on (year, month, productivity percentage).
+
+matplotlib is only imported inside ``render_productivity_pie``: this module is
+loaded by the URLconf and the app's signal receivers, so importing it at the
+top would cost every worker and management command its startup time and
+memory even when no chart is ever drawn.
+"""
+import hashlib
+import io
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+CHART_CACHE_TIMEOUT = getattr(settings, 'PRODUCTIVITY_CHART_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def chart_version(year, month, productivity_percentage):
+    """Short content hash identifying one rendering of a period's chart."""
+    raw = f"{year}:{month}:{productivity_percentage:.4f}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _chart_key(year, month, productivity_percentage):
+    return f"productivity_pie:{year}:{month}:{productivity_percentage:.4f}"
+
+
+def _period_key(year, month):
+    # Remembers which chart key is current for the period so it can be invalidated
+    return f"productivity_pie:{year}:{month}"
+
+
+def render_productivity_pie(productivity_percentage):
+    """Render the productive / not productive pie chart and return PNG bytes."""
+    from matplotlib.figure import Figure  # Deferred: see module docstring
+
+    fig = Figure(figsize=(8, 6), dpi=100)
+    ax = fig.subplots()
+    ax.pie(
+        [productivity_percentage, 100 - productivity_percentage],
+        labels=['Productive', 'Not Productive'],
+        colors=['#4CAF50', '#FF5252'],
+        autopct='%1.1f%%',
+        startangle=90,
+    )
+    ax.axis('equal')
+    ax.set_title('Team Productivity Percentage', fontsize=14, fontweight='bold')
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', facecolor='white', edgecolor='none')
+    return buf.getvalue()
+
+
+def get_productivity_pie(year, month, productivity_percentage):
+    """Return the cached PNG for the period, rendering it on a cache miss."""
+    key = _chart_key(year, month, productivity_percentage)
+    png = cache.get(key)
+    if png is None:
+        png = render_productivity_pie(productivity_percentage)
+        cache.set_many({key: png, _period_key(year, month): key}, CHART_CACHE_TIMEOUT)
+    return png
+
+
+def invalidate_productivity_pie(year, month):
+    """Drop the cached chart of a period (called when its data changes)."""
+    key = cache.get(_period_key(year, month))
+    cache.delete_many([k for k in (key, _period_key(year, month)) if k])
+
+
+def prerender_productivity_pie(year, month):
+    """Compute the period's productivity and warm the chart cache."""
+    from .reports import attendance_summary
+
+    summary = attendance_summary(year, month)
+    if summary['team_productivity_hours'] > 0 or summary['total_present_hours'] > 0:
+        get_productivity_pie(year, month, summary['team_productivity_percentage'])
+
+
+def schedule_prerender(year, month):
+    """
+    Re-render the period's chart in a background thread once the current
+    transaction commits, if ``PRODUCTIVITY_CHART_PRERENDER`` is enabled.
+    """
+    if not getattr(settings, 'PRODUCTIVITY_CHART_PRERENDER', False):
+        return
+
+    def run():
+        try:
+            prerender_productivity_pie(year, month)
+        finally:
+            connection.close()  # Threads get their own connection; don't leak it
+
+    def start():
+        threading.Thread(target=run, daemon=True).start()
+
+    transaction.on_commit(start)
@@ -0,0 +1,112 @@
+"""
+Conditional GET support for the period-scoped views.
+
+A period's freshness is the latest ``updated_at`` and the row count over its
+projects, resources and project memberships, read in one UNION ALL query on
+the period indexes. Saves (soft deletes included) move the timestamp; hard
+deletes and membership changes move a count. The views are wrapped with
+``period_conditional`` (``django.views.decorators.http.condition``), so a
+client revalidating an unchanged period gets a 304 without the report being
+built.
+
+Requests that take the period from the session default get an ETag only: the
+URL is the same for every period, so a Last-Modified date of one month could
+wrongly validate a copy of another. Requests with the period in the URL (see
+``periods``) get both. Responses are marked ``no-cache``, so clients
+revalidate them on every use instead of guessing a lifetime.
+"""
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.db.models import Count, Max, Value
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from resources.models import Resource
+from .models import Project
+from .periods import aresolve_period, resolve_period
+
+
+def _stamp(queryset, field):
+    # Constant group, so each table yields exactly one (last, rows) row
+    return queryset.order_by().annotate(group=Value(1)).values('group').annotate(
+        last=Max(field), rows=Count('pk')
+    ).values('last', 'rows')
+
+
+def _freshness_query(year, month):
+    period = {'year': year, 'month': month} if year and month else {}
+    memberships = Project.resources.through.objects.filter(
+        **{f'project__{key}': value for key, value in period.items()}
+    )
+    return _stamp(Project.objects.filter(**period), 'updated_at').union(
+        _stamp(Resource.objects.filter(**period), 'updated_at'),
+        _stamp(memberships, 'project__updated_at'),
+        all=True,
+    )
+
+
+def _combine(rows):
+    stamps = [row['last'] for row in rows if row['last'] is not None]
+    return (max(stamps) if stamps else None), sum(row['rows'] for row in rows)
+
+
+def period_freshness(year=None, month=None):
+    """(latest modification or None, row count) of a period, or of all history."""
+    return _combine(list(_freshness_query(year, month)))
+
+
+async def aperiod_freshness(year=None, month=None):
+    """Async ``period_freshness``."""
+    return _combine([row async for row in _freshness_query(year, month)])
+
+
+def request_freshness(request, year, month):
+    """``period_freshness`` of the request's period, read once per request (condition() asks twice)."""
+    cached = getattr(request, '_period_freshness', None)
+    if cached is None or cached[0] != (year, month):
+        cached = request._period_freshness = ((year, month), period_freshness(year, month))
+    return cached[1]
+
+
+def freshness_stamp(freshness):
+    """A ``period_freshness`` pair as a string, for ETags and cache keys."""
+    last, rows = freshness
+    return f"{last.strftime('%Y%m%d%H%M%S%f') if last else '0'}-{rows}"
+
+
+def _etag(request, year, month):
+    period = f"{year}-{month}" if year and month else "all"
+    return f"{period}-{freshness_stamp(request_freshness(request, year, month))}"
+
+
+def period_etag(request, year=None, month=None, *args, **kwargs):
+    """ETag of the URL's period, else of the session default (all history when there is none)."""
+    return _etag(request, *resolve_period(request, year, month))
+
+
+def period_last_modified(request, year=None, month=None, *args, **kwargs):
+    """Last modification of the URL's period; None when the period comes from the session."""
+    if not (year and month):
+        return None
+    return request_freshness(request, year, month)[0]
+
+
+def period_conditional(view):
+    """Answer conditional GETs of a period-scoped view, with a 304 when its period is unchanged."""
+    conditional = cache_control(no_cache=True)(
+        condition(etag_func=period_etag, last_modified_func=period_last_modified)(view)
+    )
+    if not iscoroutinefunction(view):
+        return conditional
+
+    @wraps(view)
+    async def preloaded(request, *args, **kwargs):
+        # condition() calls the ETag functions synchronously even around an
+        # async view: load the session and the freshness row first, so they
+        # find everything on the request and don't touch the database
+        year, month = await aresolve_period(request, kwargs.get('year'), kwargs.get('month'))
+        request._period_freshness = ((year, month), await aperiod_freshness(year, month))
+        return await conditional(request, *args, **kwargs)
+
+    return preloaded
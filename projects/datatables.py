@@ -0,0 +1,143 @@
+"""
+Server-side processing for DataTables list pages.
+
+Implements the DataTables server-side protocol (``draw``, ``start``,
+``length``, ``search[value]``, ``order[i][column|dir]``) with filtering,
+sorting and paging done in SQL. When the client sends back the
+``next_cursor`` of the previous page (as ``cursor``), the next page is
+fetched with a keyset condition on the sort columns instead of an OFFSET, so
+deep pages cost the same as the first one. NULLs sort last in both
+directions on every backend, and the keyset condition matches them
+explicitly, so nullable sort columns page without losing rows.
+"""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import F, Q
+from django.http import JsonResponse
+
+MAX_PAGE_LENGTH = 1000
+
+
+def _int_param(request, name, default):
+    try:
+        return int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _ordering(request, sortable_columns):
+    """(field, descending) pairs requested by the client, ending with the pk as tie-breaker."""
+    ordering = []
+    index = 0
+    while f'order[{index}][column]' in request.GET:
+        field = sortable_columns.get(_int_param(request, f'order[{index}][column]', -1))
+        if field and field not in {f for f, _ in ordering}:
+            ordering.append((field, request.GET.get(f'order[{index}][dir]') == 'desc'))
+        index += 1
+    ordering.append(('pk', ordering[-1][1] if ordering else False))
+    return ordering
+
+
+def _encode_cursor(ordering, search, values):
+    payload = json.dumps({'o': ordering, 's': search, 'v': values})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor, ordering, search):
+    """Sort values of the previous page's last row, if the cursor matches this query."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict):
+        return None  # Valid JSON, but not a cursor this endpoint issued
+    if payload.get('o') != [list(item) for item in ordering] or payload.get('s') != search:
+        return None
+    values = payload.get('v')
+    if not isinstance(values, list) or len(values) != len(ordering) or values[-1] is None:
+        return None
+    return values
+
+
+def _order_by(ordering):
+    # NULLs last either way, so the keyset below doesn't depend on the backend's default
+    return [
+        F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+        for field, descending in ordering
+    ]
+
+
+def _keyset_filter(ordering, values):
+    """
+    Rows strictly after ``values`` in ``ordering`` (a row-value comparison
+    spelled out with Q). With NULLs last, everything non-NULL comes before a
+    NULL and nothing comes after one except on the later columns.
+    """
+    conditions = []
+    for position, (field, descending) in enumerate(ordering):
+        value = values[position]
+        if value is None:
+            continue
+        equal = Q(**{
+            f'{f}__isnull' if v is None else f: True if v is None else v
+            for (f, _), v in zip(ordering[:position], values[:position])
+        })
+        after = Q(**{f'{field}__{"lt" if descending else "gt"}': value})
+        if field != 'pk':
+            after |= Q(**{f'{field}__isnull': True})
+        conditions.append(equal & after)
+    return reduce(or_, conditions)
+
+
+def _sort_value(obj, field):
+    for part in field.split('__'):
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def datatables_response(request, queryset, sortable_columns, search, serialize):
+    """
+    Answer a DataTables server-side request for ``queryset``.
+
+    ``sortable_columns`` maps column indexes to model field paths,
+    ``search(queryset, term)`` applies the global search box and
+    ``serialize(obj, row_number)`` turns an object into a row.
+    """
+    draw = _int_param(request, 'draw', 0)
+    start = max(0, _int_param(request, 'start', 0))
+    length = _int_param(request, 'length', 25)
+    length = MAX_PAGE_LENGTH if length < 0 else min(length, MAX_PAGE_LENGTH)
+    term = request.GET.get('search[value]', '').strip()
+
+    records_total = queryset.count()
+    if term:
+        queryset = search(queryset, term)
+        records_filtered = queryset.count()
+    else:
+        records_filtered = records_total
+
+    ordering = _ordering(request, sortable_columns)
+    queryset = queryset.order_by(*_order_by(ordering))
+
+    values = _decode_cursor(request.GET['cursor'], ordering, term) if request.GET.get('cursor') else None
+    if values is not None:
+        page = list(queryset.filter(_keyset_filter(ordering, values))[:length])
+    else:
+        page = list(queryset[start:start + length])
+
+    next_cursor = None
+    if page and len(page) == length:
+        next_cursor = _encode_cursor(ordering, term, [_sort_value(page[-1], field) for field, _ in ordering])
+
+    return JsonResponse({
+        'draw': draw,
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': [serialize(obj, start + number) for number, obj in enumerate(page, start=1)],
+        'next_cursor': next_cursor,
+    })
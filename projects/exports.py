@@ -0,0 +1,176 @@
+"""
+CSV and XLSX export of the attendance report.
+
+The rows of the attendance page (the resource table, then one table per
+project type, each closed by a Total row) come from ``attendance_rows``,
+which reads every table in one ordered queryset ``.iterator()`` and keeps
+only running totals. A month, a range of months and all history all export
+in constant memory:
+
+* CSV is written row by row through ``csv.writer`` on a pseudo-buffer and
+  streamed as it is produced.
+* XLSX goes through an openpyxl write-only workbook, which spools each sheet
+  to disk as rows are appended; the finished file is streamed from a
+  temporary file.
+
+User-entered names that start like a formula are escaped by each format: a
+leading apostrophe in CSV, a quote-prefixed text cell in XLSX (which keeps
+the name as it is).
+"""
+import csv
+import tempfile
+
+from django.db.models import Case, IntegerField, Prefetch, Value, When
+
+from resources.models import Resource
+from .models import Project
+from .streaming import chunked
+
+# Rows fetched per database round trip, and CSV rows per streamed chunk
+EXPORT_CHUNK_SIZE = 2000
+FILE_BLOCK_SIZE = 64 * 1024
+
+RESOURCE_HEADER = ['Year', 'Month', 'Resource', 'Working Days', 'Present Days', 'Present Hours']
+PROJECT_HEADER = [
+    'Year', 'Month', 'Project', 'Resources', 'Assigned', 'POC', 'Days',
+    'Billable Days', 'Non-Billable Days', 'Billable Hours', 'Non-Billable Hours',
+]
+# Leading characters a spreadsheet would run as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _looks_like_formula(value):
+    return isinstance(value, str) and value.startswith(FORMULA_PREFIXES)
+
+
+def _csv_text(value):
+    # A spreadsheet opening the CSV must not run user-entered names as formulas
+    return "'" + value if _looks_like_formula(value) else value
+
+
+def _xlsx_cell(sheet, value):
+    # Stored as text shown as typed, never as a formula (openpyxl would write one)
+    if not _looks_like_formula(value):
+        return value
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.data_type = 's'
+    cell.quotePrefix = True
+    return cell
+
+
+def _total_row(label_columns, totals):
+    return ['Total', *[''] * (label_columns - 1), *totals]
+
+
+def attendance_rows(period_q):
+    """
+    Yield ``(table, row)`` pairs of the attendance report for the periods
+    matching ``period_q``: each table's header row first, its data rows, then
+    its Total row. Tables are "Resources" and one per project type present.
+    """
+    resources = Resource.active_objects.filter(period_q).order_by('year', 'month', 'resource_name').values_list(
+        'year', 'month', 'resource_name', 'working_days', 'present_day', 'present_hours',
+    )
+    yield 'Resources', RESOURCE_HEADER
+    totals = [0.0, 0.0, 0.0]
+    for year, month, name, *numbers in resources.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        totals = [total + (number or 0) for total, number in zip(totals, numbers)]
+        yield 'Resources', [year, month, name, *numbers]
+    yield 'Resources', _total_row(3, totals)
+
+    # All types in one query, in the order of the choices (as on the page); a
+    # table ends where the type changes
+    type_order = Case(
+        *[When(project_type=code, then=Value(index)) for index, (code, _) in enumerate(Project.PROJECT_TYPE_CHOICES)],
+        default=Value(len(Project.PROJECT_TYPE_CHOICES)), output_field=IntegerField(),
+    )
+    projects = Project.active_objects.filter(period_q).order_by(
+        type_order, 'project_type', 'year', 'month', 'project_name'
+    ).select_related('assign_project', 'poc').only(
+        'year', 'month', 'project_type', 'project_name', 'present_day', 'billable_days',
+        'non_billable_days', 'billable_hours', 'non_billable_hours',
+        'assign_project__resource_name', 'poc__resource_name',
+    ).prefetch_related(
+        Prefetch('resources', queryset=Resource.objects.only('id', 'resource_name').order_by('resource_name'))
+    )
+    labels = dict(Project.PROJECT_TYPE_CHOICES)
+    table = totals = None
+    for project in projects.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        label = labels.get(project.project_type, project.project_type)
+        if label != table:
+            if table is not None:
+                yield table, _total_row(6, totals)
+            table, totals = label, [0.0] * 5
+            yield table, PROJECT_HEADER
+        numbers = [
+            project.present_day, project.billable_days, project.non_billable_days,
+            project.billable_hours, project.non_billable_hours,
+        ]
+        totals = [total + number for total, number in zip(totals, numbers)]
+        yield table, [
+            project.year, project.month, project.project_name,
+            ', '.join(resource.resource_name for resource in project.resources.all()),
+            project.assign_project.resource_name if project.assign_project else '',
+            project.poc.resource_name if project.poc else '',
+            *numbers,
+        ]
+    if table is not None:
+        yield table, _total_row(6, totals)
+
+
+class Echo:
+    """Pseudo-buffer for ``csv.writer``: ``write`` returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(rows):
+    """
+    The report as CSV text chunks: tables one after another, each introduced
+    by its title and separated by a blank line. Starts with a BOM so Excel
+    reads the file as UTF-8.
+    """
+    writer = csv.writer(Echo())
+    current = None
+    prefix = '\ufeff'
+    for chunk in chunked(rows, EXPORT_CHUNK_SIZE // 4):
+        lines = [prefix]
+        prefix = ''
+        for table, row in chunk:
+            if table != current:
+                if current is not None:
+                    lines.append(writer.writerow([]))
+                lines.append(writer.writerow([table]))
+                current = table
+            lines.append(writer.writerow([_csv_text(value) for value in row]))
+        yield ''.join(lines)
+
+
+def xlsx_file(rows):
+    """
+    The report as an XLSX workbook in a temporary file (positioned at the
+    start), one sheet per table.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = current = None
+    for table, row in rows:
+        if table != current:
+            sheet, current = workbook.create_sheet(title=table[:31]), table
+        sheet.append([_xlsx_cell(sheet, value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def file_blocks(file):
+    """Read ``file`` in blocks, closing it at the end."""
+    with file:
+        while block := file.read(FILE_BLOCK_SIZE):
+            yield block
@@ -0,0 +1,192 @@
+import asyncio
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+from projects.models import Project
+from resources.models import Resource
+
+YEAR, MONTH = 2025, 5
+
+ENDPOINTS = [
+    ('project list', 'projects:project_list_api'),
+    ('project tree', 'projects:project_tree'),
+    ('resource list', 'resources:resource_list_api'),
+    ('resource tree', 'resources:resource_tree'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and compare the throughput and latency of the async JSON APIs '
+        'served by the WSGI handler (a pool of worker threads) and by the ASGI handler (one event loop) '
+        'under concurrent, slow clients'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resources', type=int, default=100, help='Resources in the period')
+        parser.add_argument('--projects', type=int, default=80, help='Projects in the period')
+        parser.add_argument('--members', type=int, default=4, help='Resources assigned per project')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and server')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients')
+        parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads')
+        parser.add_argument(
+            '--client-delay', type=float, default=50,
+            help='Milliseconds each client takes to read a response (a slow network holds the worker)',
+        )
+        parser.add_argument(
+            '--read-cache', action='store_true',
+            help='Keep the per-period read cache (by default it is disabled so the views do their work)',
+        )
+
+    def handle(self, *args, **options):
+        self.delay = options['client_delay'] / 1000
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        results = []
+        try:
+            self.seed(options['resources'], options['projects'], options['members'])
+            caches = None if options['read_cache'] else {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'reports': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            }
+            with override_settings(**({'CACHES': caches} if caches else {})):
+                for name, url_name in ENDPOINTS:
+                    url = reverse(url_name, args=[YEAR, MONTH])
+                    for server, run in (('wsgi', self.run_wsgi), ('asgi', self.run_asgi)):
+                        results.append((name, server, *run(
+                            url, options['requests'], options['concurrency'], options['threads']
+                        )))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(self.style.NOTICE(
+            f'Summary ({options["concurrency"]} clients, {options["client_delay"]:.0f} ms client read time, '
+            f'{options["threads"]} WSGI threads vs one ASGI event loop)'
+        ))
+        self.stdout.write(f'{"endpoint":<16}{"server":<8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"bytes":>10}')
+        for name, server, throughput, p50, p95, size in results:
+            self.stdout.write(f'{name:<16}{server:<8}{throughput:>10.1f}{p50:>10.1f}{p95:>10.1f}{size:>10}')
+        self.stdout.write(
+            'Both handlers run the same async views. The async ORM runs queries in one thread per '
+            'process, so ASGI gains where workers would otherwise wait on clients, not on the database.'
+        )
+
+    def seed(self, resources, projects, members):
+        rng = random.Random(42)
+        Resource.objects.bulk_create([
+            Resource(resource_name=f'Resource {i:04d}', year=YEAR, month=MONTH, working_days=22)
+            for i in range(resources)
+        ])
+        resource_ids = list(Resource.objects.values_list('id', flat=True))
+        Project.objects.bulk_create([
+            Project(
+                project_name=f'Project {i:04d}', year=YEAR, month=MONTH,
+                poc_id=rng.choice(resource_ids), assign_project_id=rng.choice(resource_ids),
+            )
+            for i in range(projects)
+        ])
+        through = Project.resources.through
+        through.objects.bulk_create([
+            through(project_id=pk, resource_id=resource_id)
+            for pk in Project.objects.values_list('id', flat=True)
+            for resource_id in rng.sample(resource_ids, min(members, len(resource_ids)))
+        ])
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {resources} resources, {projects} projects, {through.objects.count()} memberships'
+        ))
+
+    def summarize(self, latencies, elapsed, size):
+        latencies = sorted(latencies)
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        return len(latencies) / elapsed, statistics.median(latencies) * 1000, p95 * 1000, size
+
+    def run_wsgi(self, url, requests, concurrency, threads):
+        """Clients share ``threads`` workers; a worker stays busy while its client reads the response."""
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        workers = threading.Semaphore(threads)
+        latencies, sizes = [], []
+
+        def client(count):
+            for _ in range(count):
+                started = time.perf_counter()
+                with workers:
+                    response = handler(factory.get(url).environ, lambda status, headers, exc_info=None: None)
+                    sizes.append(sum(len(chunk) for chunk in response))
+                    response.close()
+                    time.sleep(self.delay)
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(client, count) for count in self.split(requests, concurrency)]:
+                future.result()  # Re-raise a failed request
+        return self.summarize(latencies, time.perf_counter() - started, max(sizes))
+
+    def run_asgi(self, url, requests, concurrency, threads):
+        """All clients are served by one event loop; a slow client only suspends its own request."""
+        return asyncio.run(self.asgi_clients(url, requests, concurrency))
+
+    async def asgi_clients(self, url, requests, concurrency):
+        handler = ASGIHandler()
+        latencies, sizes = [], []
+
+        async def client(count):
+            for _ in range(count):
+                started = time.perf_counter()
+                sizes.append(await self.asgi_request(handler, url))
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(count) for count in self.split(requests, concurrency)))
+        return self.summarize(latencies, time.perf_counter() - started, max(sizes))
+
+    async def asgi_request(self, handler, url):
+        parts = urlsplit(url)
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': parts.path, 'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(), 'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+        }
+        sent = asyncio.Event()
+        size = 0
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Django listens for a disconnect while the view runs
+            await sent.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal size
+            if message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+                if not message.get('more_body'):
+                    await asyncio.sleep(self.delay)
+                    sent.set()
+
+        await handler(scope, receive, send)
+        return size
+
+    @staticmethod
+    def split(requests, clients):
+        """Requests per client, as even as possible."""
+        return [requests // clients + (1 if i < requests % clients else 0) for i in range(min(clients, requests))]
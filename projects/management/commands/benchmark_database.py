@@ -0,0 +1,144 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.db.models import Count, F, Sum
+from decouple import config
+from projects.models import Project
+from resources.models import Resource
+from Team_Production_Report.database import postgres_database, sqlite_database
+
+YEAR, MONTH = 2025, 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare read/write throughput of the database profiles under concurrent dashboard reads and '
+        'import-style writes, each on its own throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5, help='Run time per profile')
+        parser.add_argument('--readers', type=int, default=8, help='Threads running report queries')
+        parser.add_argument('--writers', type=int, default=2, help='Threads running import transactions')
+        parser.add_argument('--resources', type=int, default=500, help='Resources in the benchmark period')
+        parser.add_argument(
+            '--postgres', action='store_true',
+            help='Also run the pooled PostgreSQL profile with the DB_* credentials (needs psycopg[pool])',
+        )
+
+    def handle(self, *args, **options):
+        workdir = Path(tempfile.mkdtemp(prefix='db-benchmark-'))
+        profiles = {
+            # The settings before the database layer: rollback journal, deferred transactions
+            'sqlite legacy': sqlite_database(
+                str(workdir / 'legacy.sqlite3'), journal_mode='DELETE', synchronous='FULL',
+                transaction_mode=None,
+            ),
+            'sqlite wal': sqlite_database(str(workdir / 'wal.sqlite3')),
+        }
+        if options['postgres']:
+            profiles['postgres pool'] = postgres_database(
+                config('DB_NAME', default='team_production_report'),
+                user=config('DB_USER', default=''), password=config('DB_PASSWORD', default=''),
+                host=config('DB_HOST', default='localhost'), port=config('DB_PORT', default='5432'),
+                pool_max_size=options['readers'] + options['writers'],
+            )
+
+        results = []
+        for name, database in profiles.items():
+            alias = 'benchmark_' + name.replace(' ', '_')
+            # Test database names: the file itself for SQLite, test_<name> for PostgreSQL
+            database['TEST'] = {'NAME': database['NAME']} if 'sqlite' in database['ENGINE'] else {}
+            settings.DATABASES[alias] = connections.configure_settings(
+                {'default': settings.DATABASES['default'], alias: database}
+            )[alias]
+            connection = connections[alias]
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.seed(alias, options['resources'])
+                results.append((name, *self.run(alias, options)))
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                connection.close()
+                del connections[alias]
+                del settings.DATABASES[alias]
+
+        self.stdout.write(self.style.NOTICE(
+            f'Summary ({options["readers"]} readers, {options["writers"]} writers, {options["seconds"]:.0f}s each)'
+        ))
+        self.stdout.write(f'{"profile":<16}{"reads/s":>10}{"writes/s":>10}{"locked":>8}{"p95 read ms":>13}')
+        for name, reads, writes, locked, p95 in results:
+            self.stdout.write(f'{name:<16}{reads:>10.1f}{writes:>10.1f}{locked:>8}{p95:>13.1f}')
+        self.stdout.write('"locked" counts transactions that failed with "database is locked".')
+
+    def seed(self, alias, count):
+        Resource.objects.using(alias).bulk_create(
+            [Resource(resource_name=f'Resource {i:04d}', year=YEAR, month=MONTH, working_days=22) for i in range(count)],
+            batch_size=500,
+        )
+        Project.objects.using(alias).bulk_create(
+            [Project(project_name=f'Project {i:04d}', year=YEAR, month=MONTH) for i in range(count // 2)],
+            batch_size=500,
+        )
+
+    def run(self, alias, options):
+        deadline = time.perf_counter() + options['seconds']
+        lock = threading.Lock()
+        stats = {'reads': 0, 'writes': 0, 'locked': 0, 'latencies': []}
+
+        def record(key, latency=None):
+            with lock:
+                stats[key] += 1
+                if latency is not None:
+                    stats['latencies'].append(latency)
+
+        def reader():
+            # The attendance page: per-period totals plus the resource rows
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    resources = Resource.objects.using(alias).filter(year=YEAR, month=MONTH)
+                    resources.aggregate(Sum('present_day'), Sum('working_days'), Count('id'))
+                    list(resources.values('resource_name', 'present_day')[:200])
+                    record('reads', time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+
+        def writer(offset):
+            # An import chunk: read the existing rows, then update them in one transaction
+            step = 0
+            try:
+                while time.perf_counter() < deadline:
+                    step += 1
+                    try:
+                        with transaction.atomic(using=alias):
+                            ids = list(
+                                Resource.objects.using(alias).filter(year=YEAR, month=MONTH)
+                                .order_by('id').values_list('id', flat=True)[(offset + step) % 10 * 50:][:50]
+                            )
+                            Resource.objects.using(alias).filter(id__in=ids).update(present_day=F('present_day') + 1)
+                        record('writes')
+                    except OperationalError as error:
+                        if 'locked' not in str(error):
+                            raise
+                        record('locked')
+            finally:
+                connections[alias].close()
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(stats['latencies']) or [0]
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000
+        return stats['reads'] / elapsed, stats['writes'] / elapsed, stats['locked'], p95
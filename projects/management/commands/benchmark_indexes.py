@@ -0,0 +1,122 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from projects.models import Project
+from projects.reports import attendance_summary
+from resources.models import Resource
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed N years of synthetic monthly data into a throwaway test database and report query plans '
+        'and timings of the period queries without and with the model indexes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=5, help='Years of monthly snapshots to seed')
+        parser.add_argument('--resources', type=int, default=200, help='Resources per month')
+        parser.add_argument('--projects', type=int, default=150, help='Projects per month')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query (median is reported)')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        # The indexes are dropped and rebuilt, so never touch the configured database
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            self.seed(options['years'], options['resources'], options['projects'])
+            indexes = [(model, index) for model in (Project, Resource) for index in model._meta.indexes]
+
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.remove_index(model, index)
+            self.analyze()
+            before = self.measure('without indexes')
+
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.add_index(model, index)
+            self.analyze()
+            after = self.measure('with indexes')
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(self.style.NOTICE('Summary (median ms)'))
+        self.stdout.write(f'{"query":<34}{"before":>10}{"after":>10}{"speed-up":>10}')
+        for label in before:
+            speedup = before[label] / after[label] if after[label] else float('inf')
+            self.stdout.write(f'{label:<34}{before[label]:>10.2f}{after[label]:>10.2f}{speedup:>9.1f}x')
+
+    def analyze(self):
+        if connection.vendor in ('sqlite', 'postgresql'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def seed(self, years, resources_per_month, projects_per_month):
+        started = time.perf_counter()
+        rng = random.Random(42)
+        last_year = 2025
+        periods = [(year, month) for year in range(last_year - years + 1, last_year + 1) for month in range(1, 13)]
+        self.period = periods[len(periods) // 2]
+
+        Resource.objects.bulk_create(
+            [
+                Resource(
+                    resource_name=f'Resource {i:04d}', year=year, month=month, working_days=22,
+                    present_day=rng.randint(10, 22), is_active=rng.random() > 0.05,
+                )
+                for year, month in periods for i in range(resources_per_month)
+            ],
+            batch_size=1000,
+        )
+        Project.objects.bulk_create(
+            [
+                Project(
+                    project_name=f'Project {i:04d}', year=year, month=month,
+                    project_type=rng.choice(['REGULAR', 'FIXED_COST', 'HOURLY_PROJECT']),
+                    billable_days=rng.randint(0, 20), billable_hours=rng.randint(0, 20) * 8,
+                    is_active=rng.random() > 0.05,
+                )
+                for year, month in periods for i in range(projects_per_month)
+            ],
+            batch_size=1000,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(periods)} months: {Resource.objects.count()} resources, '
+            f'{Project.objects.count()} projects in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def queries(self):
+        year, month = self.period
+        return {
+            'project_list (active, period)': Project.active_objects.filter(year=year, month=month),
+            'resource_list (active, period)': Resource.active_objects.filter(year=year, month=month),
+            'project_list_api (period)': Project.objects.filter(year=year, month=month).values(
+                'id', 'project_name', 'project_type'
+            ),
+            'project tree (all history)': Project.objects.filter(is_active=True)[:100],
+        }
+
+    def measure(self, label):
+        self.stdout.write(self.style.NOTICE(f'--- {label} ---'))
+        timings = {}
+        for name, queryset in self.queries().items():
+            self.stdout.write(f'{name}:\n  {queryset.explain()}')
+            timings[name] = self.timed(lambda: list(queryset.all()))
+        timings['attendance_summary'] = self.timed(lambda: attendance_summary(*self.period))
+        return timings
+
+    def timed(self, run):
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
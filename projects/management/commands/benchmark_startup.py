@@ -0,0 +1,77 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: loads the WSGI application, serves one request
+# and reports wall time since interpreter start plus peak RSS.
+WORKER_SCRIPT = r"""
+import json, os, resource, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Team_Production_Report.settings')
+if sys.argv[1] == 'eager':
+    # What every worker used to pay at import time of projects.views
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+loaded = time.perf_counter()
+from django.test import Client
+response = Client(HTTP_HOST='localhost').get(sys.argv[2])
+done = time.perf_counter()
+print(json.dumps({
+    'status': response.status_code,
+    'startup_ms': (loaded - start) * 1000,
+    'first_request_ms': (done - start) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'matplotlib_loaded': 'matplotlib' in sys.modules,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark worker startup (time-to-first-request and RSS) with eager vs lazy matplotlib'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per mode')
+        parser.add_argument(
+            '--path', default='/projects/project-canvas-tree/',
+            help='URL of the first request (should not draw a chart)'
+        )
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        results = {}
+        for mode in ('eager', 'lazy'):
+            samples = [self.run_worker(mode, options['path']) for _ in range(runs)]
+            results[mode] = {
+                key: statistics.median(sample[key] for sample in samples)
+                for key in ('startup_ms', 'first_request_ms', 'rss_mb')
+            }
+            results[mode]['matplotlib_loaded'] = samples[0]['matplotlib_loaded']
+            results[mode]['status'] = samples[0]['status']
+
+        self.stdout.write(self.style.NOTICE(f'Median of {runs} fresh workers, first request to {options["path"]}'))
+        self.stdout.write(f'{"mode":<8}{"status":>8}{"startup ms":>12}{"first req ms":>14}{"RSS MB":>10}  matplotlib')
+        for mode, row in results.items():
+            self.stdout.write(
+                f'{mode:<8}{row["status"]:>8}{row["startup_ms"]:>12.1f}{row["first_request_ms"]:>14.1f}'
+                f'{row["rss_mb"]:>10.1f}  {"loaded" if row["matplotlib_loaded"] else "not loaded"}'
+            )
+
+        eager, lazy = results['eager'], results['lazy']
+        self.stdout.write(self.style.SUCCESS(
+            f'Saved {eager["first_request_ms"] - lazy["first_request_ms"]:.1f} ms to first request '
+            f'and {eager["rss_mb"] - lazy["rss_mb"]:.1f} MB RSS per worker'
+        ))
+
+    def run_worker(self, mode, path):
+        completed = subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT, mode, path],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        return json.loads(completed.stdout.strip().splitlines()[-1])
@@ -0,0 +1,138 @@
+import random
+import statistics
+import time
+import tracemalloc
+from importlib import import_module
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from projects.models import Project
+from projects.views import project_tree_view
+from resources.models import Resource
+from resources.views import resource_tree_view
+
+# The read cache would answer every run after the first; measure the views' own work
+UNCACHED = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'reports': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed N years of synthetic monthly data into a throwaway test database and compare time to '
+        'first byte, total time and peak memory of the buffered and streaming tree endpoints over all '
+        'history'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=3, help='Years of monthly snapshots to seed')
+        parser.add_argument('--resources', type=int, default=100, help='Resources per month')
+        parser.add_argument('--projects', type=int, default=80, help='Projects per month')
+        parser.add_argument('--members', type=int, default=4, help='Resources assigned per project')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per endpoint and mode (median is reported)')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.factory = AsyncRequestFactory()  # ASGI requests: the views stream async iterators
+        self.session_store = import_module(settings.SESSION_ENGINE).SessionStore
+        results = []
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            self.seed(options['years'], options['resources'], options['projects'], options['members'])
+            with override_settings(CACHES=UNCACHED):
+                for name, view in (('project tree', project_tree_view), ('resource tree', resource_tree_view)):
+                    for stream in ('0', '1'):
+                        results.append((name, 'streaming' if stream == '1' else 'buffered', *self.measure(view, stream)))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(self.style.NOTICE('Summary (median of runs, no period selected = all history)'))
+        self.stdout.write(f'{"endpoint":<16}{"mode":<12}{"TTFB ms":>10}{"total ms":>10}{"peak MiB":>10}{"bytes":>12}')
+        for name, mode, ttfb, total, peak, size in results:
+            self.stdout.write(f'{name:<16}{mode:<12}{ttfb:>10.1f}{total:>10.1f}{peak:>10.1f}{size:>12}')
+        self.stdout.write(
+            'Peak memory is the traced Python allocation peak of each request (tracemalloc); the process '
+            'RSS high-water mark cannot be reset between runs in one process.'
+        )
+
+    def seed(self, years, resources_per_month, projects_per_month, members):
+        started = time.perf_counter()
+        rng = random.Random(42)
+        last_year = 2025
+        periods = [(year, month) for year in range(last_year - years + 1, last_year + 1) for month in range(1, 13)]
+
+        Resource.objects.bulk_create(
+            [
+                Resource(resource_name=f'Resource {i:04d}', year=year, month=month, working_days=22)
+                for year, month in periods for i in range(resources_per_month)
+            ],
+            batch_size=1000,
+        )
+        by_period = {}
+        for pk, year, month in Resource.objects.values_list('id', 'year', 'month'):
+            by_period.setdefault((year, month), []).append(pk)
+
+        Project.objects.bulk_create(
+            [
+                Project(
+                    project_name=f'Project {i:04d}', year=year, month=month,
+                    poc_id=rng.choice(by_period[(year, month)]),
+                    assign_project_id=rng.choice(by_period[(year, month)]),
+                )
+                for year, month in periods for i in range(projects_per_month)
+            ],
+            batch_size=1000,
+        )
+        through = Project.resources.through
+        through.objects.bulk_create(
+            [
+                through(project_id=pk, resource_id=resource_id)
+                for pk, year, month in Project.objects.values_list('id', 'year', 'month')
+                for resource_id in rng.sample(by_period[(year, month)], min(members, len(by_period[(year, month)])))
+            ],
+            batch_size=1000,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(periods)} months: {Resource.objects.count()} resources, '
+            f'{Project.objects.count()} projects, {through.objects.count()} memberships '
+            f'in {time.perf_counter() - started:.1f}s'
+        ))
+
+    async def run(self, view, request):
+        """(TTFB ms, total ms, body size) of one request to the async ``view``."""
+        started = time.perf_counter()
+        response = await view(request)
+        if response.streaming:
+            # Chunks are counted and dropped, as a server writing them to the socket would
+            chunks = aiter(response.streaming_content)
+            size = len(await anext(chunks))
+            ttfb = (time.perf_counter() - started) * 1000
+            async for chunk in chunks:
+                size += len(chunk)
+        else:
+            ttfb = (time.perf_counter() - started) * 1000
+            size = len(response.content)
+        return ttfb, (time.perf_counter() - started) * 1000, size
+
+    def measure(self, view, stream):
+        """Median (TTFB ms, total ms, peak MiB) and body size of ``view`` over the runs."""
+        ttfbs, totals, peaks = [], [], []
+        for _ in range(self.repeat):
+            request = self.factory.get('/', {'stream': stream})
+            request.session = self.session_store()  # no period selected: the whole history
+
+            tracemalloc.start()
+            ttfb, total, size = async_to_sync(self.run)(view, request)
+            ttfbs.append(ttfb)
+            totals.append(total)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 2 ** 20)
+            tracemalloc.stop()
+        return statistics.median(ttfbs), statistics.median(totals), statistics.median(peaks), size
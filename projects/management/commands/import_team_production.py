@@ -1,31 +1,148 @@
-from django.core.management.base import BaseCommand
+import time
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 import pandas as pd
+from projects.bulk_edit import hours_from_days
+from projects.signals import period_changed
 from projects.models import Project
 from resources.models import Resource
+from resources.working_days import working_days_for_periods
+
+REQUIRED_COLUMNS = ['resource_name', 'project_name', 'year', 'month']
+DAY_COLUMNS = ['billable_days', 'non_billable_days']
+
 
 class Command(BaseCommand):
     help = 'Import projects and resources from an Excel file'
 
     def add_arguments(self, parser):
         parser.add_argument('excel_path', type=str, help='Path to the Excel file')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows per bulk INSERT/UPDATE statement (default: 500)'
+        )
 
     def handle(self, *args, **options):
         excel_path = options['excel_path']
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
         self.stdout.write(self.style.NOTICE(f'Reading Excel file: {excel_path}'))
-        df = pd.read_excel(excel_path)
-        for idx, row in df.iterrows():
-            # Adjust these field names to match your Excel columns
-            resource, _ = Resource.objects.get_or_create(resource_name=row['resource_name'])
-            project, created = Project.objects.get_or_create(
-                project_name=row['project_name'],
-                year=row['year'],
-                month=row['month'],
-                defaults={
-                    'billable_days': row.get('billable_days', 0),
-                    'non_billable_days': row.get('non_billable_days', 0),
-                }
+        df = self.normalise(pd.read_excel(excel_path))
+
+        with transaction.atomic():
+            resource_ids, resources_created = self.upsert_resources(df, batch_size)
+            project_ids, projects_created, projects_updated = self.upsert_projects(df, batch_size)
+            links_created = self.link_resources(df, resource_ids, project_ids, batch_size)
+
+        # Bulk writes send no model signals, so refresh the periods' rollups and charts here
+        for year, month in df[['year', 'month']].drop_duplicates().itertuples(index=False):
+            period_changed(year, month)
+
+        elapsed = time.perf_counter() - started
+        rate = len(df) / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Import complete! {len(df)} rows in {elapsed:.2f}s ({rate:.0f} rows/sec): '
+            f'{resources_created} resources created, {projects_created} projects created, '
+            f'{projects_updated} projects updated, {links_created} resource assignments added.'
+        ))
+
+    def normalise(self, df):
+        """Clean and type the sheet column-wise instead of row by row."""
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            raise CommandError(f"Missing column(s) in Excel file: {', '.join(missing)}")
+
+        df = df.dropna(subset=REQUIRED_COLUMNS).copy()
+        for column in ('resource_name', 'project_name'):
+            df[column] = df[column].astype(str).str.strip()
+        df = df[(df['resource_name'] != '') & (df['project_name'] != '')]
+        df['year'] = df['year'].astype(int)
+        df['month'] = df['month'].astype(int)
+        for column in DAY_COLUMNS:
+            if column not in df.columns:
+                df[column] = 0.0
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(float)
+
+        # Same rule as Project.save(), which bulk writes bypass
+        df['billable_hours'], df['non_billable_hours'] = hours_from_days(df['billable_days'], df['non_billable_days'])
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def period_filter(df):
+        """Q object matching every (year, month) present in the sheet."""
+        periods = df[['year', 'month']].drop_duplicates().itertuples(index=False)
+        return reduce(or_, (Q(year=year, month=month) for year, month in periods), Q(pk__in=[]))
+
+    def existing_index(self, model, name_field, df, fields=()):
+        """Map (name, year, month) -> row for the sheet's periods, preferring active rows."""
+        rows = model.objects.filter(self.period_filter(df)).order_by('is_active', 'pk').only(
+            name_field, 'year', 'month', *fields
+        )
+        return {(getattr(row, name_field), row.year, row.month): row for row in rows}
+
+    def upsert_resources(self, df, batch_size):
+        keys = df[['resource_name', 'year', 'month']].drop_duplicates()
+        index = self.existing_index(Resource, 'resource_name', df)
+
+        # Resource.save() would fill these in; bulk_create does not call it
+        working_days = working_days_for_periods(keys[['year', 'month']].itertuples(index=False))
+        new_resources = [
+            Resource(
+                resource_name=name, year=year, month=month,
+                working_days=working_days[(year, month)], present_day=0, present_hours=0,
             )
-            project.resources.add(resource)
-            project.save()
-            self.stdout.write(self.style.SUCCESS(f"Imported project: {project.project_name} (row {idx+1})"))
-        self.stdout.write(self.style.SUCCESS('Import complete!'))
+            for name, year, month in keys.itertuples(index=False)
+            if (name, year, month) not in index
+        ]
+        Resource.objects.bulk_create(new_resources, batch_size=batch_size)
+        if new_resources:
+            index = self.existing_index(Resource, 'resource_name', df)
+        return {key: resource.pk for key, resource in index.items()}, len(new_resources)
+
+    def upsert_projects(self, df, batch_size):
+        # A project spans one row per resource; its day values come from the first row
+        rows = df.drop_duplicates(subset=['project_name', 'year', 'month'], keep='first')
+        fields = DAY_COLUMNS + ['billable_hours', 'non_billable_hours']
+        index = self.existing_index(Project, 'project_name', df, fields)
+
+        # bulk_update skips auto_now, so updated_at is stamped explicitly
+        now = timezone.now()
+        new_projects = []
+        changed = []
+        for row in rows[['project_name', 'year', 'month'] + fields].itertuples(index=False):
+            values = {field: getattr(row, field) for field in fields}
+            project = index.get((row.project_name, row.year, row.month))
+            if project is None:
+                new_projects.append(Project(project_name=row.project_name, year=row.year, month=row.month, **values))
+            elif any(getattr(project, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(project, field, value)
+                project.updated_at = now
+                changed.append(project)
+
+        Project.objects.bulk_create(new_projects, batch_size=batch_size)
+        Project.objects.bulk_update(changed, fields + ['updated_at'], batch_size=batch_size)
+
+        if new_projects:
+            index = self.existing_index(Project, 'project_name', df)
+        return {key: project.pk for key, project in index.items()}, len(new_projects), len(changed)
+
+    def link_resources(self, df, resource_ids, project_ids, batch_size):
+        """Insert all project/resource assignments into the M2M through-table at once."""
+        Through = Project.resources.through
+        pairs = {
+            (project_ids[(project, year, month)], resource_ids[(resource, year, month)])
+            for resource, project, year, month in df[REQUIRED_COLUMNS].itertuples(index=False)
+        }
+        existing = set(Through.objects.filter(
+            project__in=Project.objects.filter(self.period_filter(df))
+        ).values_list('project_id', 'resource_id'))
+        links = [Through(project_id=p, resource_id=r) for p, r in pairs - existing]
+        Through.objects.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+        return len(links)
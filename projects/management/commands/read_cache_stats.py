@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from projects.read_cache import READ_CACHE_ENDPOINTS, cache_stats, counters_shared, counting, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the per-period read cache for each reporting endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        backend = settings.CACHES[settings.READ_CACHE_ALIAS]['BACKEND']
+        if not counting():
+            raise CommandError('The file read cache does not count reads; set READ_CACHE_BACKEND to memcached or redis')
+        if not counters_shared():
+            # This command runs in a process of its own, which has never served a read
+            raise CommandError(
+                'The locmem read cache is kept per process, so its counters cannot be read from here; '
+                'set READ_CACHE_BACKEND to memcached or redis'
+            )
+        self.stdout.write(self.style.NOTICE(f'Read cache "{settings.READ_CACHE_ALIAS}" ({backend})'))
+        self.stdout.write(f'{"endpoint":<20}{"hits":>8}{"misses":>8}{"hit rate":>10}')
+        for endpoint, counts in cache_stats(READ_CACHE_ENDPOINTS).items():
+            reads = counts['hits'] + counts['misses']
+            rate = f'{counts["hits"] / reads:.0%}' if reads else '-'
+            self.stdout.write(f'{endpoint:<20}{counts["hits"]:>8}{counts["misses"]:>8}{rate:>10}')
+
+        if options['reset']:
+            reset_cache_stats(READ_CACHE_ENDPOINTS)
+            self.stdout.write(self.style.SUCCESS('Read cache counters reset.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from projects.reports import rebuild_monthly_summary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly production summary table from all projects and resources'
+
+    def handle(self, *args, **options):
+        count = rebuild_monthly_summary()
+        self.stdout.write(self.style.SUCCESS(f'Monthly production summary rebuilt: {count} rows.'))
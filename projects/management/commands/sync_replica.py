@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from Team_Production_Report.database import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into the replica file (DB_REPLICA_NAME), the local stand-in '
+        'for replication; with --interval, keep copying to simulate a lagging replica'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Seconds between copies; 0 copies once',
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.settings:
+            raise CommandError('No replica configured: set DB_REPLICA_NAME')
+        primary, replica = connections['default'], connections[REPLICA_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('sync_replica copies SQLite files; PostgreSQL replicas are kept by replication')
+
+        while True:
+            started = time.perf_counter()
+            primary.ensure_connection()
+            replica.ensure_connection()
+            # SQLite's online backup: a consistent snapshot, readers of the replica keep working
+            primary.connection.backup(replica.connection)
+            self.stdout.write(self.style.SUCCESS(
+                f'Copied {primary.settings_dict["NAME"]} to {replica.settings_dict["NAME"]} '
+                f'in {(time.perf_counter() - started) * 1000:.0f} ms'
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
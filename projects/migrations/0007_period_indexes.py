@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0006_alter_project_unique_together"),
+        ("resources", "0005_period_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-year", "-month", "project_name"],
+                name="projects_active_period_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["year", "month"], name="projects_period_idx"),
+        ),
+    ]
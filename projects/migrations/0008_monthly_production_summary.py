@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0007_period_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyProductionSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField()),
+                (
+                    "month",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "January"),
+                            (2, "February"),
+                            (3, "March"),
+                            (4, "April"),
+                            (5, "May"),
+                            (6, "June"),
+                            (7, "July"),
+                            (8, "August"),
+                            (9, "September"),
+                            (10, "October"),
+                            (11, "November"),
+                            (12, "December"),
+                        ]
+                    ),
+                ),
+                (
+                    "project_type",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("", "All Projects"),
+                            ("REGULAR", "Regular Project"),
+                            ("FIXED_COST", "Fixed Cost Project"),
+                            ("HOURLY_PROJECT", "Hourly Project"),
+                        ],
+                        help_text="Project type of this row, blank for the whole period",
+                        max_length=20,
+                    ),
+                ),
+                ("present_day", models.FloatField(default=0)),
+                ("billable_days", models.FloatField(default=0)),
+                ("non_billable_days", models.FloatField(default=0)),
+                ("billable_hours", models.FloatField(default=0)),
+                ("non_billable_hours", models.FloatField(default=0)),
+                ("working_days", models.FloatField(default=0)),
+                ("resource_present_days", models.FloatField(default=0)),
+                ("resource_present_hours", models.FloatField(default=0)),
+                ("presence_percentage", models.FloatField(default=0)),
+                (
+                    "productivity_percentage",
+                    models.FloatField(
+                        default=0,
+                        help_text="100 × billable hours / resource present hours, clamped to [0, 100]",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Monthly Production Summary",
+                "verbose_name_plural": "Monthly Production Summaries",
+                "db_table": "monthly_production_summary",
+                "ordering": ["-year", "-month", "project_type"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("year", "month", "project_type"),
+                        name="unique_monthly_summary_row",
+                    )
+                ],
+            },
+        ),
+    ]
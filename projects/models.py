@@ -156,5 +156,71 @@ class Project(models.Model):
     class Meta:
         db_table = 'projects'
         ordering = ['-year', '-month', 'project_name']
+        indexes = [
+            # Views filter on is_active=True + year/month and sort by Meta.ordering;
+            # partial on backends that support it (SQLite, PostgreSQL)
+            models.Index(
+                fields=['-year', '-month', 'project_name'],
+                condition=models.Q(is_active=True),
+                name='projects_active_period_idx',
+            ),
+            # Period lookups that include inactive rows (APIs, imports)
+            models.Index(fields=['year', 'month'], name='projects_period_idx'),
+        ]
         verbose_name = 'Project'
-        verbose_name_plural = 'Projects'
\ No newline at end of file
+        verbose_name_plural = 'Projects'
+
+class MonthlyProductionSummary(models.Model):
+    """
+    Denormalised monthly totals of active projects and resources, one row per
+    project type plus one row (``project_type=''``) for the whole period.
+    Kept up to date by the signal receivers in ``projects.signals`` and fully
+    rebuilt by the ``rebuild_monthly_summary`` management command.
+    """
+
+    ALL_TYPES = ''
+
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField(
+        choices=[(i, calendar.month_name[i]) for i in range(1, 13)]
+    )
+    project_type = models.CharField(
+        max_length=20,
+        choices=[(ALL_TYPES, 'All Projects')] + Project.PROJECT_TYPE_CHOICES,
+        blank=True,
+        help_text="Project type of this row, blank for the whole period"
+    )
+
+    # Project totals (of this type, or of every type on the period row)
+    present_day = models.FloatField(default=0)
+    billable_days = models.FloatField(default=0)
+    non_billable_days = models.FloatField(default=0)
+    billable_hours = models.FloatField(default=0)
+    non_billable_hours = models.FloatField(default=0)
+
+    # Resource totals of the period (the same on every row of a period)
+    working_days = models.FloatField(default=0)
+    resource_present_days = models.FloatField(default=0)
+    resource_present_hours = models.FloatField(default=0)
+    presence_percentage = models.FloatField(default=0)
+
+    productivity_percentage = models.FloatField(
+        default=0,
+        help_text="100 × billable hours / resource present hours, clamped to [0, 100]"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        label = self.get_project_type_display() or 'All Projects'
+        return f"{label} ({calendar.month_name[self.month]} {self.year})"
+
+    class Meta:
+        db_table = 'monthly_production_summary'
+        ordering = ['-year', '-month', 'project_type']
+        verbose_name = 'Monthly Production Summary'
+        verbose_name_plural = 'Monthly Production Summaries'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['year', 'month', 'project_type'], name='unique_monthly_summary_row'
+            ),
+        ]
@@ -0,0 +1,73 @@
+"""
+Reporting periods in URLs.
+
+Period-scoped pages and APIs are routed twice under one name: plain, and
+under ``<yyyy:year>/<mm:month>/`` (e.g. ``/projects/2025/05/attendance/``).
+With the period in the path a URL always returns the same month, so it can be
+cached and revalidated per URL and no session is read. The plain routes fall
+back to the default period kept in the session, which the dashboard only
+writes when the user picks another month.
+"""
+from django.urls import path, register_converter
+
+
+class YearConverter:
+    regex = '[0-9]{4}'
+
+    def to_python(self, value):
+        return int(value)
+
+    def to_url(self, value):
+        return f'{int(value):04d}'
+
+
+class MonthConverter:
+    regex = '0[1-9]|1[0-2]'
+
+    def to_python(self, value):
+        return int(value)
+
+    def to_url(self, value):
+        return f'{int(value):02d}'
+
+
+register_converter(YearConverter, 'yyyy')
+register_converter(MonthConverter, 'mm')
+
+
+def period_paths(route, view, name):
+    """``path()`` entries for ``route`` without and with a ``<yyyy:year>/<mm:month>/`` prefix."""
+    return [
+        path(route, view, name=name),
+        path(f'<yyyy:year>/<mm:month>/{route}', view, name=name),
+    ]
+
+
+def valid_period(year, month):
+    return year is not None and month is not None and 1000 <= year <= 9999 and 1 <= month <= 12
+
+
+def session_period(request):
+    """The default (year, month) stored in the session, or (None, None)."""
+    return request.session.get('selected_year'), request.session.get('selected_month')
+
+
+def resolve_period(request, year=None, month=None):
+    """The period of the URL when it has one, else the session default."""
+    if year and month:
+        return year, month
+    return session_period(request)
+
+
+async def aresolve_period(request, year=None, month=None):
+    """Async ``resolve_period``; loads the session without blocking the event loop."""
+    if year and month:
+        return year, month
+    return await request.session.aget('selected_year'), await request.session.aget('selected_month')
+
+
+def remember_period(request, year, month):
+    """Store the default period, writing the session only when it changes."""
+    if session_period(request) != (year, month):
+        request.session['selected_year'] = year
+        request.session['selected_month'] = month
@@ -0,0 +1,169 @@
+"""
+Versioned per-period cache for the reporting endpoints.
+
+Entries are keyed by (endpoint, year, month, params) plus the period's
+version number. A committed write to a Project or Resource bumps the version
+of its own month (see ``signals.period_changed``), which makes every entry of
+that month unreachable at once while other months stay cached; stale entries
+simply expire or get evicted. Reads without a period use the "all" version, which
+every write bumps as well.
+
+The cache lives in the ``settings.READ_CACHE_ALIAS`` backend (see CACHES in
+settings), which also bounds it with a TTL and LRU / cull eviction. Versions
+are kept in the same backend, so every worker sees a bump as long as it is
+file-based, memcached or redis (with locmem, only the worker that wrote
+would). Per-endpoint hit and miss counters are kept there too, except with
+the file backend, where each count would be a disk write and ``incr`` is not
+atomic. Entries computed from a read replica expire sooner (see ``replica``).
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .replica import replica_cache_timeout
+
+# Endpoints served through cached_read (reported by the read_cache_stats command)
+READ_CACHE_ENDPOINTS = (
+    'attendance_home', 'attendance_trends', 'project_tree', 'project_list_api', 'resource_tree',
+    'resource_list_api',
+)
+
+COUNTER_TIMEOUT = None  # Counters are kept until the cache is cleared or evicts them
+
+
+def _cache():
+    return caches[getattr(settings, 'READ_CACHE_ALIAS', 'default')]
+
+
+def _backend():
+    return settings.CACHES[getattr(settings, 'READ_CACHE_ALIAS', 'default')]['BACKEND']
+
+
+def counting():
+    """Whether reads are counted: not with the file backend (a disk write per read, non-atomic incr)."""
+    return not _backend().endswith('FileBasedCache')
+
+
+def counters_shared():
+    """Whether the counters can be read from another process (memcached and redis; locmem is per process)."""
+    return counting() and not _backend().endswith('LocMemCache')
+
+
+def _version_key(year, month):
+    return f"read_cache:version:{year}:{month}" if year and month else "read_cache:version:all"
+
+
+def period_version(year=None, month=None):
+    """Current version of a period's entries."""
+    cache = _cache()
+    key = _version_key(year, month)
+    # Seeded from the clock: if the counter is ever evicted it restarts above
+    # every version that entries were written with, so nothing stale resurfaces
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def bump_period_version(year, month):
+    """Invalidate every cached read of the period and of all history."""
+    cache = _cache()
+    for key in (_version_key(year, month), _version_key(None, None)):
+        try:
+            cache.incr(key)
+        except ValueError:  # Not seeded yet, or evicted: nothing can be cached under it
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def _count(endpoint, outcome):
+    if not counting():
+        return
+    cache = _cache()
+    key = f"read_cache:{outcome}:{endpoint}"
+    if not cache.add(key, 1, timeout=COUNTER_TIMEOUT):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=COUNTER_TIMEOUT)
+
+
+def _entry_key(endpoint, year, month, version, params):
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    period = f"{year}:{month}" if year and month else "all"
+    return f"read_cache:{endpoint}:{period}:{version}:{digest}"
+
+
+def cached_read(endpoint, year, month, compute, **params):
+    """
+    Return ``compute()`` for ``endpoint`` in the given period, from the cache
+    when this period has not changed since it was stored. ``params`` are the
+    request parameters the result depends on.
+    """
+    cache = _cache()
+    key = _entry_key(endpoint, year, month, period_version(year, month), params)
+
+    value = cache.get(key)
+    if value is not None:
+        _count(endpoint, 'hits')
+        return value
+
+    _count(endpoint, 'misses')
+    value = compute()
+    cache.set(key, value, replica_cache_timeout())
+    return value
+
+
+async def aperiod_version(year=None, month=None):
+    """Async ``period_version``."""
+    cache = _cache()
+    key = _version_key(year, month)
+    await cache.aadd(key, time.time_ns(), timeout=None)
+    return await cache.aget(key)
+
+
+async def _acount(endpoint, outcome):
+    if not counting():
+        return
+    cache = _cache()
+    key = f"read_cache:{outcome}:{endpoint}"
+    if not await cache.aadd(key, 1, timeout=COUNTER_TIMEOUT):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 1, timeout=COUNTER_TIMEOUT)
+
+
+async def acached_read(endpoint, year, month, compute, **params):
+    """Async ``cached_read``: ``compute`` is a coroutine function. Entries are shared with the sync views."""
+    cache = _cache()
+    key = _entry_key(endpoint, year, month, await aperiod_version(year, month), params)
+
+    value = await cache.aget(key)
+    if value is not None:
+        await _acount(endpoint, 'hits')
+        return value
+
+    await _acount(endpoint, 'misses')
+    value = await compute()
+    await cache.aset(key, value, replica_cache_timeout())
+    return value
+
+
+def cache_stats(endpoints):
+    """{endpoint: {'hits': n, 'misses': n}} for the given endpoint names."""
+    cache = _cache()
+    keys = [f"read_cache:{outcome}:{endpoint}" for endpoint in endpoints for outcome in ('hits', 'misses')]
+    counters = cache.get_many(keys)
+    return {
+        endpoint: {
+            outcome: counters.get(f"read_cache:{outcome}:{endpoint}", 0) for outcome in ('hits', 'misses')
+        }
+        for endpoint in endpoints
+    }
+
+
+def reset_cache_stats(endpoints):
+    _cache().delete_many(
+        [f"read_cache:{outcome}:{endpoint}" for endpoint in endpoints for outcome in ('hits', 'misses')]
+    )
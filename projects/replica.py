@@ -0,0 +1,167 @@
+"""
+Read-replica routing for the reporting views.
+
+Views decorated with ``replica_reads`` run their Project and Resource
+queries on the ``replica`` database (see ``database.replica_from_env``) when
+one is configured, so dashboards don't share a connection, or a lock, with
+form saves and Excel imports. Everything else reads the primary: writes,
+sessions and auth, management commands, and any query made after the request
+wrote a routed row.
+
+Replicas lag. A client that just POSTed gets a short-lived cookie
+(``REPLICA_STICKY_SECONDS``), and its next requests, typically the redirect
+to the list it edited, read the primary so it sees its own change. Cached
+reports computed from the replica expire within ``REPLICA_CACHE_TIMEOUT``.
+
+The routing lives in a context variable, which the async ORM carries into
+its worker thread; streamed responses keep it while their body is read.
+"""
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.decorators import sync_and_async_middleware
+
+from Team_Production_Report.database import REPLICA_ALIAS
+
+# Apps whose reads can be served by the replica
+ROUTED_APP_LABELS = {'projects', 'resources'}
+STICKY_COOKIE = 'primary_reads'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Alias the routed reads of the current request go to; None is the primary
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def reading_replica():
+    """Whether routed reads currently go to the replica."""
+    return _read_alias.get() is not None
+
+
+def request_read_alias(request):
+    """The replica for a read-only request, or None when it must read the primary."""
+    if not replica_configured() or request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+        return None
+    return REPLICA_ALIAS
+
+
+def replica_cache_timeout(timeout=DEFAULT_TIMEOUT):
+    """Cache timeout for a value computed now: at most REPLICA_CACHE_TIMEOUT while reading the replica."""
+    if not reading_replica():
+        return timeout
+    cap = getattr(settings, 'REPLICA_CACHE_TIMEOUT', 60)
+    return cap if timeout is DEFAULT_TIMEOUT or timeout is None else min(timeout, cap)
+
+
+class ReplicaRouter:
+    """Routed reads follow the request's read alias; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in ROUTED_APP_LABELS:
+            return _read_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in ROUTED_APP_LABELS and _read_alias.get() is not None:
+            # Read-after-write: the rest of the request reads the primary
+            _read_alias.set(None)
+        # Explicit, so rows loaded from the replica are never saved back to it
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary (replication, or sync_replica)
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+def _routed_chunks(chunks, alias):
+    iterator = iter(chunks)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+async def _arouted_chunks(chunks, alias):
+    iterator = aiter(chunks)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+def _keep_routing(response, alias):
+    # A streamed body is read after the view returns; its queries stay routed
+    if alias and getattr(response, 'streaming', False):
+        route = _arouted_chunks if response.is_async else _routed_chunks
+        response.streaming_content = route(response.streaming_content, alias)
+    return response
+
+
+def replica_reads(view):
+    """Serve a read-only reporting view from the replica, unless the client must read its own writes."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def routed(request, *args, **kwargs):
+            alias = request_read_alias(request)
+            token = _read_alias.set(alias)
+            try:
+                response = await view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+            return _keep_routing(response, alias)
+    else:
+        @wraps(view)
+        def routed(request, *args, **kwargs):
+            alias = request_read_alias(request)
+            token = _read_alias.set(alias)
+            try:
+                response = view(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+            return _keep_routing(response, alias)
+
+    return routed
+
+
+def _pin_after_write(request, response):
+    if request.method not in SAFE_METHODS and replica_configured():
+        response.set_cookie(
+            STICKY_COOKIE, '1', max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 10),
+            httponly=True, samesite='Lax',
+        )
+    return response
+
+
+@sync_and_async_middleware
+def replica_stickiness_middleware(get_response):
+    """After a POST (or any write method), keep the client on the primary for REPLICA_STICKY_SECONDS."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            return _pin_after_write(request, await get_response(request))
+    else:
+        def middleware(request):
+            return _pin_after_write(request, get_response(request))
+    return middleware
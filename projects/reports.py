@@ -0,0 +1,207 @@
+"""
+Database-side report calculations shared by the reporting views.
+
+Totals are computed with ``aggregate()`` / ``values().annotate()`` so the cost
+of a report does not grow with the number of resources or projects loaded
+into Python. The results are stored per period in ``MonthlyProductionSummary``
+so a report for a month that has not changed is a lookup of a few rows.
+``trend_rows`` reads a whole range of months in one grouped query instead.
+"""
+from django.db import transaction
+from django.db.models import CharField, FloatField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from resources.models import Resource
+from .models import MonthlyProductionSummary, Project
+
+# Project columns summed per project type and for the grand total
+PROJECT_TOTAL_FIELDS = [
+    'present_day',
+    'billable_days',
+    'non_billable_days',
+    'billable_hours',
+    'non_billable_hours',
+]
+
+
+def _float_sum(field):
+    """SUM(field) that yields 0.0 instead of NULL for an empty period."""
+    return Coalesce(Sum(field), Value(0.0), output_field=FloatField())
+
+
+def percentage(part, whole):
+    """100 × part / whole, or 0 when whole is not positive."""
+    return (100 * part) / whole if whole > 0 else 0
+
+
+def _productivity(billable_hours, present_hours):
+    # Team productivity = 100 × billable hours / hours present, clamped to [0, 100]
+    return max(0, min(100, percentage(billable_hours, present_hours)))
+
+
+def build_summary_rows(year=None, month=None):
+    """
+    Aggregate active projects and resources into unsaved
+    ``MonthlyProductionSummary`` rows, for one period or (without arguments)
+    for every period, in two grouped queries.
+    """
+    projects = Project.active_objects.all()
+    resources = Resource.active_objects.all()
+    if year is not None and month is not None:
+        projects = projects.filter(year=year, month=month)
+        resources = resources.filter(year=year, month=month)
+
+    periods = {}
+    resource_rows = resources.order_by().values('year', 'month').annotate(
+        working_days=_float_sum('working_days'),
+        resource_present_days=_float_sum('present_day'),
+        resource_present_hours=_float_sum('present_hours'),
+    )
+    for row in resource_rows:
+        periods[(row.pop('year'), row.pop('month'))] = {'resources': row, 'types': {}}
+
+    type_rows = projects.order_by('year', 'month', 'project_type').values(
+        'year', 'month', 'project_type'
+    ).annotate(**{field: _float_sum(field) for field in PROJECT_TOTAL_FIELDS})
+    for row in type_rows:
+        period = periods.setdefault((row.pop('year'), row.pop('month')), {'resources': {}, 'types': {}})
+        period['types'][row.pop('project_type')] = row
+
+    if year is not None and month is not None and not periods:
+        periods[(year, month)] = {'resources': {}, 'types': {}}
+
+    summaries = []
+    for (period_year, period_month), period in periods.items():
+        resource_totals = {
+            'working_days': period['resources'].get('working_days', 0.0),
+            'resource_present_days': period['resources'].get('resource_present_days', 0.0),
+            'resource_present_hours': period['resources'].get('resource_present_hours', 0.0),
+        }
+        resource_totals['presence_percentage'] = percentage(
+            resource_totals['resource_present_days'], resource_totals['working_days']
+        )
+        grand_totals = {
+            field: sum(totals[field] for totals in period['types'].values()) for field in PROJECT_TOTAL_FIELDS
+        }
+        for project_type, totals in [(MonthlyProductionSummary.ALL_TYPES, grand_totals), *period['types'].items()]:
+            summaries.append(MonthlyProductionSummary(
+                year=period_year,
+                month=period_month,
+                project_type=project_type,
+                productivity_percentage=_productivity(
+                    totals['billable_hours'], resource_totals['resource_present_hours']
+                ),
+                **totals,
+                **resource_totals,
+            ))
+    return summaries
+
+
+# Unique key of the stored summary rows (unique_monthly_summary_row)
+SUMMARY_KEY_FIELDS = ['year', 'month', 'project_type']
+
+
+def _summary_update_fields():
+    return [
+        field.name for field in MonthlyProductionSummary._meta.concrete_fields
+        if not field.primary_key and field.name not in SUMMARY_KEY_FIELDS
+    ]
+
+
+def refresh_monthly_summary(year, month):
+    """
+    Recompute the stored summary rows of one period. Rows are upserted on the
+    (year, month, project_type) key, so two saves of the same period refreshing
+    it at once don't collide on the unique constraint; types no longer present
+    are deleted.
+    """
+    rows = build_summary_rows(year, month)
+    with transaction.atomic():
+        MonthlyProductionSummary.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=SUMMARY_KEY_FIELDS, update_fields=_summary_update_fields(),
+        )
+        MonthlyProductionSummary.objects.filter(year=year, month=month).exclude(
+            project_type__in=[row.project_type for row in rows]
+        ).delete()
+    return rows
+
+
+def rebuild_monthly_summary():
+    """Recompute the stored summary rows of every period; returns the row count."""
+    rows = build_summary_rows()
+    with transaction.atomic():
+        MonthlyProductionSummary.objects.all().delete()
+        MonthlyProductionSummary.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def attendance_summary(year, month):
+    """
+    All totals shown on the attendance page for one period.
+
+    Read from the stored ``MonthlyProductionSummary`` rows (one query); a
+    period without stored rows is aggregated live instead. The returned keys
+    match the attendance template context.
+    """
+    rows = list(MonthlyProductionSummary.objects.filter(year=year, month=month))
+    if not rows:
+        rows = build_summary_rows(year, month)
+
+    type_labels = dict(Project.PROJECT_TYPE_CHOICES)
+    type_totals = {}
+    total = None
+    for row in rows:
+        if row.project_type == MonthlyProductionSummary.ALL_TYPES:
+            total = row
+        else:
+            label = type_labels.get(row.project_type, row.project_type)
+            type_totals[label] = {field: getattr(row, field) for field in PROJECT_TOTAL_FIELDS}
+
+    summary = {
+        'total_working_days': total.working_days,
+        'total_present_days': total.resource_present_days,
+        'total_present_hours': total.resource_present_hours,
+        'presence_percentage': total.presence_percentage,
+        'type_totals': type_totals,
+        'team_productivity_hours': total.billable_hours,
+        'team_productivity_percentage': total.productivity_percentage,
+        'not_productive_percentage': 100 - total.productivity_percentage,
+    }
+    for field in PROJECT_TOTAL_FIELDS:
+        summary[f'total_project_{field}'] = getattr(total, field)
+    return summary
+
+
+def period_range_q(start, end):
+    """Q matching the periods from ``start`` to ``end`` inclusive, both (year, month) pairs."""
+    (start_year, start_month), (end_year, end_month) = start, end
+    return (
+        (Q(year__gt=start_year) | Q(year=start_year, month__gte=start_month))
+        & (Q(year__lt=end_year) | Q(year=end_year, month__lte=end_month))
+    )
+
+
+# Columns of a trend row; resource rows have project_type='' and only present_hours
+TREND_FIELDS = ['billable_hours', 'non_billable_hours', 'present_hours']
+
+
+def trend_rows(start, end):
+    """
+    Per-month, per-project-type hours of active projects from ``start`` to
+    ``end``, plus one row per month (``project_type=''``) with the resources'
+    present hours, in a single UNION ALL query of two grouped selects.
+    """
+    period = period_range_q(start, end)
+    projects = Project.active_objects.filter(period).order_by().values('year', 'month', 'project_type').annotate(
+        billable_hours=_float_sum('billable_hours'),
+        non_billable_hours=_float_sum('non_billable_hours'),
+        present_hours=Value(0.0, output_field=FloatField()),
+    )
+    resources = Resource.active_objects.filter(period).order_by().annotate(
+        project_type=Value(MonthlyProductionSummary.ALL_TYPES, output_field=CharField()),
+    ).values('year', 'month', 'project_type').annotate(
+        billable_hours=Value(0.0, output_field=FloatField()),
+        non_billable_hours=Value(0.0, output_field=FloatField()),
+        present_hours=_float_sum('present_hours'),
+    )
+    return list(projects.union(resources, all=True))
@@ -0,0 +1,53 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from resources.models import Resource
+from .charts import invalidate_productivity_pie, schedule_prerender
+from .models import Project
+from .read_cache import bump_period_version
+from .reports import refresh_monthly_summary
+
+
+def period_changed(year, month):
+    """
+    Refresh everything derived from a period's rows. Called by the receivers
+    below and by bulk imports, which send no model signals.
+    """
+    refresh_monthly_summary(year, month)
+    # Caches are dropped once the write is visible: before the commit, a
+    # concurrent read would cache the old rows under the new version
+    transaction.on_commit(lambda: invalidate_productivity_pie(year, month))
+    transaction.on_commit(lambda: bump_period_version(year, month))
+    schedule_prerender(year, month)
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Resource)
+def remember_previous_period(sender, instance, **kwargs):
+    """Keep the stored period of an edited row, so moving it refreshes both months."""
+    instance._previous_period = None
+    if instance.pk:
+        instance._previous_period = sender.objects.filter(pk=instance.pk).values_list('year', 'month').first()
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Resource)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Resource)
+def refresh_period(sender, instance, **kwargs):
+    """Update the rollup and chart of the saved/deleted row's period (soft deletes are saves)."""
+    periods = {getattr(instance, '_previous_period', None), (instance.year, instance.month)}
+    for period in periods:
+        if period and None not in period:
+            period_changed(*period)
+
+
+@receiver(m2m_changed, sender=Project.resources.through)
+def refresh_membership_period(sender, instance, action, **kwargs):
+    """Project memberships only show in the trees; totals and charts don't depend on them."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        # Mark the edited row as modified for conditional GETs (update() sends no signals)
+        type(instance).objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        transaction.on_commit(lambda: bump_period_version(instance.year, instance.month))
@@ -0,0 +1,108 @@
+"""
+Streaming JSON responses for the tree endpoints.
+
+Without a selected period the trees cover every month of history, so they
+are written node by node from a queryset ``.iterator()`` instead of being
+built in memory and serialised at the end. Memory stays bounded by the chunk
+size and the first bytes go out as soon as the first chunk is read.
+
+The async views stream from an async iterator under ASGI and from a plain
+one under WSGI: Django serves a mismatched iterator by reading it into a
+list first, which would undo the streaming. ``aiterate`` adapts the blocking
+iterators of sync views (e.g. the exports) for ASGI.
+"""
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Rows fetched (and prefetched) per database round trip while streaming
+TREE_CHUNK_SIZE = 500
+
+
+def wants_streaming(request, selected_year, selected_month):
+    """
+    Stream when the client asks for it (``?stream=1``) or when no period is
+    selected; ``?stream=0`` forces the buffered JsonResponse.
+    """
+    stream = request.GET.get('stream')
+    if stream in ('0', '1'):
+        return stream == '1'
+    return not (selected_year and selected_month)
+
+
+def serves_async(request):
+    """Whether the response is served by the ASGI handler (and should stream an async iterator)."""
+    return isinstance(request, ASGIRequest)
+
+
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def achunked(iterable, size):
+    """``chunked`` over an async iterable."""
+    chunk = []
+    async for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def aiterate(iterable):
+    """
+    Async iterator over a blocking iterable: each item is produced in the
+    thread the sync ORM runs in, so database cursors stay on one connection.
+    """
+    iterator = iter(iterable)
+    sentinel = object()
+    step = sync_to_async(next)
+    while (item := await step(iterator, sentinel)) is not sentinel:
+        yield item
+
+
+def json_array(items, prefix='', suffix=''):
+    """
+    Encode ``items`` as a JSON array between ``prefix`` and ``suffix``, one
+    element per yielded string. The opening bracket is sent with the first
+    element, so the first chunk only goes out once there is data.
+    """
+    separator = prefix + '['
+    for item in items:
+        yield separator + json.dumps(item, cls=DjangoJSONEncoder)
+        separator = ','
+    yield ('' if separator == ',' else prefix + '[') + ']' + suffix
+
+
+async def ajson_array(items, prefix='', suffix=''):
+    """``json_array`` over an async iterable."""
+    separator = prefix + '['
+    async for item in items:
+        yield separator + json.dumps(item, cls=DjangoJSONEncoder)
+        separator = ','
+    yield ('' if separator == ',' else prefix + '[') + ']' + suffix
+
+
+def streaming_json_response(items, root=None):
+    """
+    ``StreamingHttpResponse`` writing ``items`` as a JSON array. With ``root``
+    (a dict) the array becomes that node's ``children`` and the body is
+    ``[root]``, the shape of the project tree. ``items`` may be an async
+    iterable (for responses served by ASGI).
+    """
+    encode = ajson_array if hasattr(items, '__aiter__') else json_array
+    if root is None:
+        chunks = encode(items)
+    else:
+        head = json.dumps(root, cls=DjangoJSONEncoder)[:-1]
+        chunks = encode(items, prefix=f'[{head}, "children": ', suffix='}]')
+    return StreamingHttpResponse(chunks, content_type='application/json')
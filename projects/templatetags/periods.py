@@ -0,0 +1,22 @@
+from django import template
+from django.urls import reverse
+
+from projects.periods import resolve_period
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def period_url(context, name):
+    """
+    URL of the named period-scoped view for the page's period (the URL's, else
+    the session default); the plain URL when there is none.
+    """
+    request = context.get('request')
+    if request is None:
+        return reverse(name)
+    kwargs = request.resolver_match.kwargs if request.resolver_match else {}
+    year, month = resolve_period(request, kwargs.get('year'), kwargs.get('month'))
+    if year and month:
+        return reverse(name, args=[year, month])
+    return reverse(name)
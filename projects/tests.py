@@ -1,3 +1,1061 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import subprocess
+import sys
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.cache import cache, caches
+from django.contrib.sessions.models import Session
+from django.db import connection, router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from resources.models import Resource
+from .models import MonthlyProductionSummary, Project
+from . import charts, replica, views
+from .read_cache import cache_stats
+from .reports import attendance_summary, build_summary_rows, refresh_monthly_summary
+
+
+class AttendanceSummaryTests(TestCase):
+    """Tests for the database-side attendance report totals."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        self.alice = Resource.objects.create(
+            resource_name="Alice", year=2025, month=5, working_days=22, present_day=20
+        )
+        self.bob = Resource.objects.create(
+            resource_name="Bob", year=2025, month=5, working_days=22, present_day=10
+        )
+        Resource.objects.create(resource_name="Gone", year=2025, month=5, present_day=5, is_active=False)
+        Project.objects.create(
+            project_name="Apollo", project_type='REGULAR', year=2025, month=5,
+            present_day=10, billable_days=10, non_billable_days=2,
+        )
+        Project.objects.create(
+            project_name="Gemini", project_type='REGULAR', year=2025, month=5,
+            present_day=5, billable_days=5,
+        )
+        Project.objects.create(
+            project_name="Mercury", project_type='HOURLY_PROJECT', year=2025, month=5,
+            present_day=3, non_billable_days=3,
+        )
+        Project.objects.create(project_name="Old", year=2025, month=4, billable_days=7)
+
+    def test_totals(self):
+        # The saves in setUp keep the rollup current, so this is one lookup
+        with self.assertNumQueries(1):
+            summary = attendance_summary(2025, 5)
+
+        self.assertEqual(summary['total_working_days'], 44)
+        self.assertEqual(summary['total_present_days'], 30)
+        self.assertEqual(summary['total_present_hours'], 240)
+        self.assertAlmostEqual(summary['presence_percentage'], 100 * 30 / 44)
+
+        self.assertEqual(summary['type_totals']['Regular Project'], {
+            'present_day': 15,
+            'billable_days': 15,
+            'non_billable_days': 2,
+            'billable_hours': 120,
+            'non_billable_hours': 16,
+        })
+        self.assertEqual(summary['type_totals']['Hourly Project']['non_billable_hours'], 24)
+        self.assertNotIn('Fixed Cost Project', summary['type_totals'])
+
+        self.assertEqual(summary['total_project_billable_days'], 15)
+        self.assertEqual(summary['total_project_non_billable_hours'], 40)
+        self.assertEqual(summary['team_productivity_hours'], 120)
+        self.assertEqual(summary['team_productivity_percentage'], 50)
+        self.assertEqual(summary['not_productive_percentage'], 50)
+
+    def test_empty_period(self):
+        summary = attendance_summary(2030, 1)
+        self.assertEqual(summary['total_working_days'], 0)
+        self.assertEqual(summary['presence_percentage'], 0)
+        self.assertEqual(summary['type_totals'], {})
+        self.assertEqual(summary['team_productivity_percentage'], 0)
+
+    def test_attendance_page(self):
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        response = self.client.get(reverse('projects:attendance_home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_project_billable_hours'], 120)
+        # Project rows are not rendered up front, only a loader per type
+        self.assertEqual(
+            [project_type['label'] for project_type in response.context['project_types']],
+            ['Regular Project', 'Hourly Project'],
+        )
+        self.assertNotContains(response, 'Apollo')
+        self.assertContains(response, reverse('projects:attendance_project_rows', args=[2025, 5, 'REGULAR']))
+
+    def test_project_type_rows(self):
+        apollo = Project.objects.get(project_name="Apollo")
+        apollo.resources.add(self.alice, self.bob)
+        url = reverse('projects:attendance_project_rows', args=[2025, 5, 'REGULAR'])
+
+        # freshness + projects + their resources
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual([p.project_name for p in response.context['projects']], ['Apollo', 'Gemini'])
+        self.assertContains(response, 'Alice')
+        self.assertNotContains(response, 'Mercury')
+        self.assertEqual(
+            self.client.get(reverse('projects:attendance_project_rows', args=[2025, 5, 'OTHER'])).status_code, 404
+        )
+        self.assertEqual(self.client.get('/projects/attendance/2025/13/projects/REGULAR/').status_code, 404)
+
+
+class TrendReportTests(TestCase):
+    """Tests for the multi-month trend report and its endpoints."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        # present_hours = present_day × 8
+        Resource.objects.create(resource_name="Alice", year=2025, month=1, present_day=20)
+        Resource.objects.create(resource_name="Alice", year=2025, month=3, present_day=10)
+        Project.objects.create(project_name="A", year=2025, month=1, billable_days=10, non_billable_days=2)
+        Project.objects.create(project_name="B", year=2025, month=1, billable_days=5, project_type='FIXED_COST')
+        Project.objects.create(project_name="C", year=2025, month=3, billable_days=10)
+        Project.objects.create(project_name="Outside", year=2024, month=12, billable_days=10)
+        Project.objects.create(project_name="Gone", year=2025, month=3, billable_days=10, is_active=False)
+
+    def test_one_query_and_derived_series(self):
+        from .trends import trend_report
+        with self.assertNumQueries(1):
+            report = trend_report((2025, 1), (2025, 3), window=2)
+
+        self.assertEqual(report['months'], ['2025-01', '2025-02', '2025-03'])
+        total = report['total']
+        self.assertEqual(total['billable_hours'], [120.0, 0.0, 80.0])
+        self.assertEqual(total['non_billable_hours'], [16.0, 0.0, 0.0])
+        self.assertEqual(total['present_hours'], [160.0, 0.0, 80.0])
+        self.assertEqual(total['productivity_percentage'], [75.0, 0.0, 100.0])
+        self.assertEqual(total['billable_hours_moving_average'], [120.0, 60.0, 40.0])
+        self.assertEqual(total['productivity_change'], [None, -75.0, 100.0])
+
+        self.assertEqual(list(report['types']), ['REGULAR', 'FIXED_COST'])
+        self.assertEqual(report['types']['FIXED_COST']['billable_hours'], [40.0, 0.0, 0.0])
+        self.assertEqual(report['types']['REGULAR']['productivity_percentage'], [50.0, 0.0, 100.0])
+
+    def test_empty_range(self):
+        from .trends import trend_report
+        report = trend_report((2030, 1), (2030, 2))
+        self.assertEqual(report['total']['billable_hours'], [0.0, 0.0])
+        self.assertEqual(report['types'], {})
+
+    def test_endpoints(self):
+        url = reverse('projects:attendance_trends_api')
+        data = self.client.get(url, {'start': '2025-01', 'end': '2025-03'}).json()
+        self.assertEqual(data['total']['billable_hours'], [120.0, 0.0, 80.0])
+        # The default range is the year up to the selected period
+        session = self.client.session
+        session['selected_year'], session['selected_month'] = 2025, 3
+        session.save()
+        self.assertEqual(self.client.get(url).json()['start'], '2024-04')
+
+        self.assertEqual(self.client.get(url, {'start': '2025-04', 'end': '2025-01'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2025-13'}).status_code, 400)
+
+        response = self.client.get(reverse('projects:attendance_trends'), {'start': '2025-01', 'end': '2025-03'})
+        self.assertContains(response, 'Fixed Cost Project')
+
+
+class AttendanceExportTests(TestCase):
+    """Tests for the CSV / XLSX export of the attendance report."""
+
+    def setUp(self):
+        alice = Resource.objects.create(resource_name="Alice", year=2025, month=5, working_days=20, present_day=18)
+        bob = Resource.objects.create(resource_name="=Bob", year=2025, month=6, working_days=21, present_day=20)
+        apollo = Project.objects.create(
+            project_name="Apollo", year=2025, month=5, billable_days=10, non_billable_days=2, poc=alice,
+        )
+        apollo.resources.add(alice, bob)
+        Project.objects.create(project_name="Gemini", year=2025, month=6, billable_days=4)
+        Project.objects.create(project_name="Fixed", year=2025, month=6, project_type='FIXED_COST', billable_days=1)
+
+    def csv_rows(self, response):
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(body)))
+
+    def test_month_csv(self):
+        response = self.client.get(reverse('projects:attendance_export', args=[2025, 5, 'csv']))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="attendance-2025-05.csv"')
+        rows = self.csv_rows(response)
+        self.assertEqual(rows[0], ['Resources'])
+        self.assertEqual(rows[2], ['2025', '5', 'Alice', '20.0', '18.0', '144.0'])
+        self.assertEqual(rows[3], ['Total', '', '', '20.0', '18.0', '144.0'])
+        self.assertEqual(rows[5], ['Regular Project'])
+        self.assertEqual(rows[7][2:6], ['Apollo', "'=Bob, Alice", '', 'Alice'])
+        self.assertEqual(rows[8], ['Total', '', '', '', '', '', '0.0', '10.0', '2.0', '80.0', '16.0'])
+
+    def test_range_streams_in_two_queries_per_chunk(self):
+        url = reverse('projects:attendance_export', args=['csv'])
+        # Resources, projects (with the POC and assignee joined), their resources
+        with self.assertNumQueries(3):
+            rows = self.csv_rows(self.client.get(url, {'start': '2025-05', 'end': '2025-06'}))
+        self.assertEqual([row for row in rows if len(row) == 1], [['Resources'], ['Regular Project'], ['Fixed Cost Project']])
+        self.assertIn(['Total', '', '', '', '', '', '0.0', '14.0', '2.0', '112.0', '16.0'], rows)
+
+    def test_xlsx_has_a_sheet_per_table(self):
+        from openpyxl import load_workbook
+        response = self.client.get(reverse('projects:attendance_export', args=['xlsx']), {'all': '1'})
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(workbook.sheetnames, ['Resources', 'Regular Project', 'Fixed Cost Project'])
+        rows = list(workbook['Resources'].values)
+        name = workbook['Resources'].cell(row=3, column=3)
+        self.assertEqual((name.value, name.data_type, name.quotePrefix), ('=Bob', 's', True))
+        self.assertEqual(rows[-1][:4], ('Total', None, None, 41))
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(reverse('projects:attendance_export', args=['pdf'])).status_code, 404)
+        # No period in the URL, the query or the session
+        self.assertEqual(self.client.get(reverse('projects:attendance_export', args=['csv'])).status_code, 400)
+
+
+class PeriodRedirectTests(TestCase):
+    """Pages that need a period send the user to the home page to pick one."""
+
+    def test_pages_without_a_period_redirect_home(self):
+        for url in (reverse('projects:project_list'), reverse('projects:attendance_home'),
+                    reverse('resources:resource_list')):
+            with self.subTest(url=url):
+                self.assertRedirects(self.client.get(url), reverse('projects:home'))
+        response = views.team_dashboard_redirect(RequestFactory().get('/'))
+        self.assertEqual(response.url, reverse('projects:home'))
+
+
+class MonthlyProductionSummaryTests(TestCase):
+    """Tests for the incrementally maintained monthly rollup."""
+
+    def setUp(self):
+        Resource.objects.create(resource_name="Alice", year=2025, month=5, working_days=20, present_day=20)
+        self.apollo = Project.objects.create(
+            project_name="Apollo", project_type='FIXED_COST', year=2025, month=5, billable_days=10
+        )
+
+    def period_row(self, year, month):
+        return MonthlyProductionSummary.objects.get(year=year, month=month, project_type='')
+
+    def test_saves_update_period(self):
+        row = self.period_row(2025, 5)
+        self.assertEqual((row.billable_hours, row.resource_present_hours), (80, 160))
+        self.assertEqual(row.productivity_percentage, 50)
+        self.assertEqual(
+            MonthlyProductionSummary.objects.get(year=2025, month=5, project_type='FIXED_COST').billable_days, 10
+        )
+
+        self.apollo.soft_delete()
+        self.assertEqual(self.period_row(2025, 5).billable_hours, 0)
+        self.assertFalse(MonthlyProductionSummary.objects.filter(project_type='FIXED_COST').exists())
+
+    def test_refresh_updates_rows_in_place(self):
+        # Upserted on (year, month, project_type): a concurrent refresh finding
+        # the rows already stored updates them instead of violating the key
+        before = self.period_row(2025, 5)
+        self.apollo.billable_days = 5
+        self.apollo.save()
+        refresh_monthly_summary(2025, 5)
+
+        after = self.period_row(2025, 5)
+        self.assertEqual(after.pk, before.pk)
+        self.assertEqual(after.billable_hours, 40)
+        self.assertEqual(MonthlyProductionSummary.objects.filter(year=2025, month=5).count(), 2)
+
+    def test_moving_a_project_refreshes_both_periods(self):
+        self.apollo.month = 6
+        self.apollo.save()
+        self.assertEqual(self.period_row(2025, 5).billable_hours, 0)
+        self.assertEqual(self.period_row(2025, 6).billable_hours, 80)
+
+    def test_live_fallback_without_rows(self):
+        MonthlyProductionSummary.objects.all().delete()
+        with self.assertNumQueries(3):
+            summary = attendance_summary(2025, 5)
+        self.assertEqual(summary['team_productivity_percentage'], 50)
+        self.assertFalse(MonthlyProductionSummary.objects.exists())
+
+    def test_rebuild_command(self):
+        Project.objects.create(project_name="Gemini", year=2024, month=1, billable_days=1)
+        MonthlyProductionSummary.objects.all().delete()
+        call_command('rebuild_monthly_summary', stdout=io.StringIO())
+
+        expected = sorted((r.year, r.month, r.project_type, r.billable_hours) for r in build_summary_rows())
+        stored = sorted(MonthlyProductionSummary.objects.values_list('year', 'month', 'project_type', 'billable_hours'))
+        self.assertEqual(stored, expected)
+        self.assertEqual(len(stored), 4)
+
+
+class ProductivityChartTests(TestCase):
+    """Tests for the cached productivity pie chart endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        Resource.objects.create(resource_name="Alice", year=2025, month=5, present_day=20)
+        self.project = Project.objects.create(project_name="Apollo", year=2025, month=5, billable_days=10)
+        self.url = reverse('projects:productivity_chart', args=[2025, 5])
+
+    def test_png_is_cached(self):
+        with mock.patch.object(charts, 'render_productivity_pie', wraps=charts.render_productivity_pie) as render:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first['Content-Type'], 'image/png')
+        self.assertTrue(first.content.startswith(b'\x89PNG'))
+        self.assertEqual(first.content, second.content)
+        self.assertIn('max-age', first['Cache-Control'])
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # A change in the period produces a different chart
+        self.project.billable_days = 5
+        self.project.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_save_invalidates_period(self):
+        self.client.get(self.url)
+        self.assertIsNotNone(cache.get('productivity_pie:2025:5'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Resource.objects.create(resource_name="Bob", year=2025, month=5)
+        self.assertIsNone(cache.get('productivity_pie:2025:5'))
+
+    def test_no_data(self):
+        self.assertEqual(
+            self.client.get(reverse('projects:productivity_chart', args=[2030, 1])).status_code, 404
+        )
+
+
+class LazyMatplotlibTests(TestCase):
+    def test_url_conf_does_not_import_matplotlib(self):
+        script = (
+            "import os, sys, django\n"
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Team_Production_Report.settings')\n"
+            "django.setup()\n"
+            "import Team_Production_Report.urls\n"
+            "sys.exit('matplotlib' in sys.modules)\n"
+        )
+        completed = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR)
+        self.assertEqual(completed.returncode, 0)
+
+
+class ImportTeamProductionTests(TestCase):
+    """Tests for the bulk import_team_production command."""
+
+    def run_import(self, rows, batch_size=2):
+        target = 'projects.management.commands.import_team_production.pd.read_excel'
+        with mock.patch(target, return_value=pd.DataFrame(rows)):
+            call_command('import_team_production', 'sheet.xlsx', batch_size=batch_size, stdout=io.StringIO())
+
+    def test_creates_and_links(self):
+        existing = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        self.run_import([
+            {'resource_name': 'Alice', 'project_name': 'Apollo', 'year': 2025, 'month': 5,
+             'billable_days': 10, 'non_billable_days': 2},
+            {'resource_name': ' Bob ', 'project_name': 'Apollo', 'year': 2025, 'month': 5,
+             'billable_days': 10, 'non_billable_days': 2},
+            {'resource_name': 'Bob', 'project_name': 'Gemini', 'year': 2025, 'month': 6,
+             'billable_days': 0, 'non_billable_days': 4},
+            {'resource_name': None, 'project_name': 'Broken', 'year': 2025, 'month': 6},
+        ])
+
+        self.assertEqual(Resource.objects.count(), 3)
+        bob = Resource.objects.get(resource_name='Bob', year=2025, month=5)
+        self.assertEqual(bob.working_days, Resource.get_working_days(2025, 5))
+
+        apollo = Project.objects.get(project_name='Apollo')
+        self.assertEqual(apollo.billable_hours, 80)
+        self.assertEqual(apollo.non_billable_hours, 16)
+        self.assertEqual(set(apollo.resources.all()), {existing, bob})
+
+        gemini = Project.objects.get(project_name='Gemini')
+        self.assertEqual((gemini.billable_hours, gemini.non_billable_hours), (0, 32))
+        self.assertFalse(Project.objects.filter(project_name='Broken').exists())
+
+    def test_reimport_updates_in_place(self):
+        row = {'resource_name': 'Alice', 'project_name': 'Apollo', 'year': 2025, 'month': 5,
+               'billable_days': 10, 'non_billable_days': 0}
+        self.run_import([row])
+        self.run_import([dict(row, billable_days=12)])
+
+        apollo = Project.objects.get()
+        self.assertEqual(apollo.billable_hours, 96)
+        self.assertEqual(apollo.resources.count(), 1)
+        self.assertEqual(Resource.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        rows = [
+            {'resource_name': f'R{i}', 'project_name': f'P{i % 7}', 'year': 2025, 'month': 5, 'billable_days': 1}
+            for i in range(200)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            self.run_import(rows, batch_size=500)
+        self.assertLess(len(queries), 20)
+        self.assertEqual(Project.resources.through.objects.count(), 200)
+
+
+class ProjectBulkUpdateTests(TestCase):
+    """Tests for the batched save endpoint of the project grid."""
+
+    def setUp(self):
+        self.url = reverse('projects:project_bulk_update')
+        self.projects = [
+            Project.objects.create(project_name=f"Project {i:03d}", year=2025, month=5, billable_days=1)
+            for i in range(120)
+        ]
+
+    def post(self, rows):
+        return self.client.post(self.url, json.dumps({'rows': rows}), content_type='application/json')
+
+    def test_saves_many_rows_in_one_update(self):
+        rows = [{'id': project.pk, 'billable_days': 10, 'non_billable_days': 2} for project in self.projects]
+        rows[0] = {'id': self.projects[0].pk, 'billable_days': 0, 'non_billable_days': 3}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(rows)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], 120)
+        updates = [query for query in queries if query['sql'].startswith('UPDATE "projects"')]
+        self.assertEqual(len(updates), 1)
+
+        first, second = Project.objects.get(pk=self.projects[0].pk), Project.objects.get(pk=self.projects[1].pk)
+        self.assertEqual((first.billable_hours, first.non_billable_hours), (0, 24))
+        self.assertEqual((second.billable_hours, second.non_billable_hours), (80, 16))
+        self.assertGreater(second.updated_at, self.projects[1].updated_at)
+        # Bulk writes send no signals; the period rollup is refreshed by the endpoint
+        self.assertEqual(attendance_summary(2025, 5)['total_project_billable_hours'], 119 * 80)
+
+    def test_partial_and_unchanged_rows(self):
+        response = self.post([
+            {'id': self.projects[0].pk, 'present_day': 5},
+            {'id': self.projects[1].pk, 'billable_days': 1},
+        ])
+        self.assertEqual(response.json()['updated'], 1)
+        project = Project.objects.get(pk=self.projects[0].pk)
+        self.assertEqual((project.present_day, project.billable_days, project.billable_hours), (5, 1, 8))
+
+    def test_invalid_batch_saves_nothing(self):
+        response = self.post([
+            {'id': self.projects[0].pk, 'billable_days': 4},
+            {'id': self.projects[1].pk, 'billable_days': -1},
+            {'id': self.projects[2].pk, 'non_billable_days': 'two'},
+            {'id': 999999, 'billable_days': 1},
+            {'id': self.projects[3].pk, 'billable_hours': 100},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [(error['row'], error['field']) for error in response.json()['errors']],
+            [(1, 'billable_days'), (2, 'non_billable_days'), (3, 'id'), (4, 'billable_hours')],
+        )
+        self.assertEqual(Project.objects.get(pk=self.projects[0].pk).billable_days, 1)
+
+    def test_rejects_malformed_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.assertEqual(self.client.post(self.url, 'nope', content_type='application/json').status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+
+    def test_rejects_unhashable_ids_and_huge_numbers(self):
+        response = self.post([
+            {'id': [self.projects[0].pk], 'billable_days': 1},
+            {'id': {'pk': 1}},
+            {'id': self.projects[1].pk, 'billable_days': 10 ** 400},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [(error['row'], error['field']) for error in response.json()['errors']],
+            [(0, 'id'), (1, 'id'), (2, 'billable_days')],
+        )
+        self.assertEqual(Project.objects.get(pk=self.projects[1].pk).billable_days, 1)
+
+    def test_rejects_non_finite_numbers(self):
+        for value in ('nan', 'inf', 1e309):
+            response = self.post([{'id': self.projects[0].pk, 'billable_days': value}])
+            self.assertEqual(response.status_code, 400, value)
+            self.assertEqual(
+                [(error['field'], error['message']) for error in response.json()['errors']],
+                [('billable_days', 'Enter a number')],
+            )
+        self.assertEqual(Project.objects.get(pk=self.projects[0].pk).billable_days, 1)
+
+
+class ProjectTreeViewTests(TestCase):
+    """Tests for the project tree JSON endpoint."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.url = reverse('projects:project_tree')
+
+    def add_projects(self, count):
+        alice = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        gone = Resource.objects.create(resource_name="Gone", year=2025, month=5, is_active=False)
+        for i in range(count):
+            project = Project.objects.create(
+                project_name=f"Project {i:02d}", year=2025, month=5, assign_project=alice, poc=alice,
+            )
+            project.resources.add(alice, gone)
+
+    def test_query_count_does_not_grow_with_projects(self):
+        for count in (1, 10):
+            with self.captureOnCommitCallbacks(execute=True):
+                Project.objects.all().delete()
+                Resource.objects.all().delete()
+                self.add_projects(count)
+            # session + freshness + projects (with assignee/POC joined) + active resources
+            with self.assertNumQueries(4):
+                tree = self.client.get(self.url).json()
+            self.assertEqual(len(tree[0]['children']), count)
+
+    def test_tree_content(self):
+        self.add_projects(1)
+        Project.objects.create(project_name="Deleted", year=2025, month=5, is_active=False)
+        Project.objects.create(project_name="Other month", year=2025, month=4)
+
+        [root] = self.client.get(self.url).json()
+        [project] = root['children']
+        self.assertEqual(project['text'], 'Project 00 (Regular Project)')
+        self.assertEqual([child['text'] for child in project['children']], [
+            '📋 Assigned Resource: Alice',
+            '👥 Resources (1)',
+            '🎯 POC: Alice',
+        ])
+        self.assertEqual(project['children'][1]['children'], [{'text': 'Alice', 'icon': 'fas fa-user'}])
+
+
+    def test_streaming_matches_buffered_tree(self):
+        self.add_projects(3)
+        buffered = self.client.get(self.url, {'stream': '0'}).json()
+        response = self.client.get(self.url, {'stream': '1'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), buffered)
+
+    def test_streams_all_history_without_period(self):
+        self.add_projects(2)
+        Project.objects.create(project_name="Earlier", year=2024, month=1)
+        self.client.session.flush()
+        self.client.cookies.clear()
+
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        [root] = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(root['text'], 'All Projects')
+        self.assertEqual(len(root['children']), 3)
+
+    async def test_asgi_streams_from_the_async_orm(self):
+        await sync_to_async(self.add_projects)(3)
+        url = reverse('projects:project_tree', args=[2025, 5])
+        buffered = (await self.async_client.get(url, {'stream': '0'})).json()
+        response = await self.async_client.get(url, {'stream': '1'})
+        # An async iterator, so the ASGI handler sends it chunk by chunk
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(b''.join([chunk async for chunk in response.streaming_content])), buffered)
+        self.assertEqual(len(buffered[0]['children']), 3)
+
+        revalidated = await self.async_client.get(url, headers={'if-none-match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+
+    def test_children_endpoint_expands_one_level_at_a_time(self):
+        self.add_projects(3)
+        url = reverse('projects:project_tree_children')
+
+        with self.assertNumQueries(3):
+            [root] = self.client.get(url).json()
+        self.assertEqual(len(root['children']), 3)
+        project = root['children'][0]
+        self.assertEqual(project['text'], 'Project 00 (Regular Project)')
+        self.assertFalse(project['opened'])
+        self.assertTrue(project['has_children'])
+        self.assertNotIn('children', project)
+
+        roles = self.client.get(url, {'node': project['id']}).json()
+        [full_project] = [
+            node for node in self.client.get(self.url).json()[0]['children'] if node['text'] == project['text']
+        ]
+        self.assertEqual([node['text'] for node in roles], [node['text'] for node in full_project['children']])
+
+        resources = self.client.get(url, {'node': roles[1]['id']}).json()
+        self.assertEqual(resources, full_project['children'][1]['children'])
+
+    def test_children_endpoint_rejects_unknown_nodes(self):
+        url = reverse('projects:project_tree_children')
+        self.assertEqual(self.client.get(url, {'node': 'resource:1'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'node': 'project:x'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'node': 'project:999'}).status_code, 404)
+
+
+class ProjectTreeHtmlTests(TestCase):
+    """Tests for the cached, server-rendered project tree page."""
+
+    def setUp(self):
+        cache.clear()
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.url = reverse('projects:project_tree_html')
+        self.alice = Resource.objects.create(resource_name="Alice <admin>", year=2025, month=5)
+        gone = Resource.objects.create(resource_name="Gone", year=2025, month=5, is_active=False)
+        self.apollo = Project.objects.create(project_name="Apollo", year=2025, month=5, poc=self.alice)
+        self.apollo.resources.add(self.alice, gone)
+        Project.objects.create(project_name="Deleted", year=2025, month=5, is_active=False)
+        Project.objects.create(project_name="Other month", year=2025, month=4)
+
+    def test_renders_active_projects_of_the_period(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, '<strong>Apollo</strong> (Regular Project)', html=False)
+        self.assertContains(response, '👥 Resources (1)')
+        self.assertContains(response, '🎯 POC: Alice &lt;admin&gt;')
+        self.assertNotContains(response, 'Gone')
+        self.assertNotContains(response, 'Deleted')
+        self.assertNotContains(response, 'Other month')
+
+    def test_repeat_views_are_served_from_cache(self):
+        self.client.get(self.url)
+        # Only the session and freshness lookups reach the database
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+    def test_changes_invalidate_the_period(self):
+        self.client.get(self.url)
+        Project.objects.create(project_name="Gemini", year=2025, month=5)
+        self.assertContains(self.client.get(self.url), 'Gemini')
+
+        bob = Resource.objects.create(resource_name="Bob", year=2025, month=5)
+        self.client.get(self.url)
+        self.apollo.resources.add(bob)
+        self.assertContains(self.client.get(self.url), '👥 Resources (2)')
+
+    def test_changes_from_other_workers_are_seen(self):
+        # A write in another process clears nothing here; the freshness stamp still moves
+        first = self.client.get(self.url)
+        Project.objects.filter(pk=self.apollo.pk).update(project_name="Artemis", updated_at=timezone.now())
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Artemis')
+        self.assertNotContains(response, 'Apollo')
+
+
+class ReadCacheTests(TestCase):
+    """Tests for the versioned per-period read cache of the reporting endpoints."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        self.alice = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        self.apollo = Project.objects.create(project_name="Apollo", year=2025, month=5, poc=self.alice)
+        Project.objects.create(project_name="Old", year=2025, month=4)
+
+    def select_period(self, year, month):
+        session = self.client.session
+        session['selected_year'] = year
+        session['selected_month'] = month
+        session.save()
+
+    def test_repeat_reads_skip_the_database(self):
+        self.select_period(2025, 5)
+        url = reverse('projects:project_list_api')
+        first = self.client.get(url).json()
+        # Only the session and freshness lookups are left
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url).json(), first)
+        self.assertEqual(cache_stats(['project_list_api']), {'project_list_api': {'hits': 1, 'misses': 1}})
+
+    def test_write_invalidates_only_its_period(self):
+        url = reverse('projects:project_list_api')
+        self.select_period(2025, 4)
+        self.client.get(url)
+        self.select_period(2025, 5)
+        self.client.get(url)
+
+        self.apollo.project_name = "Apollo 11"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apollo.save()
+
+        self.assertEqual([p['name'] for p in self.client.get(url).json()], ['Apollo 11'])
+        self.select_period(2025, 4)
+        with self.assertNumQueries(2):
+            self.assertEqual([p['name'] for p in self.client.get(url).json()], ['Old'])
+
+    def test_versions_move_when_the_write_commits(self):
+        from .read_cache import period_version
+        before = period_version(2025, 5)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.apollo.save()
+            # A read racing the open transaction still caches under the old version
+            self.assertEqual(period_version(2025, 5), before)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(period_version(2025, 5), before)
+
+    def test_membership_change_invalidates_trees(self):
+        self.select_period(2025, 5)
+        url = reverse('projects:project_tree')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apollo.resources.add(self.alice)
+        role_nodes = self.client.get(url).json()[0]['children'][0]['children']
+        self.assertIn('👥 Resources (1)', [node['text'] for node in role_nodes])
+
+    def test_stats_command(self):
+        self.select_period(2025, 5)
+        self.client.get(reverse('projects:project_list_api'))
+        self.client.get(reverse('projects:project_list_api'))
+        out = io.StringIO()
+        # Counted in this process; as if they were kept in memcached or redis
+        with mock.patch('projects.management.commands.read_cache_stats.counters_shared', return_value=True):
+            call_command('read_cache_stats', '--reset', stdout=out)
+        self.assertRegex(out.getvalue(), r'project_list_api\s+1\s+1\s+50%')
+        self.assertEqual(cache_stats(['project_list_api']), {'project_list_api': {'hits': 0, 'misses': 0}})
+
+    def test_stats_command_refuses_unshared_counters(self):
+        with self.assertRaisesMessage(CommandError, 'per process'):
+            call_command('read_cache_stats', stdout=io.StringIO())
+
+        with tempfile.TemporaryDirectory() as location:
+            file_cache = {**settings.CACHES, 'reports': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+            }}
+            with self.settings(CACHES=file_cache):
+                self.client.get(reverse('projects:project_list_api', args=[2025, 5]))
+                self.assertEqual(cache_stats(['project_list_api']), {'project_list_api': {'hits': 0, 'misses': 0}})
+                with self.assertRaisesMessage(CommandError, 'does not count'):
+                    call_command('read_cache_stats', stdout=io.StringIO())
+
+
+class ConditionalGetTests(TestCase):
+    """Tests for the ETag / Last-Modified revalidation of the period-scoped views."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.alice = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        self.apollo = Project.objects.create(project_name="Apollo", year=2025, month=5, poc=self.alice)
+        self.url = reverse('projects:project_tree')
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_period_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+        # session + freshness, nothing is built
+        with self.assertNumQueries(2):
+            response = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Writes to another month leave this period's ETag alone
+        Resource.objects.create(resource_name="Bob", year=2025, month=4)
+        self.assertEqual(self.revalidate(self.url, etag).status_code, 304)
+
+    def test_changes_produce_a_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.alice.present_day = 3
+        self.alice.save()
+        response = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.apollo.resources.add(self.alice)
+        self.assertEqual(self.revalidate(self.url, etag).status_code, 200)
+
+        etag = self.client.get(self.url)['ETag']
+        Resource.objects.filter(pk=self.alice.pk).delete()
+        self.assertEqual(self.revalidate(self.url, etag).status_code, 200)
+
+    def test_etag_depends_on_selected_period(self):
+        etag = self.client.get(self.url)['ETag']
+        session = self.client.session
+        session['selected_month'] = 4
+        session.save()
+        self.assertEqual(self.revalidate(self.url, etag).status_code, 200)
+
+    def test_url_period_views_send_last_modified(self):
+        url = reverse('projects:attendance_project_rows', args=[2025, 5, 'REGULAR'])
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+
+class PeriodUrlTests(TestCase):
+    """Tests for the URL-addressed reporting periods."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        Project.objects.create(project_name="Apollo", year=2025, month=5)
+        Project.objects.create(project_name="Old", year=2025, month=4)
+
+    def session_writes(self, queries):
+        return [q['sql'] for q in queries if 'django_session' in q['sql'] and not q['sql'].startswith('SELECT')]
+
+    def test_period_routes(self):
+        self.assertEqual(reverse('projects:attendance_home', args=[2025, 5]), '/projects/2025/05/attendance/')
+        self.assertEqual(reverse('resources:resource_tree', args=[2025, 5]), '/resources/2025/05/resource-tree/')
+        self.assertEqual(reverse('home', args=[2025, 5]), '/2025/05/')
+
+    def test_api_uses_the_period_in_the_url(self):
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 4
+        session.save()
+
+        url = reverse('projects:project_list_api', args=[2025, 5])
+        # freshness + projects; the session is not read
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual([p['name'] for p in response.json()], ['Apollo'])
+        self.assertIn('Last-Modified', response)
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        self.assertEqual([p['name'] for p in self.client.get(reverse('projects:project_list_api')).json()], ['Old'])
+
+    def test_dashboard_writes_the_session_only_when_the_period_changes(self):
+        url = reverse('home', args=[2025, 5])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertTrue(self.session_writes(queries))
+        self.assertEqual(self.client.session['selected_month'], 5)
+
+        for repeat_url in (url, reverse('home')):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(repeat_url)
+            self.assertEqual(response.context['month'], 5)
+            self.assertEqual(self.session_writes(queries), [])
+
+    def test_query_string_redirects_to_the_period_url(self):
+        response = self.client.get(reverse('home'), {'year': 2025, 'month': 5})
+        self.assertRedirects(response, '/2025/05/')
+        response = self.client.get(reverse('home'), {'year': 'x', 'month': 13})
+        self.assertEqual(response.status_code, 302)
+
+    def test_navigation_links_carry_the_period(self):
+        response = self.client.get(reverse('projects:attendance_home', args=[2025, 5]))
+        self.assertContains(response, 'href="/projects/2025/05/projects/"')
+
+    def test_create_saves_into_the_page_period(self):
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        list_page = self.client.get(reverse('projects:project_list', args=[2024, 3]))
+        self.assertContains(list_page, 'href="/projects/2024/03/projects/create/"')
+
+        alice = Resource.objects.create(resource_name='Alice', year=2024, month=3)
+        response = self.client.post(reverse('projects:project_create', args=[2024, 3]), {
+            'project_name': 'Gemini', 'project_type': 'REGULAR', 'year': 2025, 'month': 5, 'resources': [alice.pk],
+            'present_day': 0, 'billable_days': 0, 'non_billable_days': 0,
+        })
+        self.assertRedirects(response, reverse('projects:project_list', args=[2024, 3]))
+        gemini = Project.objects.get(project_name='Gemini')
+        self.assertEqual((gemini.year, gemini.month), (2024, 3))
+
+        response = self.client.post(reverse('resources:resource_create', args=[2024, 3]), {
+            'resource_name': 'Carol', 'present_day': 0,
+        })
+        self.assertRedirects(response, reverse('resources:resource_list', args=[2024, 3]))
+        self.assertTrue(Resource.objects.filter(resource_name='Carol', year=2024, month=3).exists())
+
+        response = self.client.post(reverse('projects:project_delete', args=[gemini.pk]))
+        self.assertRedirects(response, reverse('projects:project_list', args=[2024, 3]))
+
+
+class ProjectListDataTests(TestCase):
+    """Tests for the DataTables server-side endpoint of the project list."""
+
+    def setUp(self):
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.url = reverse('projects:project_list_data')
+        self.alice = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        self.bob = Resource.objects.create(resource_name="Bob", year=2025, month=5)
+        for i in range(12):
+            project = Project.objects.create(
+                project_name=f"Project {i:02d}", year=2025, month=5, billable_days=i % 4,
+                project_type='FIXED_COST' if i % 2 else 'REGULAR', poc=self.bob,
+            )
+            project.resources.add(self.alice if i % 3 else self.bob)
+        # Other periods and soft-deleted projects are never listed
+        Project.objects.create(project_name="Old", year=2024, month=5)
+        Project.objects.create(project_name="Gone", year=2025, month=5, is_active=False)
+
+    def test_page_of_rows_in_constant_queries(self):
+        # session + freshness + count + page + resources prefetch
+        with self.assertNumQueries(5):
+            data = self.client.get(self.url, {'draw': 3, 'start': 0, 'length': 10}).json()
+
+        self.assertEqual(data['draw'], 3)
+        self.assertEqual(data['recordsTotal'], 12)
+        self.assertEqual(data['recordsFiltered'], 12)
+        self.assertEqual(len(data['data']), 10)
+        first = data['data'][0]
+        self.assertEqual(first['number'], 1)
+        self.assertEqual(first['project_name'], 'Project 00')
+        self.assertEqual(first['resources'], ['Bob'])
+        self.assertEqual(first['poc'], 'Bob')
+
+    def test_search_matches_resources_and_type(self):
+        data = self.client.get(self.url, {'search[value]': 'alice', 'length': 50}).json()
+        self.assertEqual(data['recordsFiltered'], 8)
+        self.assertTrue(all(row['resources'] == ['Alice'] for row in data['data']))
+
+        data = self.client.get(self.url, {'search[value]': 'fixed', 'length': 50}).json()
+        self.assertEqual(data['recordsFiltered'], 6)
+
+    def test_sorting(self):
+        data = self.client.get(self.url, {
+            'order[0][column]': 7, 'order[0][dir]': 'desc',
+            'order[1][column]': 1, 'order[1][dir]': 'asc',
+            'length': 3,
+        }).json()
+        self.assertEqual([row['project_name'] for row in data['data']], ['Project 03', 'Project 07', 'Project 11'])
+
+    def test_keyset_cursor_matches_offset_paging(self):
+        params = {'order[0][column]': 7, 'order[0][dir]': 'desc', 'length': 5}
+        by_offset = []
+        for start in range(0, 12, 5):
+            page = self.client.get(self.url, dict(params, start=start)).json()
+            by_offset.extend(row['id'] for row in page['data'])
+
+        by_cursor = []
+        start, cursor = 0, None
+        while True:
+            page = self.client.get(self.url, dict(params, start=start, cursor=cursor or '')).json()
+            by_cursor.extend(row['id'] for row in page['data'])
+            self.assertEqual(page['data'][0]['number'], start + 1)
+            if not page['next_cursor']:
+                break
+            start, cursor = start + 5, page['next_cursor']
+
+        self.assertEqual(by_cursor, by_offset)
+        self.assertEqual(len(set(by_cursor)), 12)
+
+    def test_foreign_cursors_fall_back_to_offset(self):
+        params = {'order[0][column]': 1, 'length': 5, 'start': 5}
+        expected = self.client.get(self.url, params).json()['data']
+        for payload in (b'[]', b'1', b'"x"', b'null', b'not json'):
+            cursor = base64.urlsafe_b64encode(payload).decode()
+            response = self.client.get(self.url, dict(params, cursor=cursor))
+            self.assertEqual(response.status_code, 200, payload)
+            self.assertEqual(response.json()['data'], expected, payload)
+
+    def test_keyset_cursor_keeps_null_sort_values(self):
+        Project.objects.filter(project_name__in=[f"Project {i:02d}" for i in range(0, 12, 2)]).update(poc=None)
+        for direction in ('desc', 'asc'):
+            params = {'order[0][column]': 5, 'order[0][dir]': direction, 'length': 5}
+            by_offset = []
+            for start in range(0, 12, 5):
+                by_offset.extend(row['id'] for row in self.client.get(self.url, dict(params, start=start)).json()['data'])
+
+            by_cursor = []
+            start, cursor = 0, ''
+            while True:
+                page = self.client.get(self.url, dict(params, start=start, cursor=cursor)).json()
+                by_cursor.extend(row['id'] for row in page['data'])
+                if not page['next_cursor']:
+                    break
+                start, cursor = start + 5, page['next_cursor']
+
+            self.assertEqual(by_cursor, by_offset, direction)
+            self.assertEqual(len(set(by_cursor)), 12, direction)
+
+    def test_requires_selected_period(self):
+        self.client.session.flush()
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+
+class DatabaseSettingsTests(TestCase):
+    def test_sqlite_default_profile(self):
+        from Team_Production_Report.database import database_from_env
+        database = database_from_env(settings.BASE_DIR)
+        self.assertIn('PRAGMA journal_mode=WAL', database['OPTIONS']['init_command'])
+        self.assertEqual(database['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_postgres_pool_disables_persistent_connections(self):
+        from Team_Production_Report.database import database_from_env
+        with mock.patch.dict('os.environ', {'DB_ENGINE': 'postgres', 'DB_POOL_MAX_SIZE': '4'}):
+            database = database_from_env(settings.BASE_DIR)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 4)
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Routing decisions only; the test run has no replica database to query."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(replica, 'replica_configured', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def routed_view(self, seen):
+        @replica.replica_reads
+        def view(request):
+            seen['project'] = router.db_for_read(Project)
+            seen['session'] = router.db_for_read(Session)
+            seen['write'] = router.db_for_write(Project)
+            seen['after_write'] = router.db_for_read(Project)
+            return HttpResponse()
+        return view
+
+    def test_reads_go_to_replica_until_the_request_writes(self):
+        seen = {}
+        self.routed_view(seen)(self.factory.get('/'))
+        self.assertEqual(seen, {'project': 'replica', 'session': 'default', 'write': 'default', 'after_write': 'default'})
+        self.assertIsNone(replica._read_alias.get())
+
+    def test_sticky_cookie_and_unsafe_methods_read_the_primary(self):
+        for request in (self.factory.post('/'), self.factory.get('/', HTTP_COOKIE='primary_reads=1')):
+            seen = {}
+            self.routed_view(seen)(request)
+            self.assertEqual(seen['project'], 'default')
+
+    def test_post_sets_the_sticky_cookie(self):
+        middleware = replica.replica_stickiness_middleware(lambda request: HttpResponse())
+        self.assertIn('primary_reads', middleware(self.factory.post('/')).cookies)
+        self.assertNotIn('primary_reads', middleware(self.factory.get('/')).cookies)
+
+    def test_streamed_body_keeps_the_route(self):
+        def chunks():
+            yield router.db_for_read(Project)
+
+        view = replica.replica_reads(lambda request: StreamingHttpResponse(chunks()))
+        response = view(self.factory.get('/'))
+        self.assertEqual(b''.join(response.streaming_content), b'replica')
+
+    def test_replica_cache_entries_expire_sooner(self):
+        token = replica._read_alias.set('replica')
+        try:
+            with self.settings(REPLICA_CACHE_TIMEOUT=30):
+                self.assertEqual(replica.replica_cache_timeout(), 30)
+                self.assertEqual(replica.replica_cache_timeout(10), 10)
+        finally:
+            replica._read_alias.reset(token)
+        self.assertEqual(replica.replica_cache_timeout(3600), 3600)
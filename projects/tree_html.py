@@ -0,0 +1,54 @@
+"""
+Server-rendered project tree (the dependency-free HTML view).
+
+The tree of a period is rendered from a template once and the fragment is
+cached, so repeat views cost one cache read. The key carries the period's
+freshness stamp (see ``conditional``), read from the database on every
+request: a change made through any worker moves the stamp, so no process can
+serve a fragment older than the ETag it is sent with, whatever cache backend
+holds it.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.template.loader import render_to_string
+
+from resources.models import Resource
+from .conditional import freshness_stamp, period_freshness
+from .models import Project
+from .replica import replica_cache_timeout
+
+TREE_HTML_CACHE_TIMEOUT = getattr(settings, 'PROJECT_TREE_HTML_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def _tree_html_key(year, month, freshness):
+    period = f"{year}:{month}" if year and month else "all"
+    return f"project_tree_html:{period}:{freshness_stamp(freshness)}"
+
+
+def render_project_tree_html(year=None, month=None):
+    """Render the tree fragment of active projects (of one period, or of all history)."""
+    projects = Project.active_objects.select_related('assign_project', 'poc').only(
+        'project_name', 'project_type', 'assign_project__resource_name', 'poc__resource_name'
+    ).prefetch_related(
+        Prefetch('resources', queryset=Resource.active_objects.only('id', 'resource_name'))
+    )
+    if year and month:
+        projects = projects.filter(year=year, month=month)
+    return render_to_string('projects/project_tree_fragment.html', {'projects': projects})
+
+
+def get_project_tree_html(year=None, month=None, freshness=None):
+    """
+    Return the cached tree fragment, rendering it on a cache miss.
+    ``freshness`` is the period's ``period_freshness``, read when not given.
+    """
+    if freshness is None:
+        freshness = period_freshness(year, month)
+    key = _tree_html_key(year, month, freshness)
+    html = cache.get(key)
+    if html is None:
+        html = render_project_tree_html(year, month)
+        cache.set(key, html, replica_cache_timeout(TREE_HTML_CACHE_TIMEOUT))
+    return html
+
@@ -0,0 +1,136 @@
+"""
+Multi-month trend report.
+
+The rows of a range of months come from ``reports.trend_rows`` (one query);
+everything derived from them (per-month totals, productivity, moving
+averages, month-over-month changes) is computed on whole columns with
+pandas. Months without data are kept as zeros so every series has one value
+per month of the range. pandas is imported on first use, like numpy in
+``resources.working_days``.
+"""
+from django.conf import settings
+
+from .models import MonthlyProductionSummary, Project
+from .reports import TREND_FIELDS, trend_rows
+
+# Longest range a trend may cover, in months
+TREND_MAX_MONTHS = getattr(settings, 'TREND_MAX_MONTHS', 120)
+TREND_DEFAULT_WINDOW = 3
+
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+
+def parse_month(value):
+    """(year, month) from 'YYYY-MM'; ValueError when malformed."""
+    year, month = (int(part) for part in value.split('-'))
+    if not (1000 <= year <= 9999 and 1 <= month <= 12):
+        raise ValueError(value)
+    return year, month
+
+
+def shift_month(year, month, months):
+    """The (year, month) ``months`` after (negative: before) the given one."""
+    index = month_index(year, month) + months
+    return index // 12, index % 12 + 1
+
+
+def _productivity(billable, present):
+    # 100 × billable / present per month (a series, or a table with one column
+    # per type), 0 where nobody was present, clamped to [0, 100]
+    return (100 * billable).div(present, axis=0).mul(present > 0, axis=0).fillna(0.0).clip(0, 100)
+
+
+def _values(series):
+    # JSON-ready list: rounded, with None for the undefined first change
+    return [None if value != value else round(value, 2) for value in series.tolist()]
+
+
+def trend_report(start, end, window=TREND_DEFAULT_WINDOW):
+    """
+    Trend of every month from ``start`` to ``end`` (inclusive (year, month)
+    pairs): hours, present hours and productivity for the team and for each
+    project type, with ``window``-month moving averages and month-over-month
+    changes. Series are lists with one value per entry of ``months``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    first, last = month_index(*start), month_index(*end)
+    months = np.arange(first, last + 1)
+    frame = pd.DataFrame.from_records(
+        trend_rows(start, end), columns=['year', 'month', 'project_type', *TREND_FIELDS],
+    ).astype({'year': int, 'month': int, **dict.fromkeys(TREND_FIELDS, float)})  # Typed even when empty
+    frame['period'] = frame['year'] * 12 + frame['month'] - 1
+
+    is_resources = frame['project_type'] == MonthlyProductionSummary.ALL_TYPES
+    projects = frame[~is_resources].set_index(['period', 'project_type'])
+    present = frame[is_resources].groupby('period')['present_hours'].sum().reindex(months, fill_value=0.0)
+
+    # Types in the order of the choices; unknown stored codes last
+    found = set(frame.loc[~is_resources, 'project_type'])
+    type_codes = [code for code, _ in Project.PROJECT_TYPE_CHOICES if code in found]
+    type_codes += sorted(found - set(type_codes))
+
+    def per_type(field):
+        # months × types table of a field, zeros where a type had no projects
+        return projects[field].unstack('project_type').reindex(index=months, columns=type_codes).fillna(0.0)
+
+    billable, non_billable = per_type('billable_hours'), per_type('non_billable_hours')
+    type_productivity = _productivity(billable, present)
+
+    total_billable = billable.sum(axis=1)
+    total_non_billable = non_billable.sum(axis=1)
+    total_productivity = _productivity(total_billable, present)
+
+    def moving(series):
+        return series.rolling(window, min_periods=1).mean()
+
+    labels = dict(Project.PROJECT_TYPE_CHOICES)
+    return {
+        'start': f'{start[0]:04d}-{start[1]:02d}',
+        'end': f'{end[0]:04d}-{end[1]:02d}',
+        'window': window,
+        'months': [f'{index // 12:04d}-{index % 12 + 1:02d}' for index in months.tolist()],
+        'total': {
+            'billable_hours': _values(total_billable),
+            'non_billable_hours': _values(total_non_billable),
+            'present_hours': _values(present),
+            'productivity_percentage': _values(total_productivity),
+            'billable_hours_moving_average': _values(moving(total_billable)),
+            'productivity_moving_average': _values(moving(total_productivity)),
+            'billable_hours_change': _values(total_billable.diff()),
+            'productivity_change': _values(total_productivity.diff()),
+        },
+        'types': {
+            code: {
+                'label': labels.get(code, code),
+                'billable_hours': _values(billable[code]),
+                'non_billable_hours': _values(non_billable[code]),
+                'productivity_percentage': _values(type_productivity[code]),
+                'billable_hours_moving_average': _values(moving(billable[code])),
+                'billable_hours_change': _values(billable[code].diff()),
+            }
+            for code in type_codes
+        },
+    }
+
+
+def trend_range(params, default_end):
+    """
+    (start, end, window) from ``?start=YYYY-MM&end=YYYY-MM&window=N``: the
+    year up to ``default_end`` by default. ValueError when a value is
+    malformed, the range is reversed or longer than TREND_MAX_MONTHS.
+    """
+    end = parse_month(params['end']) if params.get('end') else default_end
+    start = parse_month(params['start']) if params.get('start') else shift_month(*end, -11)
+    window = int(params.get('window') or TREND_DEFAULT_WINDOW)
+    span = month_index(*end) - month_index(*start) + 1
+    if span < 1:
+        raise ValueError('start is after end')
+    if span > TREND_MAX_MONTHS:
+        raise ValueError(f'at most {TREND_MAX_MONTHS} months')
+    if not 1 <= window <= span:
+        raise ValueError('window must be between 1 and the number of months')
+    return start, end, window
@@ -1,22 +1,38 @@
 from django.urls import path
 from . import views
+from .periods import period_paths
 
 app_name = "projects"
 
 urlpatterns = [
     # Dashboard routes
     path("", views.dashboard_home, name="home"),
-    path("dashboard/", views.dashboard_home, name="dashboard_home"),
-    path("attendance/", views.attendance_home, name="attendance_home"),
+    *period_paths("dashboard/", views.dashboard_home, "dashboard_home"),
+    *period_paths("attendance/", views.attendance_home, "attendance_home"),
+    path(
+        "attendance/<yyyy:year>/<mm:month>/projects/<str:project_type>/",
+        views.attendance_project_rows,
+        name="attendance_project_rows",
+    ),
+    *period_paths("attendance/export.<str:file_format>", views.attendance_export, "attendance_export"),
+    path("attendance/trends/", views.attendance_trends, name="attendance_trends"),
+    path("attendance/trends/data/", views.attendance_trends_api, name="attendance_trends_api"),
+    path("attendance/<int:year>/<int:month>/productivity.png", views.productivity_chart, name="productivity_chart"),
     
     # Project CRUD routes
-    path("projects/", views.project_list, name="project_list"),
-    path("projects/create/", views.project_create, name="project_create"),
+    *period_paths("projects/", views.project_list, "project_list"),
+    *period_paths("projects/data/", views.project_list_data, "project_list_data"),
+    path("projects/bulk-update/", views.project_bulk_update, name="project_bulk_update"),
+    *period_paths("projects/create/", views.project_create, "project_create"),
     path("projects/edit/<int:pk>/", views.project_edit, name="project_edit"),
     path("projects/delete/<int:pk>/", views.project_delete, name="project_delete"),
     
-    # Tree visualization routes
-    path("project-tree/", views.project_tree_view, name="project_tree"),
-    path("project-list-api/", views.project_list_api, name="project_list_api"),
-    path("project-canvas-tree/", views.project_canvas_tree_visualization, name="project_canvas_tree_visualization"),
+    # Tree visualization routes (each also under <yyyy>/<mm>/ for a fixed period)
+    *period_paths("project-tree/", views.project_tree_view, "project_tree"),
+    *period_paths("project-tree/html/", views.project_tree_html, "project_tree_html"),
+    *period_paths("project-tree/children/", views.project_tree_children, "project_tree_children"),
+    *period_paths("project-list-api/", views.project_list_api, "project_list_api"),
+    *period_paths(
+        "project-canvas-tree/", views.project_canvas_tree_visualization, "project_canvas_tree_visualization"
+    ),
 ]
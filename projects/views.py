@@ -1,44 +1,65 @@
-from collections import defaultdict
+import json
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import require_POST
+from django.db.models import Count, Prefetch, Q
 from datetime import datetime
 from .models import Project
 from .forms import ProjectForm
+from .reports import attendance_summary, period_range_q
+from .charts import chart_version, get_productivity_pie
+from .conditional import period_conditional, request_freshness
+from .bulk_edit import BatchError, apply_batch
+from .datatables import datatables_response
+from .exports import attendance_rows, csv_chunks, file_blocks, xlsx_file
+from .periods import aresolve_period, remember_period, resolve_period, session_period, valid_period
+from .read_cache import acached_read, cached_read
+from .replica import replica_reads
+from .tree_html import get_project_tree_html
+from .trends import parse_month, trend_range, trend_report
+from .streaming import TREE_CHUNK_SIZE, aiterate, serves_async, streaming_json_response, wants_streaming
 from resources.models import Resource
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import io
-import base64
+
+# Browser cache lifetime of the chart image; page links carry a version parameter
+CHART_MAX_AGE = 60 * 60
 
 
 def team_dashboard_redirect(request):
-    return redirect('dashboard_home')
+    return redirect('projects:home')
 
 
-def dashboard_home(request):
+@replica_reads
+def dashboard_home(request, year=None, month=None):
     years = list(range(2020, 2031))
     months = [
         'January', 'February', 'March', 'April', 'May', 'June',
         'July', 'August', 'September', 'October', 'November', 'December'
     ]
-    # Get year and month from GET params, fallback to current year/month
     now = datetime.now()
-    year_param = request.GET.get('year')
-    month_param = request.GET.get('month')
-    try:
-        year = int(year_param) if year_param else now.year
-    except ValueError:
-        year = now.year
-    try:
-        month = int(month_param) if month_param else now.month
-    except ValueError:
-        month = now.month
-    
-    # Always store the selected year and month in session (either from params or current)
-    request.session['selected_year'] = year
-    request.session['selected_month'] = month
+
+    # Old ?year=&month= links: move to the period's own URL
+    if 'year' in request.GET or 'month' in request.GET:
+        try:
+            year, month = int(request.GET.get('year')), int(request.GET.get('month'))
+        except (TypeError, ValueError):
+            year, month = now.year, now.month
+        if not valid_period(year, month):
+            year, month = now.year, now.month
+        return redirect('home', year, month)
+
+    if year and month:
+        # The period in the URL becomes the default of the plain URLs; the
+        # session is only written when it changes
+        remember_period(request, year, month)
+    else:
+        # Fall back to the stored default, then to the current month
+        year, month = session_period(request)
+        if not (year and month):
+            year, month = now.year, now.month
     # Filter projects/resources by year and month (month as number)
     from resources.models import Resource
     from .models import Project
@@ -55,32 +76,108 @@ def dashboard_home(request):
         'current_month': now.month,
     })
 
-def project_list(request):
-    # Get year and month from session (set by home page)
-    selected_year = request.session.get('selected_year')
-    selected_month = request.session.get('selected_month')
+def project_list(request, year=None, month=None):
+    # Get year and month from the URL, else the session default (set by home page)
+    selected_year, selected_month = resolve_period(request, year, month)
     
-    # If no session values, redirect to home page to set them
+    # If no period is selected, redirect to home page to set one
     if not selected_year or not selected_month:
-        return redirect('dashboard_home')
-    
-    projects = Project.active_objects.all()  # Only show active projects
-    projects = projects.filter(year=selected_year, month=selected_month)
+        return redirect('projects:home')
     
+    # Rows are loaded page by page from project_list_data
     return render(request, 'projects/project_list.html', {
-        'projects': projects,
         'selected_year': selected_year,
         'selected_month': selected_month,
     })
 
 
-def project_create(request):
-    year = request.session.get('selected_year')
-    month = request.session.get('selected_month')
-    
-    # If no session values, redirect to home page to set them
+# DataTables column index -> sort field for projects/project_list.html
+PROJECT_LIST_SORT_COLUMNS = {
+    1: 'project_name',
+    2: 'project_type',
+    4: 'assign_project__resource_name',
+    5: 'poc__resource_name',
+    6: 'present_day',
+    7: 'billable_days',
+    8: 'non_billable_days',
+    9: 'billable_hours',
+    10: 'non_billable_hours',
+}
+
+
+def _search_projects(projects, term):
+    # Resource names are matched through a subquery so projects are not duplicated
+    with_resource = Project.resources.through.objects.filter(
+        resource__resource_name__icontains=term
+    ).values('project_id')
+    type_codes = [code for code, label in Project.PROJECT_TYPE_CHOICES if term.lower() in label.lower()]
+    return projects.filter(
+        Q(project_name__icontains=term)
+        | Q(project_type__in=type_codes)
+        | Q(assign_project__resource_name__icontains=term)
+        | Q(poc__resource_name__icontains=term)
+        | Q(pk__in=with_resource)
+    )
+
+
+def _project_row(project, number):
+    return {
+        'number': number,
+        'id': project.id,
+        'project_name': project.project_name,
+        'project_type': project.get_project_type_display(),
+        'resources': [resource.resource_name for resource in project.resources.all()],
+        'assign_project': project.assign_project.resource_name if project.assign_project else None,
+        'poc': project.poc.resource_name if project.poc else None,
+        'present_day': project.present_day,
+        'billable_days': project.billable_days,
+        'non_billable_days': project.non_billable_days,
+        'billable_hours': project.billable_hours,
+        'non_billable_hours': project.non_billable_hours,
+        'edit_url': reverse('projects:project_edit', args=[project.pk]),
+        'delete_url': reverse('projects:project_delete', args=[project.pk]),
+    }
+
+
+@replica_reads
+@period_conditional
+def project_list_data(request, year=None, month=None):
+    """DataTables server-side endpoint for the project list page."""
+    selected_year, selected_month = resolve_period(request, year, month)
+    if not selected_year or not selected_month:
+        return JsonResponse({'error': 'No period selected'}, status=400)
+
+    projects = Project.active_objects.filter(year=selected_year, month=selected_month).select_related(
+        'assign_project', 'poc'
+    ).prefetch_related(
+        Prefetch('resources', queryset=Resource.objects.only('id', 'resource_name').order_by('resource_name'))
+    )
+    return datatables_response(request, projects, PROJECT_LIST_SORT_COLUMNS, _search_projects, _project_row)
+
+
+@require_POST
+def project_bulk_update(request):
+    """
+    Save the edited cells of the project grid in one request:
+    ``{"rows": [{"id": 1, "billable_days": 10}, ...]}`` (see ``bulk_edit``).
+    """
+    try:
+        rows = json.loads(request.body)['rows']
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Expected a JSON body {"rows": [...]}'}, status=400)
+    try:
+        return JsonResponse(apply_batch(rows))
+    except BatchError as error:
+        return JsonResponse({'error': str(error), 'errors': error.errors}, status=400)
+
+
+def project_create(request, year=None, month=None):
+    # The period of the page the form was opened from, else the session default
+    year, month = resolve_period(request, year, month)
+
+    # If no period is selected, redirect to home page to set one
     if not year or not month:
-        return redirect('dashboard_home')
+        return redirect('projects:home')
         
     if request.method == 'POST':
         project_form = ProjectForm(request.POST)
@@ -90,7 +187,7 @@ def project_create(request):
             project.month = month
             project.save()
             project_form.save_m2m()  # Save many-to-many relationships (resources)
-            return redirect('projects:project_list')
+            return redirect('projects:project_list', year, month)
     else:
         project_form = ProjectForm(initial={'year': year, 'month': month})
 
@@ -98,7 +195,8 @@ def project_create(request):
         'form': project_form,
         'title': 'Create Project',
         'year': year,
-        'month': month
+        'month': month,
+        'list_url': reverse('projects:project_list', args=[year, month]),
     })
 
 def project_edit(request, pk):
@@ -106,190 +204,213 @@ def project_edit(request, pk):
     if request.method == 'POST':
         project_form = ProjectForm(request.POST, instance=project)
         if project_form.is_valid():
-            project_form.save()
-            return redirect('projects:project_list')
+            project = project_form.save()
+            return redirect('projects:project_list', project.year, project.month)
     else:
         project_form = ProjectForm(instance=project)
 
     return render(request, 'projects/project_form.html', {
         'form': project_form,
-        'title': 'Edit Project'
+        'title': 'Edit Project',
+        'list_url': reverse('projects:project_list', args=[project.year, project.month]),
     })
 
 def project_delete(request, pk):
     project = get_object_or_404(Project, pk=pk)
     if request.method == 'POST':
         project.soft_delete()  # Use soft delete instead of actual deletion
-        return redirect('projects:project_list')
-    return render(request, 'projects/project_confirm_delete.html', {'project':project})
+        return redirect('projects:project_list', project.year, project.month)
+    return render(request, 'projects/project_confirm_delete.html', {
+        'project': project,
+        'list_url': reverse('projects:project_list', args=[project.year, project.month]),
+    })
 
 
 def project_tree_visualization(request):
     """Render the project tree visualization page."""
     return render(request, 'projects/project_tree.html')
 
-def project_canvas_tree_visualization(request):
+def project_canvas_tree_visualization(request, year=None, month=None):
     """Render the interactive Canvas-based project tree visualization page."""
     return render(request, 'projects/project_canvas_tree.html')
 
 
-def project_tree_html(request):
-    """Generate an HTML-based tree visualization that doesn't require external dependencies."""
-    try:
-        # Get year and month from session
-        selected_year = request.session.get('selected_year')
-        selected_month = request.session.get('selected_month')
-        
-        projects = Project.objects.prefetch_related('resources', 'assign_project', 'poc')
-        
-        if selected_year and selected_month:
-            projects = projects.filter(year=selected_year, month=selected_month)
-        
-        projects = projects.all()
-        
-        # Create HTML tree structure
-        html_tree = ['<div class="tree-container">']
-        html_tree.append('<h3>Project Tree Structure</h3>')
-        html_tree.append('<ul class="tree">')
-        html_tree.append('<li><strong>Projects</strong>')
-        html_tree.append('<ul>')
-        
-        for project in projects:
-            html_tree.append(f'<li><strong>{project.project_name}</strong> ({project.get_project_type_display()})')
-            html_tree.append('<ul>')
-            
-            # Add assigned resource
-            if project.assign_project:
-                html_tree.append(f'<li>📋 Assigned Resource: {project.assign_project.resource_name}</li>')
-            
-            # Add resources
-            resources = project.resources.all()
-            if resources:
-                html_tree.append(f'<li>👥 Resources ({len(resources)})')
-                html_tree.append('<ul>')
-                for res in resources:
-                    html_tree.append(f'<li>👤 {res.resource_name}</li>')
-                html_tree.append('</ul>')
-                html_tree.append('</li>')
-            
-            # Add POC
-            if project.poc:
-                html_tree.append(f'<li>🎯 POC: {project.poc.resource_name}</li>')
-            
-            html_tree.append('</ul>')
-            html_tree.append('</li>')
-        
-        html_tree.append('</ul>')
-        html_tree.append('</li>')
-        html_tree.append('</ul>')
-        html_tree.append('</div>')
-        
-        # Add CSS styling
-        css = """
-        <style>
-        .tree-container { font-family: Arial, sans-serif; padding: 20px; }
-        .tree, .tree ul { list-style-type: none; margin: 0; padding: 0; }
-        .tree li { margin: 5px 0; padding-left: 20px; position: relative; }
-        .tree li:before { content: '├── '; position: absolute; left: 0; }
-        .tree li:last-child:before { content: '└── '; }
-        .tree ul { margin-left: 20px; border-left: 1px solid #ccc; }
-        .tree strong { color: #2c3e50; }
-        .tree li li { color: #7f8c8d; }
-        </style>
-        """
-        
-        full_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Project Tree</title>
-            {css}
-        </head>
-        <body>
-            {''.join(html_tree)}
-        </body>
-        </html>
-        """
-        
-        response = HttpResponse(full_html, content_type='text/html')
-        return response
-        
-    except Exception as e:
-        error_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head><title>Error</title></head>
-        <body>
-            <h3>Error generating project tree</h3>
-            <p>{str(e)}</p>
-        </body>
-        </html>
-        """
-        return HttpResponse(error_html, content_type='text/html')
-
-def project_tree_view(request):
-    """API endpoint that returns project tree data as JSON with a proper root node."""
-    # Get year and month from session
-    selected_year = request.session.get('selected_year')
-    selected_month = request.session.get('selected_month')
+@replica_reads
+@period_conditional
+def project_tree_html(request, year=None, month=None):
+    """HTML tree visualization that doesn't require external dependencies (cached per period)."""
+    # Get year and month from the URL, else the session default
+    selected_year, selected_month = resolve_period(request, year, month)
+
+    return render(request, 'projects/project_tree_static.html', {
+        'tree_html': mark_safe(get_project_tree_html(
+            selected_year, selected_month, request_freshness(request, selected_year, selected_month),
+        )),
+    })
+
+
+def _project_role_nodes(project, resources_node):
+    """Assigned / resources / POC children of a project node, leaving out the empty ones."""
+    assign_project_name = project.assign_project.resource_name if project.assign_project else None
+    poc_value = project.poc.resource_name if project.poc else None
+    children = [
+        {
+            "text": f"📋 Assigned Resource: {assign_project_name}",
+            "icon": "fas fa-user-tie"
+        } if assign_project_name else None,
+        resources_node,
+        {
+            "text": f"🎯 POC: {poc_value}",
+            "icon": "fas fa-id-card"
+        } if poc_value else None
+    ]
+    # Remove any None values from the children array
+    return [child for child in children if child is not None]
+
+
+def _project_tree_node(project):
+    """Tree node of one project (resources must be prefetched, already filtered to active ones)."""
+    active_resources = [{"text": res.resource_name, "icon": "fas fa-user"} 
+                       for res in project.resources.all()]
+    resources_node = {
+        "text": f"👥 Resources ({len(active_resources)})",
+        "icon": "fas fa-users",
+        "children": active_resources,
+        "opened": True
+    } if active_resources else None
+
+    return {
+        "text": f"{project.project_name} ({project.get_project_type_display()})",
+        "icon": "fas fa-project-diagram",
+        "children": _project_role_nodes(project, resources_node),
+    }
+
+
+@replica_reads
+@period_conditional
+async def project_tree_view(request, year=None, month=None):
+    """
+    API endpoint that returns project tree data as JSON with a proper root node.
+
+    Without a selected period (every month of history) or with ``?stream=1``
+    the nodes are streamed from a chunked iterator instead of built in memory.
+    Async: the queries run through the async ORM, so under ASGI a worker
+    keeps serving other requests while they are waiting.
+    """
+    # Get year and month from the URL, else the session default
+    selected_year, selected_month = await aresolve_period(request, year, month)
     
-    # Filter out soft-deleted projects (only active projects) and by session year/month
-    projects = Project.objects.filter(is_active=True).prefetch_related('resources', 'assign_project', 'poc')
+    # Filter out soft-deleted projects (only active projects) and by the selected year/month.
+    # assign_project/poc are joined and the active resources are prefetched, so the
+    # tree costs two queries however many projects there are.
+    projects = Project.active_objects.select_related('assign_project', 'poc').only(
+        'project_name', 'project_type', 'assign_project__resource_name', 'poc__resource_name'
+    ).prefetch_related(
+        Prefetch('resources', queryset=Resource.active_objects.only('id', 'resource_name'))
+    )
     
     if selected_year and selected_month:
         projects = projects.filter(year=selected_year, month=selected_month)
     
-    projects = projects.all()
-    
-    # Create project nodes
-    project_nodes = []
-    for project in projects:
-        assign_project_name = project.assign_project.resource_name if project.assign_project else None
-        # Filter out soft-deleted resources
-        active_resources = [{"text": res.resource_name, "icon": "fas fa-user"} 
-                           for res in project.resources.filter(is_active=True)]
-        poc_value = project.poc.resource_name if project.poc else None
-       
-        project_node = {
-            "text": f"{project.project_name} ({project.get_project_type_display()})",
-            "icon": "fas fa-project-diagram",
-            "children": [
-                {
-                    "text": f"📋 Assigned Resource: {assign_project_name}",
-                    "icon": "fas fa-user-tie"
-                } if assign_project_name else None,
-                {
-                    "text": f"👥 Resources ({len(active_resources)})",
-                    "icon": "fas fa-users",
-                    "children": active_resources,
-                    "opened": True
-                } if active_resources else None,
-                {
-                    "text": f"🎯 POC: {poc_value}",
-                    "icon": "fas fa-id-card"
-                } if poc_value else None
-            ]
-        }
-        # Remove any None values from the children array
-        project_node["children"] = [child for child in project_node["children"] if child is not None]
-        project_nodes.append(project_node)
-    
-    # Create root node containing all projects
-    root_tree = [{
+    root = {
         "text": "All Projects",
         "icon": "fas fa-sitemap",
         "opened": True,
-        "children": project_nodes
-    }]
+    }
+
+    if wants_streaming(request, selected_year, selected_month):
+        # Resources are prefetched per chunk of TREE_CHUNK_SIZE projects
+        if serves_async(request):
+            nodes = (_project_tree_node(project) async for project in projects.aiterator(chunk_size=TREE_CHUNK_SIZE))
+        else:
+            nodes = (_project_tree_node(project) for project in projects.iterator(chunk_size=TREE_CHUNK_SIZE))
+        return streaming_json_response(nodes, root=root)
+
+    # Create root node containing all projects
+    async def build_tree():
+        return [{**root, "children": [_project_tree_node(project) async for project in projects]}]
+
+    root_tree = await acached_read('project_tree', selected_year, selected_month, build_tree)
     
     return JsonResponse(root_tree, safe=False)
 
 
-def project_list_api(request):
-    """API endpoint that returns a list of projects for selection."""
-    # Get year and month from session
-    selected_year = request.session.get('selected_year')
-    selected_month = request.session.get('selected_month')
+def _active_resource_count():
+    return Count('resources', filter=Q(resources__is_active=True))
+
+
+@replica_reads
+@period_conditional
+def project_tree_children(request, year=None, month=None):
+    """
+    Direct children of one node of the project tree, for canvases that expand
+    nodes on demand.
+
+    Without ``node`` the root is returned with its project nodes (collapsed);
+    ``node=project:<id>`` gives a project's assigned / resources / POC nodes
+    and ``node=project:<id>:resources`` its active resources. Expandable
+    nodes carry an ``id`` to request and ``has_children``.
+    """
+    node = request.GET.get('node')
+    if not node:
+        selected_year, selected_month = resolve_period(request, year, month)
+        projects = Project.active_objects.only(
+            'project_name', 'project_type', 'assign_project_id', 'poc_id'
+        ).annotate(active_resource_count=_active_resource_count())
+        if selected_year and selected_month:
+            projects = projects.filter(year=selected_year, month=selected_month)
+
+        return JsonResponse([{
+            "text": "All Projects",
+            "icon": "fas fa-sitemap",
+            "opened": True,
+            "children": [
+                {
+                    "id": f"project:{project.pk}",
+                    "text": f"{project.project_name} ({project.get_project_type_display()})",
+                    "icon": "fas fa-project-diagram",
+                    "opened": False,
+                    "has_children": bool(
+                        project.assign_project_id or project.poc_id or project.active_resource_count
+                    ),
+                }
+                for project in projects
+            ],
+        }], safe=False)
+
+    kind, _, rest = node.partition(':')
+    project_id, _, group = rest.partition(':')
+    if kind != 'project' or not project_id.isdigit() or group not in ('', 'resources'):
+        return JsonResponse({'error': 'Invalid node'}, status=400)
+
+    if group == 'resources':
+        resources = Resource.active_objects.filter(
+            assigned_projects=project_id, assigned_projects__is_active=True
+        ).only('resource_name')
+        return JsonResponse([{"text": res.resource_name, "icon": "fas fa-user"} for res in resources], safe=False)
+
+    project = Project.active_objects.select_related('assign_project', 'poc').only(
+        'assign_project__resource_name', 'poc__resource_name'
+    ).annotate(active_resource_count=_active_resource_count()).filter(pk=project_id).first()
+    if project is None:
+        return JsonResponse({'error': 'Unknown node'}, status=404)
+
+    resources_node = {
+        "id": f"project:{project.pk}:resources",
+        "text": f"👥 Resources ({project.active_resource_count})",
+        "icon": "fas fa-users",
+        "opened": False,
+        "has_children": True,
+    } if project.active_resource_count else None
+    return JsonResponse(_project_role_nodes(project, resources_node), safe=False)
+
+
+@replica_reads
+@period_conditional
+async def project_list_api(request, year=None, month=None):
+    """API endpoint that returns a list of projects for selection (async ORM)."""
+    # Get year and month from the URL, else the session default
+    selected_year, selected_month = await aresolve_period(request, year, month)
     
     projects = Project.objects.all()
     
@@ -297,14 +418,18 @@ def project_list_api(request):
         projects = projects.filter(year=selected_year, month=selected_month)
     
     projects = projects.values('id', 'project_name', 'project_type')
-    project_list = [
-        {
-            'id': p['id'],
-            'name': p['project_name'],
-            'type': dict(Project.PROJECT_TYPE_CHOICES)[p['project_type']] if p['project_type'] else 'Unknown'
-        }
-        for p in projects
-    ]
+
+    async def read_projects():
+        return [
+            {
+                'id': p['id'],
+                'name': p['project_name'],
+                'type': dict(Project.PROJECT_TYPE_CHOICES)[p['project_type']] if p['project_type'] else 'Unknown'
+            }
+            async for p in projects
+        ]
+
+    project_list = await acached_read('project_list_api', selected_year, selected_month, read_projects)
     return JsonResponse(project_list, safe=False)
 
 def project_tree_graphviz(request):
@@ -313,118 +438,188 @@ def project_tree_graphviz(request):
     return redirect('projects:project_tree_visualization')
 
 
-def attendance_home(request):
-    # Get year and month from session (set by home page)
-    year = request.session.get('selected_year')
-    month = request.session.get('selected_month')
+@replica_reads
+@period_conditional
+def attendance_home(request, year=None, month=None):
+    # Get year and month from the URL, else the session default (set by home page)
+    year, month = resolve_period(request, year, month)
     
-    # If no session values, redirect to home page to set them
+    # If no period is selected, redirect to home page to set one
     if not year or not month:
-        return redirect('dashboard_home')
+        return redirect('projects:home')
     
-    # Filter by year and month from session
-    resources = Resource.active_objects.filter(year=year, month=month)  # Only active resources
-    projects = Project.active_objects.prefetch_related('resources').filter(year=year, month=month)  # Only active projects
-
-    # Totals for resource
-    total_working_days = sum(r.working_days for r in resources if r.working_days)
-    total_present_days = sum(r.present_day for r in resources if r.present_day)
-    total_present_hours = sum(r.present_hours for r in resources if r.present_hours)
-    presence_percentage = (100 * total_present_days) / total_working_days if total_working_days > 0 else 0
-
-    # Group projects by project type and calculate type totals
-    grouped_projects = defaultdict(list)
-    type_totals = defaultdict(lambda: {
-        'present_day': 0,
-        'billable_days': 0,
-        'non_billable_days': 0,
-        'billable_hours': 0,
-        'non_billable_hours': 0,
-    })
+    # Filter by the selected year and month. Totals and percentages are
+    # aggregated in the database; both are kept in the per-period read cache.
+    def read_period():
+        return {
+            'resources': list(Resource.active_objects.filter(year=year, month=month).values(
+                'resource_name', 'working_days', 'present_day', 'present_hours'
+            )),  # Only active resources
+            'summary': attendance_summary(year, month),
+        }
 
-    for p in projects:
-        display_type = p.get_project_type_display()
-        grouped_projects[display_type].append(p)
-        type_totals[display_type]['present_day'] += p.present_day or 0
-        type_totals[display_type]['billable_days'] += p.billable_days or 0
-        type_totals[display_type]['non_billable_days'] += p.non_billable_days or 0
-        type_totals[display_type]['billable_hours'] += p.billable_hours or 0
-        type_totals[display_type]['non_billable_hours'] += p.non_billable_hours or 0
-
-    # Grand totals for all projects
-    total_project_present_day = sum(p.present_day or 0 for p in projects)
-    total_project_billable_days = sum(p.billable_days or 0 for p in projects)
-    total_project_non_billable_days = sum(p.non_billable_days or 0 for p in projects)
-    total_project_billable_hours = sum(p.billable_hours or 0 for p in projects)
-    total_project_non_billable_hours = sum(p.non_billable_hours or 0 for p in projects)
-
-    # Calculate team productivity hours (sum of all billable hours across all project types)
-    team_productivity_hours = sum(p.billable_hours or 0 for p in projects)
-
-    # Calculate team productivity percentage (100 × Team Productivity Hours / Expected Billable Hours)
-    # expected_hours = total_project_billable_days * 8
-    expected_hours = total_present_hours
-    if expected_hours > 0:
-        team_productivity_percentage = (100 * team_productivity_hours) / expected_hours
-    else:
-        team_productivity_percentage = 0
+    data = cached_read('attendance_home', year, month, read_period)
+    resources = data['resources']
+    summary = data['summary']
+    team_productivity_hours = summary['team_productivity_hours']
+    expected_hours = summary['total_present_hours']
+    team_productivity_percentage = summary['team_productivity_percentage']
 
-    # Clamp to [0, 100] to avoid negative or >100 values
-    team_productivity_percentage = max(0, min(100, team_productivity_percentage))
-    not_productive_percentage = 100 - team_productivity_percentage
+    # Per-type project tables: only the headings and totals are rendered here,
+    # the rows are fetched from attendance_project_rows when the tab is opened
+    project_types = [
+        {
+            'label': label,
+            'rows_url': reverse('projects:attendance_project_rows', args=[year, month, code]),
+        }
+        for code, label in Project.PROJECT_TYPE_CHOICES
+        if label in summary['type_totals']
+    ]
 
-    # --- PIE CHART GENERATION FOR OVERALL PRODUCTIVITY ---
-    pie_chart_base64 = None
-    try:
-        # Only generate chart if we have meaningful data
-        if team_productivity_hours > 0 or expected_hours > 0:
-            labels = ['Productive', 'Not Productive']
-            sizes = [team_productivity_percentage, not_productive_percentage]
-            colors = ['#4CAF50', '#FF5252']
-            
-            # Create figure with specific size and DPI for better quality
-            fig, ax = plt.subplots(figsize=(8, 6), dpi=100)
-            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            ax.axis('equal')
-            plt.title('Team Productivity Percentage', fontsize=14, fontweight='bold')
-            
-            # Save to buffer
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight', facecolor='white', edgecolor='none')
-            plt.close(fig)
-            buf.seek(0)
-            pie_chart_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            buf.close()
-            
-    except ImportError as e:
-        # Matplotlib not available
-        print(f"Matplotlib not available: {e}")
-        pie_chart_base64 = None
-    except Exception as e:
-        # Other matplotlib errors
-        print(f"Error generating pie chart: {e}")
-        pie_chart_base64 = None
+    # The pie chart is served (and cached) by productivity_chart; the page only links to it
+    productivity_chart_url = None
+    if team_productivity_hours > 0 or expected_hours > 0:
+        productivity_chart_url = '{}?v={}'.format(
+            reverse('projects:productivity_chart', args=[year, month]),
+            chart_version(year, month, team_productivity_percentage),
+        )
 
     context = {
         'resources': resources,
-        'projects': projects,
-        'grouped_projects': dict(grouped_projects),
-        'type_totals': dict(type_totals),
-        'total_working_days': total_working_days,
-        'total_present_days': total_present_days,
-        'total_present_hours': total_present_hours,
-        'total_project_present_day': total_project_present_day,
-        'total_project_billable_days': total_project_billable_days,
-        'total_project_non_billable_days': total_project_non_billable_days,
-        'total_project_billable_hours': total_project_billable_hours,
-        'total_project_non_billable_hours': total_project_non_billable_hours,
-        'presence_percentage': presence_percentage,
-        'team_productivity_percentage': team_productivity_percentage,
-        'not_productive_percentage': not_productive_percentage,
-        'team_productivity_hours': team_productivity_hours,
-        'pie_chart_base64': pie_chart_base64,
+        'project_types': project_types,
+        'productivity_chart_url': productivity_chart_url,
         'year': year,
         'month': month,
+        **summary,
     }
 
     return render(request, 'attendance/attendance_home.html', context)
+
+
+def _trend_request(request):
+    """(start, end, window) of a trend request; the range ends at the default period unless given."""
+    default_end = session_period(request)
+    if not all(default_end):
+        now = datetime.now()
+        default_end = (now.year, now.month)
+    return trend_range(request.GET, default_end)
+
+
+def _cached_trend(start, end, window):
+    # Spans several periods, so it is cached under the all-history version
+    return cached_read(
+        'attendance_trends', None, None, lambda: trend_report(start, end, window),
+        start=start, end=end, window=window,
+    )
+
+
+@replica_reads
+def attendance_trends(request):
+    """Month-by-month hours and productivity over a range of months (``?start=&end=&window=``)."""
+    try:
+        start, end, window = _trend_request(request)
+    except (KeyError, ValueError) as error:
+        return HttpResponse(f'Invalid trend range: {error}', status=400)
+    report = _cached_trend(start, end, window)
+    total = report['total']
+    rows = [
+        {field: values[index] for field, values in total.items()} | {'month': month}
+        for index, month in enumerate(report['months'])
+    ]
+    return render(request, 'attendance/trends.html', {
+        'report': report,
+        'rows': rows,
+        'types': report['types'].values(),
+    })
+
+
+@replica_reads
+def attendance_trends_api(request):
+    """JSON of ``trends.trend_report`` for ``?start=YYYY-MM&end=YYYY-MM&window=N``."""
+    try:
+        start, end, window = _trend_request(request)
+    except (KeyError, ValueError) as error:
+        return JsonResponse({'error': f'Invalid trend range: {error}'}, status=400)
+    return JsonResponse(_cached_trend(start, end, window))
+
+
+@replica_reads
+@period_conditional
+def attendance_project_rows(request, year, month, project_type):
+    """Table rows of one project type on the attendance page (projects + their resources, two queries)."""
+    if project_type not in dict(Project.PROJECT_TYPE_CHOICES):
+        raise Http404("Unknown project type")
+
+    projects = Project.active_objects.filter(
+        year=year, month=month, project_type=project_type
+    ).select_related('assign_project', 'poc').prefetch_related('resources')
+
+    return render(request, 'attendance/project_type_rows.html', {'projects': projects})
+
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def _export_scope(request, year, month):
+    """(period filter, file name part) of an export: the URL's month, ?start=&end=, ?all=1 or the session period."""
+    if year and month:
+        start = end = (year, month)
+    elif request.GET.get('start'):
+        start = parse_month(request.GET['start'])
+        end = parse_month(request.GET['end']) if request.GET.get('end') else start
+        if end < start:
+            raise ValueError('start is after end')
+    elif request.GET.get('all'):
+        return Q(), 'all'
+    else:
+        start = end = session_period(request)
+        if not all(start):
+            raise ValueError('no period selected')
+    name = f'{start[0]:04d}-{start[1]:02d}'
+    if end != start:
+        name += f'_{end[0]:04d}-{end[1]:02d}'
+    return period_range_q(start, end), name
+
+
+@replica_reads
+def attendance_export(request, file_format, year=None, month=None):
+    """
+    The attendance report as a CSV or XLSX download, for one month, a range
+    of months or all history, streamed in constant memory (see ``exports``).
+    """
+    if file_format not in EXPORT_CONTENT_TYPES:
+        raise Http404("Unknown export format")
+    try:
+        period_q, name = _export_scope(request, year, month)
+    except ValueError as error:
+        return HttpResponse(f'Invalid export period: {error}', status=400)
+
+    rows = attendance_rows(period_q)
+    chunks = csv_chunks(rows) if file_format == 'csv' else file_blocks(xlsx_file(rows))
+    response = StreamingHttpResponse(
+        aiterate(chunks) if serves_async(request) else chunks,
+        content_type=EXPORT_CONTENT_TYPES[file_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="attendance-{name}.{file_format}"'
+    return response
+
+
+def productivity_chart(request, year, month):
+    """Serve the period's productivity pie chart as a cached PNG with an ETag."""
+    summary = attendance_summary(year, month)
+    if not (summary['team_productivity_hours'] > 0 or summary['total_present_hours'] > 0):
+        raise Http404("No productivity data for this period")
+
+    percentage = summary['team_productivity_percentage']
+    etag = f'"{chart_version(year, month, percentage)}"'
+
+    # Answer revalidations without touching the chart cache
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(get_productivity_pie(year, month, percentage), content_type='image/png')
+        response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=CHART_MAX_AGE)
+    return response
@@ -1,33 +1,191 @@
-from django.core.management.base import BaseCommand
+import calendar
+import re
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from openpyxl import load_workbook
+import numpy as np
 import pandas as pd
+from projects.signals import period_changed
 from resources.models import Resource
+from resources.working_days import working_days_for_periods
+
+# Accepted (normalised) header spellings for each model field
+COLUMN_ALIASES = {
+    'resource_name': {'resource_name', 'resource', 'name', 'resource name', 'employee', 'employee name', 'unnamed: 0'},
+    'working_days': {'working_days', 'working days', 'total no. of working days', 'total working days'},
+    'present_day': {'present_day', 'present days', 'present day', 'days present'},
+    'year': {'year'},
+    'month': {'month'},
+}
+
+MONTH_NAMES = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTH_NAMES.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+PERIOD_PATTERNS = [
+    re.compile(r'(?P<month>[A-Za-z]{3,9})[\s_\-]*(?P<year>\d{4})'),
+    re.compile(r'(?P<year>\d{4})[\s_\-](?P<month>\d{1,2})(?!\d)'),
+]
+
+
+def detect_period(*texts):
+    """Find a (year, month) in sheet titles/file names such as 'May 2025' or '2025-05'."""
+    for text in texts:
+        for pattern in PERIOD_PATTERNS:
+            for match in pattern.finditer(text or ''):
+                month = match.group('month')
+                month = MONTH_NAMES.get(month.lower()) if not month.isdigit() else int(month)
+                if month and 1 <= month <= 12:
+                    return int(match.group('year')), month
+    return None
+
 
 class Command(BaseCommand):
-    help = 'Import resource data from Excel for May 2025 (auto-calculate present_hours)'
+    help = 'Import resource data (working days, present days) from an Excel export'
 
     def add_arguments(self, parser):
         parser.add_argument('excel_path', type=str, help='Path to the Excel file')
+        parser.add_argument('--year', type=int, help='Report year (default: detected from the sheet)')
+        parser.add_argument('--month', type=int, choices=range(1, 13), help='Report month (default: detected)')
+        parser.add_argument('--sheet', help='Worksheet name (default: the active sheet)')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows read and written per batch (default: 1000)'
+        )
 
     def handle(self, *args, **options):
         excel_path = options['excel_path']
-        df = pd.read_excel(excel_path)
-        
-        # Clean the data
-        df = df.dropna(how='all')
-        
-        for idx, row in df.iterrows():
-            present_day = row.get('Present Days', 0)
-            resource, created = Resource.objects.update_or_create(
-                resource_name=row['Unnamed: 0'],
-                year=2025,
-                month=5,
-                defaults={
-                    'working_days': row.get('Total No. Of working Days', 0),
-                    'present_day': present_day,
-                    # present_hours will be auto-calculated by model save()
-                }
-            )
-            self.stdout.write(self.style.SUCCESS(
-                f"{'Created' if created else 'Updated'} resource: {resource.resource_name} (May 2025)"
-            ))
-        self.stdout.write(self.style.SUCCESS('Resource import complete!'))
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        # Read-only mode streams rows instead of loading the whole workbook
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[options['sheet']] if options['sheet'] else workbook.active
+            rows = sheet.iter_rows(values_only=True)
+            columns = self.map_columns(next(rows, ()))
+            period = self.resolve_period(options, columns, sheet.title, Path(excel_path).stem)
+
+            created = updated = total = 0
+            periods = set()
+            with transaction.atomic():
+                while True:
+                    chunk = list(islice(rows, batch_size))
+                    if not chunk:
+                        break
+                    df = self.normalise(chunk, columns, period)
+                    batch_created, batch_updated = self.upsert(df, batch_size)
+                    created += batch_created
+                    updated += batch_updated
+                    total += len(df)
+                    periods.update(df[['year', 'month']].itertuples(index=False, name=None))
+        finally:
+            workbook.close()
+
+        # Bulk writes send no model signals, so refresh the periods' rollups and charts here
+        for year, month in periods:
+            period_changed(year, month)
+
+        elapsed = time.perf_counter() - started
+        period_label = f'{calendar.month_name[period[1]]} {period[0]}' if period else 'per-row periods'
+        self.stdout.write(self.style.SUCCESS(
+            f'Resource import complete! {total} rows ({period_label}) in {elapsed:.2f}s: '
+            f'{created} created, {updated} updated.'
+        ))
+
+    def map_columns(self, header):
+        """Map model fields to column positions using the header row."""
+        columns = {}
+        for position, title in enumerate(header):
+            title = 'unnamed: 0' if title is None and position == 0 else str(title or '').strip().lower()
+            for field, aliases in COLUMN_ALIASES.items():
+                if title in aliases and field not in columns:
+                    columns[field] = position
+        if 'resource_name' not in columns:
+            raise CommandError('Could not find a resource name column in the header row.')
+        return columns
+
+    def resolve_period(self, options, columns, *texts):
+        """Period from --year/--month, else None when the sheet has year/month columns, else detected."""
+        if options['year'] and options['month']:
+            return options['year'], options['month']
+        if options['year'] or options['month']:
+            raise CommandError('Pass both --year and --month, or neither.')
+        if 'year' in columns and 'month' in columns:
+            return None
+        period = detect_period(*texts)
+        if period is None:
+            raise CommandError('Could not detect the period from the sheet; pass --year and --month.')
+        return period
+
+    def normalise(self, chunk, columns, period):
+        """Build a typed DataFrame for one chunk and compute the derived columns vectorised."""
+        df = pd.DataFrame(
+            {field: [row[position] if position < len(row) else None for row in chunk]
+             for field, position in columns.items()}
+        )
+        df['resource_name'] = df['resource_name'].astype('string').str.strip()
+        df = df[df['resource_name'].notna() & (df['resource_name'] != '')].copy()
+        df['resource_name'] = df['resource_name'].astype(object)
+
+        if period:
+            df['year'], df['month'] = period
+        else:
+            df['year'] = pd.to_numeric(df['year'], errors='coerce')
+            df['month'] = pd.to_numeric(df['month'], errors='coerce')
+            df = df.dropna(subset=['year', 'month'])
+        df['year'] = df['year'].astype(int)
+        df['month'] = df['month'].astype(int)
+
+        for field in ('working_days', 'present_day'):
+            if field not in df.columns:
+                df[field] = 0.0
+            df[field] = pd.to_numeric(df[field], errors='coerce').fillna(0).astype(float)
+
+        # Replaces Resource.save(): blank/zero working days fall back to the calendar,
+        # present hours are always present days × 8
+        calendar_days = working_days_for_periods(df[['year', 'month']].itertuples(index=False))
+        default_days = [calendar_days[key] for key in zip(df['year'], df['month'])]
+        df['working_days'] = np.where(df['working_days'] > 0, df['working_days'], default_days)
+        df['present_hours'] = df['present_day'] * 8
+
+        # Like update_or_create row by row, the last row for a resource wins
+        return df.drop_duplicates(subset=['resource_name', 'year', 'month'], keep='last')
+
+    def upsert(self, df, batch_size):
+        """Insert new resources and update existing ones for one chunk."""
+        if df.empty:
+            return 0, 0
+        fields = ['working_days', 'present_day', 'present_hours']
+        existing = Resource.objects.filter(
+            Q(resource_name__in=df['resource_name'].unique().tolist()),
+            Q(year__in=df['year'].unique().tolist()),
+            Q(month__in=df['month'].unique().tolist()),
+        ).order_by('is_active', 'pk').only('resource_name', 'year', 'month', *fields)
+        # Later (active) rows overwrite earlier ones, so active resources are preferred
+        index = {(r.resource_name, r.year, r.month): r for r in existing}
+
+        # bulk_update skips auto_now, so updated_at is stamped explicitly
+        now = timezone.now()
+        new_resources = []
+        changed = []
+        for row in df[['resource_name', 'year', 'month'] + fields].itertuples(index=False):
+            resource = index.get((row.resource_name, row.year, row.month))
+            if resource is None:
+                new_resources.append(Resource(
+                    resource_name=row.resource_name, year=row.year, month=row.month,
+                    **{field: getattr(row, field) for field in fields}
+                ))
+            else:
+                for field in fields:
+                    setattr(resource, field, getattr(row, field))
+                resource.updated_at = now
+                changed.append(resource)
+
+        Resource.objects.bulk_create(new_resources, batch_size=batch_size)
+        Resource.objects.bulk_update(changed, fields + ['updated_at'], batch_size=batch_size)
+        return len(new_resources), len(changed)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0004_alter_resource_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resource",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-year", "-month", "resource_name"],
+                name="resources_active_period_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resource",
+            index=models.Index(fields=["year", "month"], name="resources_period_idx"),
+        ),
+    ]
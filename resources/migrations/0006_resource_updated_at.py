@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resources", "0005_period_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resource",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
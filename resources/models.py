@@ -1,6 +1,7 @@
 from django.db import models
 import calendar
 from datetime import date
+from .working_days import working_days
 
 # Create your models here.
 
@@ -46,6 +47,7 @@ class Resource(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     counting = models.FloatField(default=0, help_text="Counting value")
     is_active = models.BooleanField(default=True, help_text="For soft deletion")
 
@@ -56,6 +58,17 @@ class Resource(models.Model):
     class Meta:
         db_table = 'resources'
         ordering = ['-year', '-month', 'resource_name']
+        indexes = [
+            # Views filter on is_active=True + year/month and sort by Meta.ordering;
+            # partial on backends that support it (SQLite, PostgreSQL)
+            models.Index(
+                fields=['-year', '-month', 'resource_name'],
+                condition=models.Q(is_active=True),
+                name='resources_active_period_idx',
+            ),
+            # Period lookups that include inactive rows (APIs, imports)
+            models.Index(fields=['year', 'month'], name='resources_period_idx'),
+        ]
         verbose_name = 'Resource'
         verbose_name_plural = 'Resources'
 
@@ -78,27 +91,12 @@ class Resource(models.Model):
     @staticmethod
     def get_working_days(year, month):
         """
-        Calculates working days (Mon–Fri + 1st Saturday) for a given year and month.
+        Calculates working days (Mon–Fri + 1st Saturday, minus configured
+        holidays and half days) for a given year and month.
         """
         if year is None or month is None:
             return 0
-            
-        _, num_days = calendar.monthrange(year, month)
-        first_day = calendar.monthrange(year, month)[0]
-        first_saturday = (5 - first_day) % 7 + 1
-        if first_saturday > num_days:
-            first_saturday = None
-
-        working_days = 0
-        for day in range(1, num_days + 1):
-            weekday = (first_day + day - 1) % 7
-            if weekday < 5:
-                working_days += 1
-
-        if first_saturday:
-            working_days += 1
-
-        return working_days
+        return working_days(year, month)
 
     def get_working_days_for_display(self):
         if self.year is None or self.month is None:
@@ -1,3 +1,395 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
+from django.urls import reverse
+from openpyxl import Workbook
+
+from projects.models import Project
+from .management.commands.import_resource_excel import detect_period
+from . import working_days
+from .models import Resource
+
+
+class ResourceTreeViewTests(TestCase):
+    """Tests for the resource tree JSON endpoint."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.url = reverse('resources:resource_tree')
+
+    def create_team(self, size):
+        resources = [
+            Resource.objects.create(resource_name=f"Resource {i}", year=2025, month=5, present_day=20)
+            for i in range(size)
+        ]
+        for i, resource in enumerate(resources):
+            project = Project.objects.create(
+                project_name=f"Project {i}", year=2025, month=5,
+                poc=resource, assign_project=resources[(i + 1) % size],
+            )
+            project.resources.add(*resources)
+        return resources
+
+    def test_groups_projects_by_role(self):
+        alice = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        bob = Resource.objects.create(resource_name="Bob", year=2025, month=5)
+        apollo = Project.objects.create(project_name="Apollo", year=2025, month=5, poc=alice, assign_project=bob)
+        apollo.resources.add(alice, bob)
+        gemini = Project.objects.create(project_name="Gemini", year=2025, month=5)
+        gemini.resources.add(alice)
+        # Projects outside the period or soft-deleted must not show up
+        Project.objects.create(project_name="Old", year=2025, month=4, poc=alice)
+        Project.objects.create(project_name="Gone", year=2025, month=5, poc=alice, is_active=False)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        tree = {node['text']: node for node in response.json()}
+
+        self.assertEqual(tree['Alice']['resource_data']['poc_count'], 1)
+        self.assertEqual(tree['Alice']['resource_data']['responsible_count'], 0)
+        self.assertEqual(tree['Alice']['resource_data']['assigned_count'], 1)
+        self.assertEqual(tree['Bob']['resource_data']['responsible_count'], 1)
+        self.assertEqual(tree['Bob']['resource_data']['assigned_count'], 0)
+
+        alice_groups = {group['type']: group for group in tree['Alice']['children']}
+        self.assertEqual([p['text'] for p in alice_groups['pocProjects']['children']], ['Apollo'])
+        self.assertEqual([p['text'] for p in alice_groups['assignedProjects']['children']], ['Gemini'])
+
+    def test_selected_resource_only(self):
+        alice, bob = self.create_team(2)
+        response = self.client.get(self.url, {'resource_id': bob.id})
+        self.assertEqual([node['text'] for node in response.json()], [bob.resource_name])
+
+    def test_query_count_is_constant(self):
+        self.create_team(3)
+        # Session load + freshness + resources + projects + through-table rows
+        with self.assertNumQueries(5):
+            small = self.client.get(self.url).json()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_team(25)
+        with self.assertNumQueries(5):
+            large = self.client.get(self.url).json()
+        self.assertGreater(len(large), len(small))
+
+
+    def test_streaming_matches_buffered_tree(self):
+        self.create_team(4)
+        extra = Resource.objects.create(resource_name="Zed", year=2025, month=5)
+        Project.objects.create(project_name="Solo", year=2025, month=5, poc=extra, assign_project=extra)
+
+        buffered = self.client.get(self.url, {'stream': '0'}).json()
+        response = self.client.get(self.url, {'stream': '1'})
+        self.assertTrue(response.streaming)
+        streamed = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(streamed, buffered)
+
+    def test_streams_all_history_without_period(self):
+        self.create_team(2)
+        Resource.objects.create(resource_name="Earlier", year=2024, month=1)
+        self.client.session.flush()
+        self.client.cookies.clear()
+
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        names = [node['text'] for node in json.loads(b''.join(response.streaming_content))]
+        self.assertEqual(names, ['Resource 0', 'Resource 1', 'Earlier'])
+
+    async def test_asgi_streams_from_the_async_orm(self):
+        await sync_to_async(self.create_team)(4)
+        url = reverse('resources:resource_tree', args=[2025, 5])
+        buffered = (await self.async_client.get(url, {'stream': '0'})).json()
+        response = await self.async_client.get(url, {'stream': '1'})
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(b''.join([chunk async for chunk in response.streaming_content])), buffered)
+
+
+    def test_children_endpoint_matches_full_tree(self):
+        self.create_team(4)
+        loner = Resource.objects.create(resource_name="Loner", year=2025, month=5)
+        url = reverse('resources:resource_tree_children')
+        full = self.client.get(self.url).json()
+
+        # session + freshness + resources with their role counts
+        with self.assertNumQueries(3):
+            lazy = self.client.get(url).json()
+
+        self.assertEqual([node['text'] for node in lazy], [node['text'] for node in full])
+        for lazy_node, full_node in zip(lazy, full):
+            self.assertEqual(lazy_node['resource_data'], full_node['resource_data'])
+            self.assertEqual(
+                [group['text'] for group in lazy_node['children']],
+                [group['text'] for group in full_node['children']],
+            )
+            for lazy_group, full_group in zip(lazy_node['children'], full_node['children']):
+                self.assertNotIn('children', lazy_group)
+                projects = self.client.get(url, {'node': lazy_group['id']}).json()
+                self.assertEqual(projects, full_group['children'])
+
+        self.assertFalse(lazy[-1]['has_children'])
+        groups = self.client.get(url, {'node': lazy[0]['id']}).json()
+        self.assertEqual(groups, lazy[0]['children'])
+        self.assertEqual(self.client.get(url, {'resource_id': loner.id}).json()[0]['text'], 'Loner')
+
+    def test_children_endpoint_rejects_unknown_nodes(self):
+        url = reverse('resources:resource_tree_children')
+        self.assertEqual(self.client.get(url, {'node': 'resource:1:other'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'node': 'project:1'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'node': 'resource:999'}).status_code, 404)
+
+
+class ResourceListApiTests(TestCase):
+    """Tests for the resource picker JSON endpoint."""
+
+    def setUp(self):
+        caches['reports'].clear()
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.url = reverse('resources:resource_list_api')
+
+    def test_counts_and_ordering(self):
+        alice = Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        bob = Resource.objects.create(resource_name="Bob", year=2025, month=5)
+        carol = Resource.objects.create(resource_name="Carol", year=2025, month=5)
+        apollo = Project.objects.create(project_name="Apollo", year=2025, month=5, poc=bob, assign_project=bob)
+        apollo.resources.add(alice, bob)
+        gemini = Project.objects.create(project_name="Gemini", year=2025, month=5, poc=bob)
+        gemini.resources.add(bob)
+        # Other periods and soft-deleted projects are not counted
+        Project.objects.create(project_name="Old", year=2024, month=5, poc=carol)
+        Project.objects.create(project_name="Gone", year=2025, month=5, poc=carol, is_active=False)
+
+        with self.assertNumQueries(3):
+            data = self.client.get(self.url).json()
+
+        self.assertEqual([row['name'] for row in data], ['Bob', 'Alice', 'Carol'])
+        self.assertEqual(data[0], {
+            'id': bob.id,
+            'name': 'Bob',
+            'total_projects': 5,
+            'poc_count': 2,
+            'responsible_count': 1,
+            'assigned_count': 2,
+        })
+        self.assertEqual(data[1]['total_projects'], 1)
+        self.assertEqual(data[2]['total_projects'], 0)
+
+    def test_revalidation(self):
+        Resource.objects.create(resource_name="Alice", year=2025, month=5)
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Resource.objects.create(resource_name="Bob", year=2025, month=5)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_cursor_pagination_walks_every_resource(self):
+        for i in range(7):
+            resource = Resource.objects.create(resource_name=f"Resource {i}", year=2025, month=5)
+            for j in range(i % 3):
+                Project.objects.create(project_name=f"P{i}-{j}", year=2025, month=5, poc=resource)
+
+        expected = [row['id'] for row in self.client.get(self.url).json()]
+
+        seen = []
+        params = {'limit': 3}
+        while True:
+            page = self.client.get(self.url, params).json()
+            self.assertLessEqual(len(page['results']), 3)
+            seen.extend(row['id'] for row in page['results'])
+            if not page['next_cursor']:
+                break
+            params['cursor'] = page['next_cursor']
+
+        self.assertEqual(seen, expected)
+
+    def test_invalid_pagination_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'limit': 'ten'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'limit': 5, 'cursor': 'bogus'}).status_code, 400)
+
+
+class ResourceListDataTests(TestCase):
+    """Tests for the DataTables server-side endpoint of the resource list."""
+
+    def setUp(self):
+        session = self.client.session
+        session['selected_year'] = 2025
+        session['selected_month'] = 5
+        session.save()
+        self.url = reverse('resources:resource_list_data')
+        for i in range(9):
+            Resource.objects.create(
+                resource_name=f"{'Alice' if i % 2 else 'Bob'} {i}", year=2025, month=5, present_day=i % 3
+            )
+        Resource.objects.create(resource_name="Alice old", year=2024, month=5)
+        Resource.objects.create(resource_name="Alice gone", year=2025, month=5, is_active=False)
+
+    def test_page_of_rows(self):
+        # session + freshness + count + page
+        with self.assertNumQueries(4):
+            data = self.client.get(self.url, {'draw': 1, 'length': 4, 'order[0][column]': 1}).json()
+        self.assertEqual(data['recordsTotal'], 9)
+        self.assertEqual([row['resource_name'] for row in data['data']], ['Alice 1', 'Alice 3', 'Alice 5', 'Alice 7'])
+        self.assertEqual(data['data'][0]['edit_url'], reverse('resources:resource_update', args=[data['data'][0]['id']]))
+
+    def test_search_and_sort(self):
+        data = self.client.get(self.url, {
+            'search[value]': 'bob', 'order[0][column]': 3, 'order[0][dir]': 'desc', 'length': 2,
+        }).json()
+        self.assertEqual(data['recordsFiltered'], 5)
+        self.assertEqual([row['resource_name'] for row in data['data']], ['Bob 8', 'Bob 2'])  # ties broken by id in the same direction
+
+    def test_keyset_cursor_matches_offset_paging(self):
+        params = {'order[0][column]': 3, 'order[0][dir]': 'asc', 'length': 4}
+        by_offset = []
+        for start in range(0, 9, 4):
+            by_offset.extend(row['id'] for row in self.client.get(self.url, dict(params, start=start)).json()['data'])
+
+        by_cursor = []
+        start, cursor = 0, ''
+        while True:
+            page = self.client.get(self.url, dict(params, start=start, cursor=cursor)).json()
+            by_cursor.extend(row['id'] for row in page['data'])
+            if not page['next_cursor']:
+                break
+            start, cursor = start + 4, page['next_cursor']
+
+        self.assertEqual(by_cursor, by_offset)
+
+    def test_keyset_cursor_pages_through_null_working_days(self):
+        Resource.objects.filter(resource_name__startswith='Bob').update(working_days=None)
+        params = {'order[0][column]': 2, 'order[0][dir]': 'desc', 'length': 2}
+        by_cursor = []
+        start, cursor = 0, ''
+        while True:
+            page = self.client.get(self.url, dict(params, start=start, cursor=cursor)).json()
+            by_cursor.extend(row['id'] for row in page['data'])
+            if not page['next_cursor']:
+                break
+            start, cursor = start + 2, page['next_cursor']
+
+        self.assertEqual(len(set(by_cursor)), 9)
+        self.assertEqual([row['working_days'] for row in page['data']][-1], None)  # NULLs last
+
+    def test_requires_selected_period(self):
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+
+class ImportResourceExcelTests(TestCase):
+    """Tests for the streaming resource importer."""
+
+    def write_workbook(self, rows, title='Sheet'):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = title
+        for row in rows:
+            sheet.append(row)
+        path = Path(self.tmpdir.name) / 'hr_export.xlsx'
+        workbook.save(path)
+        return str(path)
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_period_from_sheet_title(self):
+        path = self.write_workbook([
+            [None, 'Total No. Of working Days', 'Present Days'],
+            ['Alice', 22, 20],
+            ['Bob', None, 10.5],
+            [None, None, None],
+        ], title='May 2025')
+        call_command('import_resource_excel', path, stdout=io.StringIO())
+
+        alice = Resource.objects.get(resource_name='Alice')
+        self.assertEqual((alice.year, alice.month, alice.working_days), (2025, 5, 22))
+        self.assertEqual(alice.present_hours, 160)
+        bob = Resource.objects.get(resource_name='Bob')
+        self.assertEqual(bob.working_days, Resource.get_working_days(2025, 5))
+        self.assertEqual(bob.present_hours, 84)
+
+    def test_updates_existing_resources_in_batches(self):
+        Resource.objects.create(resource_name='Alice', year=2024, month=2, present_day=1)
+        rows = [['Resource Name', 'Present Days']] + [[f'R{i}', i] for i in range(25)] + [['Alice', 18]]
+        path = self.write_workbook(rows)
+        call_command(
+            'import_resource_excel', path, year=2024, month=2, batch_size=10, stdout=io.StringIO()
+        )
+
+        self.assertEqual(Resource.objects.filter(year=2024, month=2).count(), 26)
+        alice = Resource.objects.get(resource_name='Alice')
+        self.assertEqual((alice.present_day, alice.present_hours), (18, 144))
+
+    def test_year_and_month_columns(self):
+        path = self.write_workbook([
+            ['Name', 'Year', 'Month', 'Present Days'],
+            ['Alice', 2025, 1, 5],
+            ['Alice', 2025, 2, 6],
+        ])
+        call_command('import_resource_excel', path, stdout=io.StringIO())
+        self.assertEqual(
+            list(Resource.objects.order_by('month').values_list('month', 'present_day')), [(1, 5), (2, 6)]
+        )
+
+    def test_undetectable_period(self):
+        path = self.write_workbook([['Name', 'Present Days'], ['Alice', 5]])
+        with self.assertRaises(CommandError):
+            call_command('import_resource_excel', path, stdout=io.StringIO())
+
+    def test_detect_period(self):
+        self.assertEqual(detect_period('HR export May 2025'), (2025, 5))
+        self.assertEqual(detect_period('Sheet1', 'attendance_2024-11'), (2024, 11))
+        self.assertIsNone(detect_period('Sheet1', 'attendance'))
+
+
+class WorkingDaysTests(TestCase):
+    """Tests for the working-day calendar service."""
+
+    def tearDown(self):
+        working_days.clear_cache()
+
+    def test_default_rule(self):
+        # May 2025: 22 weekdays + Saturday 3rd
+        self.assertEqual(Resource.get_working_days(2025, 5), 23)
+        # February 2026 starts on a Sunday: 20 weekdays + Saturday 7th
+        self.assertEqual(Resource.get_working_days(2026, 2), 21)
+        self.assertEqual(Resource.get_working_days(None, 5), 0)
+
+    def test_range_matches_single_months(self):
+        months = working_days.working_days_range((2024, 11), (2025, 2))
+        self.assertEqual(list(months), [(2024, 11), (2024, 12), (2025, 1), (2025, 2)])
+        for (year, month), days in months.items():
+            self.assertEqual(days, working_days.working_days(year, month))
+
+    def test_holidays_and_half_days(self):
+        calendar = {
+            # Thursday, first Saturday and a Sunday (not worked anyway)
+            'HOLIDAYS': ['2025-05-01', '2025-05-03', '2025-05-04'],
+            # Half day on a Friday, plus one on a holiday that must not count twice
+            'HALF_DAYS': ['2025-05-30', '2025-05-01'],
+        }
+        with self.settings(WORKING_CALENDAR=calendar):
+            self.assertEqual(Resource.get_working_days(2025, 5), 20.5)
+            self.assertEqual(Resource.get_working_days(2025, 6), 22)
+        self.assertEqual(Resource.get_working_days(2025, 5), 23)
 
-# Create your tests here.
+    def test_save_uses_calendar(self):
+        with self.settings(WORKING_CALENDAR={'HOLIDAYS': ['2025-05-01']}):
+            resource = Resource.objects.create(resource_name='Alice', year=2025, month=5)
+        self.assertEqual(resource.working_days, 22)
@@ -1,15 +1,20 @@
 from django.urls import path
+from projects.periods import period_paths
 from . import views
 
 app_name = "resources"
 
 urlpatterns = [
-    path("", views.resource_list, name="resource_list"),  # List all resources at /resources/
-    path("create/", views.resource_create, name="resource_create"),
+    *period_paths("", views.resource_list, "resource_list"),  # List all resources at /resources/
+    *period_paths("data/", views.resource_list_data, "resource_list_data"),
+    *period_paths("create/", views.resource_create, "resource_create"),
     path("update/<int:pk>/", views.resource_update, name="resource_update"),
     path("delete/<int:pk>/", views.resource_delete, name="resource_delete"),
-    path("resource-canvas-tree/", views.resource_canvas_tree_visualization, name="resource_canvas_tree_visualization"),
+    *period_paths(
+        "resource-canvas-tree/", views.resource_canvas_tree_visualization, "resource_canvas_tree_visualization"
+    ),
     
-    path("resource-tree/", views.resource_tree_view, name="resource_tree"),
-    path("resource-list-api/", views.resource_list_api, name="resource_list_api"),
-]
\ No newline at end of file
+    *period_paths("resource-tree/", views.resource_tree_view, "resource_tree"),
+    *period_paths("resource-tree/children/", views.resource_tree_children, "resource_tree_children"),
+    *period_paths("resource-list-api/", views.resource_list_api, "resource_list_api"),
+]
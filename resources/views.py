@@ -1,38 +1,89 @@
+import base64
+import json
+from collections import defaultdict
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.http import JsonResponse
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Q, Subquery
 from .models import Resource
 from .forms import ResourceForm
 from django.contrib import messages
+from projects.conditional import period_conditional
+from projects.datatables import datatables_response
+from projects.read_cache import acached_read
+from projects.replica import replica_reads
 from projects.models import Project
+from projects.periods import aresolve_period, resolve_period
+from projects.streaming import (
+    TREE_CHUNK_SIZE, achunked, chunked, serves_async, streaming_json_response, wants_streaming,
+)
 
 
-def resource_list(request):
-    # Get year and month from session (set by home page)
-    selected_year = request.session.get('selected_year')
-    selected_month = request.session.get('selected_month')
+def resource_list(request, year=None, month=None):
+    # Get year and month from the URL, else the session default (set by home page)
+    selected_year, selected_month = resolve_period(request, year, month)
     
-    # If no session values, redirect to home page to set them
+    # If no period is selected, redirect to home page to set one
     if not selected_year or not selected_month:
-        return redirect('dashboard_home')
-    
-    resources = Resource.active_objects.all()  # Only show active resources
-    resources = resources.filter(year=selected_year, month=selected_month)
+        return redirect('projects:home')
     
+    # Rows are loaded page by page from resource_list_data
     return render(request, 'resources/resource_list.html', {
-        'resources': resources,
         'title': 'Resources',
         'selected_year': selected_year,
         'selected_month': selected_month,
     })
 
-def resource_create(request):
-    # Get year/month from session (set by dashboard)
-    year = request.session.get('selected_year')
-    month = request.session.get('selected_month')
+
+# DataTables column index -> sort field for resources/resource_list.html
+RESOURCE_LIST_SORT_COLUMNS = {
+    1: 'resource_name',
+    2: 'working_days',
+    3: 'present_day',
+    4: 'present_hours',
+    5: 'year',
+    6: 'month',
+}
+
+
+def _resource_row(resource, number):
+    return {
+        'number': number,
+        'id': resource.id,
+        'resource_name': resource.resource_name,
+        'working_days': resource.working_days,
+        'present_day': resource.present_day,
+        'present_hours': resource.present_hours,
+        'year': resource.year,
+        'month': resource.month,
+        'edit_url': reverse('resources:resource_update', args=[resource.pk]),
+        'delete_url': reverse('resources:resource_delete', args=[resource.pk]),
+    }
+
+
+@replica_reads
+@period_conditional
+def resource_list_data(request, year=None, month=None):
+    """DataTables server-side endpoint for the resource list page."""
+    selected_year, selected_month = resolve_period(request, year, month)
+    if not selected_year or not selected_month:
+        return JsonResponse({'error': 'No period selected'}, status=400)
+
+    resources = Resource.active_objects.filter(year=selected_year, month=selected_month)
+    return datatables_response(
+        request, resources, RESOURCE_LIST_SORT_COLUMNS,
+        lambda queryset, term: queryset.filter(resource_name__icontains=term),
+        _resource_row,
+    )
+
+
+def resource_create(request, year=None, month=None):
+    # The period of the page the form was opened from, else the session default (set by dashboard)
+    year, month = resolve_period(request, year, month)
     
     if not (year and month):
         messages.warning(request, 'Please select year and month from dashboard before adding a resource.')
-        return redirect('dashboard_home')
+        return redirect('projects:home')
         
     if request.method == 'POST':
         form = ResourceForm(request.POST)
@@ -42,10 +93,13 @@ def resource_create(request):
             resource.month = month
             resource.save()
             messages.success(request, 'Resource created successfully.')
-            return redirect('resources:resource_list')
+            return redirect('resources:resource_list', year, month)
     else:
         form = ResourceForm()
-    return render(request, 'resources/resource_form.html', {'form': form, 'title': 'Add Resource', 'year': year, 'month': month})
+    return render(request, 'resources/resource_form.html', {
+        'form': form, 'title': 'Add Resource', 'year': year, 'month': month,
+        'list_url': reverse('resources:resource_list', args=[year, month]),
+    })
  
  
 def resource_update(request, pk):
@@ -55,35 +109,220 @@ def resource_update(request, pk):
         if form.is_valid():
             form.save()
             messages.success(request, 'Resource updated successfully.')
-            return redirect('resources:resource_list')
+            return redirect('resources:resource_list', resource.year, resource.month)
     else:
         form = ResourceForm(instance=resource)
-    return render(request, 'resources/resource_form.html', {'form': form, 'title': 'Edit Resource'})
+    return render(request, 'resources/resource_form.html', {
+        'form': form, 'title': 'Edit Resource',
+        'list_url': reverse('resources:resource_list', args=[resource.year, resource.month]),
+    })
  
 def resource_delete(request, pk):
     resource = get_object_or_404(Resource, pk=pk)
     if request.method == 'POST':
         resource.soft_delete()  # Use soft delete instead of actual deletion
         messages.success(request, 'Resource deleted successfully.')
-        return redirect('resources:resource_list')
-    return render(request, 'resources/resource_confirm_delete.html', {'resource': resource})
+        return redirect('resources:resource_list', resource.year, resource.month)
+    return render(request, 'resources/resource_confirm_delete.html', {
+        'resource': resource,
+        'list_url': reverse('resources:resource_list', args=[resource.year, resource.month]),
+    })
 
 
-def resource_canvas_tree_visualization(request):
+def resource_canvas_tree_visualization(request, year=None, month=None):
     """Render the interactive Canvas-based resource tree visualization page."""
     return render(request, 'resources/resource_canvas_tree.html')
 
 
-def resource_tree_view(request):
-    """API endpoint that returns optimized resource tree data with all relationships."""
-    # Get year and month from session
-    selected_year = request.session.get('selected_year')
-    selected_month = request.session.get('selected_month')
+def _memberships(projects, resources):
+    # Membership rows for the period, restricted with subqueries so the
+    # parameter count does not grow with the number of projects/resources
+    return Project.resources.through.objects.filter(
+        project__in=projects.values('id'),
+        resource__in=resources.values('id'),
+    ).values_list('project_id', 'resource_id')
+
+
+def _group_projects_by_resource(projects, resources):
+    """
+    Bucket the given projects into POC / responsible / assigned-only lists per
+    resource id. The M2M through-table is read once for the whole period
+    instead of once per resource, and project order is kept in every bucket.
+    """
+    return _bucket_projects(
+        _memberships(projects, resources),
+        projects.only('id', 'project_name', 'poc_id', 'assign_project_id'),
+    )
+
+
+async def _agroup_projects_by_resource(projects, resources):
+    """Async ``_group_projects_by_resource`` (same two queries)."""
+    return _bucket_projects(
+        [row async for row in _memberships(projects, resources)],
+        [project async for project in projects.only('id', 'project_name', 'poc_id', 'assign_project_id')],
+    )
+
+
+def _bucket_projects(membership_rows, projects):
+    poc_map = defaultdict(list)
+    responsible_map = defaultdict(list)
+    assigned_map = defaultdict(list)
+
+    members = defaultdict(list)
+    for project_id, resource_id in membership_rows:
+        members[project_id].append(resource_id)
+
+    for project in projects:
+        if project.poc_id:
+            poc_map[project.poc_id].append(project)
+        if project.assign_project_id:
+            responsible_map[project.assign_project_id].append(project)
+        for resource_id in members[project.id]:
+            # Assigned-only excludes projects where the resource is POC or responsible
+            if resource_id != project.poc_id and resource_id != project.assign_project_id:
+                assigned_map[resource_id].append(project)
+
+    return poc_map, responsible_map, assigned_map
+
+
+# Project groups under a resource node: (key, node type, label, group icon, project icon)
+RESOURCE_TREE_GROUPS = [
+    ('poc', 'pocProjects', 'POC Projects', 'fas fa-crown', 'fas fa-bullseye'),
+    ('responsible', 'responsibleProjects', 'Responsible Projects', 'fas fa-user-tie', 'fas fa-clipboard-check'),
+    ('assigned', 'assignedProjects', 'Assigned Projects', 'fas fa-tasks', 'fas fa-project-diagram'),
+]
+
+
+def _group_project_nodes(projects, icon):
+    return [{"text": f"{project.project_name}", "icon": icon, "type": "project"} for project in projects]
+
+
+def _resource_node(resource, groups, counts):
+    """Main resource node; ``counts`` maps each group key to its project count."""
+    return {
+        "text": f"{resource.resource_name}",
+        "icon": "fas fa-user-circle",
+        "opened": True,
+        "children": groups,
+        "type": "resource",
+        "resource_data": {
+            "id": resource.id,
+            "name": resource.resource_name,
+            "total_projects": sum(counts.values()),
+            "poc_count": counts['poc'],
+            "responsible_count": counts['responsible'],
+            "assigned_count": counts['assigned']
+        }
+    }
+
+
+def _resource_tree_node(resource, poc_projects, responsible_projects, assigned_only_projects):
+    """Tree node of one resource with its POC / responsible / assigned-only project groups."""
+    projects_by_group = {
+        'poc': poc_projects,
+        'responsible': responsible_projects,
+        # Assigned-only excludes POC and responsible projects
+        'assigned': assigned_only_projects,
+    }
+    groups = [
+        {
+            "text": f"{label} ({len(projects_by_group[key])})",
+            "icon": group_icon,
+            "children": _group_project_nodes(projects_by_group[key], project_icon),
+            "opened": False,
+            "type": node_type
+        }
+        for key, node_type, label, group_icon, project_icon in RESOURCE_TREE_GROUPS
+        if projects_by_group[key]
+    ]
+    return _resource_node(resource, groups, {key: len(projects) for key, projects in projects_by_group.items()})
+
+
+def _count_subquery(queryset):
+    """Correlated COUNT(*) of ``queryset`` (already filtered on an ``OuterRef``)."""
+    return Subquery(
+        queryset.order_by().annotate(count=Func(F('pk'), function='COUNT')).values('count'),
+        output_field=IntegerField(),
+    )
+
+
+def _role_projects(projects, key, resource_id):
+    """The active ``projects`` in which the resource plays the role of group ``key``."""
+    if key == 'poc':
+        return projects.filter(poc_id=resource_id)
+    if key == 'responsible':
+        return projects.filter(assign_project_id=resource_id)
+    return projects.filter(resources=resource_id).exclude(poc_id=resource_id).exclude(assign_project_id=resource_id)
+
+
+def _resources_by_tree_total(resources, projects):
+    """
+    ``resources`` ordered like the resource tree (total projects desc, name),
+    with the POC / responsible / assigned-only counts (``<key>_tree_count``)
+    computed in SQL so the nodes can be produced in order without loading the
+    whole tree first.
+    """
+    # Correlated per resource; the assigned-only count goes from the project
+    # side so the membership join can use the resource index
+    counts = {
+        f'{key}_tree_count': _count_subquery(_role_projects(projects, key, OuterRef('pk')))
+        for key, *_ in RESOURCE_TREE_GROUPS
+    }
+    return resources.annotate(**counts).annotate(
+        tree_total=F('poc_tree_count') + F('responsible_tree_count') + F('assigned_tree_count'),
+    ).order_by('-tree_total', 'resource_name', 'id')
+
+
+def _chunk_projects(projects, chunk):
+    """The ``projects`` related to a chunk of resources, and those resources, for grouping."""
+    ids = [resource.id for resource in chunk]
+    related = projects.filter(
+        Q(poc_id__in=ids) | Q(assign_project_id__in=ids) | Q(resources__in=ids)
+    ).distinct()
+    return related, Resource.objects.filter(id__in=ids)
+
+
+def _chunk_nodes(chunk, grouped):
+    poc_map, responsible_map, assigned_map = grouped
+    for resource in chunk:
+        yield _resource_tree_node(
+            resource, poc_map[resource.id], responsible_map[resource.id], assigned_map[resource.id]
+        )
+
+
+def _stream_resource_nodes(resources, projects):
+    """Yield resource tree nodes in tree order, grouping projects one chunk of resources at a time."""
+    ordered = _resources_by_tree_total(resources, projects).only('id', 'resource_name')
+    for chunk in chunked(ordered.iterator(chunk_size=TREE_CHUNK_SIZE), TREE_CHUNK_SIZE):
+        yield from _chunk_nodes(chunk, _group_projects_by_resource(*_chunk_projects(projects, chunk)))
+
+
+async def _astream_resource_nodes(resources, projects):
+    """Async ``_stream_resource_nodes``, for responses served by ASGI."""
+    ordered = _resources_by_tree_total(resources, projects).only('id', 'resource_name')
+    async for chunk in achunked(ordered.aiterator(chunk_size=TREE_CHUNK_SIZE), TREE_CHUNK_SIZE):
+        grouped = await _agroup_projects_by_resource(*_chunk_projects(projects, chunk))
+        for node in _chunk_nodes(chunk, grouped):
+            yield node
+
+
+@replica_reads
+@period_conditional
+async def resource_tree_view(request, year=None, month=None):
+    """
+    API endpoint that returns optimized resource tree data with all relationships.
+
+    Without a selected period (every month of history) or with ``?stream=1``
+    the nodes are streamed one chunk of resources at a time, ordered in SQL.
+    Async: the queries run through the async ORM.
+    """
+    # Get year and month from the URL, else the session default
+    selected_year, selected_month = await aresolve_period(request, year, month)
     
     # Get selected resource ID from request
     selected_resource_id = request.GET.get('resource_id')
     
-    # Filter out soft-deleted resources (only active resources) and by session year/month
+    # Filter out soft-deleted resources (only active resources) and by the selected year/month
     resources = Resource.objects.filter(is_active=True)
     
     if selected_year and selected_month:
@@ -96,162 +335,206 @@ def resource_tree_view(request):
         except (ValueError, TypeError):
             pass  # Invalid resource_id, show all resources
     
-    resources = resources.prefetch_related('assigned_projects', 'poc', 'project_assigned_to').all()
-    
-    # Create comprehensive resource nodes
-    resource_trees = []
-    
-    for resource in resources:
-        # Get projects efficiently with single queries
-        base_filter = {'is_active': True}
-        if selected_year and selected_month:
-            base_filter.update({'year': selected_year, 'month': selected_month})
-        
-        # Get projects where this resource is POC
-        poc_projects = Project.objects.filter(poc=resource, **base_filter)
-        
-        # Get projects where this resource is directly assigned/responsible
-        responsible_projects = Project.objects.filter(assign_project=resource, **base_filter)
-        
-        # Get projects where this resource is assigned (many-to-many)
-        assigned_projects = Project.objects.filter(resources=resource, **base_filter)
-        
-        children = []
-        
-        # Track counts for summary
-        poc_count = poc_projects.count()
-        responsible_count = responsible_projects.count()
-        assigned_only_count = 0
-        
-        # Add POC projects
-        if poc_count > 0:
-            poc_children = []
-            for project in poc_projects:
-                project_node = {
-                    "text": f"{project.project_name}",
-                    "icon": "fas fa-bullseye",
-                    "type": "project"
-                }
-                poc_children.append(project_node)
-                
-            children.append({
-                "text": f"POC Projects ({poc_count})",
-                "icon": "fas fa-crown",
-                "children": poc_children,
-                "opened": False,
-                "type": "pocProjects"
-            })
-        
-        # Add responsible projects
-        if responsible_count > 0:
-            resp_children = []
-            for project in responsible_projects:
-                project_node = {
-                    "text": f"{project.project_name}",
-                    "icon": "fas fa-clipboard-check",
-                    "type": "project"
-                }
-                resp_children.append(project_node)
-                
-            children.append({
-                "text": f"Responsible Projects ({responsible_count})",
-                "icon": "fas fa-user-tie",
-                "children": resp_children,
-                "opened": False,
-                "type": "responsibleProjects"
-            })
-        
-        # Add assigned-only projects (excluding POC and responsible)
-        assigned_only = []
-        for project in assigned_projects:
-            if project.poc != resource and project.assign_project != resource:
-                project_node = {
-                    "text": f"{project.project_name}",
-                    "icon": "fas fa-project-diagram",
-                    "type": "project"
-                }
-                assigned_only.append(project_node)
-                assigned_only_count += 1
-        
-        if assigned_only_count > 0:
-            children.append({
-                "text": f"Assigned Projects ({assigned_only_count})",
-                "icon": "fas fa-tasks",
-                "children": assigned_only,
-                "opened": False,
-                "type": "assignedProjects"
-            })
-        
-        # Calculate total projects
-        total_projects = poc_count + responsible_count + assigned_only_count
-        
-        # Create main resource node
-        resource_node = {
-            "text": f"{resource.resource_name}",
-            "icon": "fas fa-user-circle",
-            "opened": True,
-            "children": children,
-            "type": "resource",
-            "resource_data": {
-                "id": resource.id,
-                "name": resource.resource_name,
-                "total_projects": total_projects,
-                "poc_count": poc_count,
-                "responsible_count": responsible_count,
-                "assigned_count": assigned_only_count
-            }
-        }
-        
-        resource_trees.append(resource_node)
-    
-    # Sort resources by total projects (descending) and then by name
-    resource_trees.sort(key=lambda x: (-x['resource_data']['total_projects'], x['resource_data']['name']))
-    
+    # Load every project of the period once and group it in memory
+    projects = Project.objects.filter(is_active=True)
+    if selected_year and selected_month:
+        projects = projects.filter(year=selected_year, month=selected_month)
+
+    if wants_streaming(request, selected_year, selected_month):
+        stream = _astream_resource_nodes if serves_async(request) else _stream_resource_nodes
+        return streaming_json_response(stream(resources, projects))
+
+    async def build_tree():
+        poc_map, responsible_map, assigned_map = await _agroup_projects_by_resource(projects, resources)
+
+        # Create comprehensive resource nodes
+        resource_trees = [
+            _resource_tree_node(resource, poc_map[resource.id], responsible_map[resource.id], assigned_map[resource.id])
+            async for resource in resources.only('id', 'resource_name')
+        ]
+
+        # Sort resources by total projects (descending) and then by name
+        resource_trees.sort(key=lambda x: (-x['resource_data']['total_projects'], x['resource_data']['name']))
+        return resource_trees
+
+    resource_trees = await acached_read(
+        'resource_tree', selected_year, selected_month, build_tree, resource_id=selected_resource_id
+    )
     return JsonResponse(resource_trees, safe=False)
 
 
-def resource_list_api(request):
-    """API endpoint that returns a list of resources for selection."""
-    # Get year and month from session
-    selected_year = request.session.get('selected_year')
-    selected_month = request.session.get('selected_month')
+def _lazy_resource_groups(resource):
+    """Collapsed group nodes of a resource annotated by ``_resources_by_tree_total``."""
+    return [
+        {
+            "id": f"resource:{resource.id}:{key}",
+            "text": f"{label} ({getattr(resource, f'{key}_tree_count')})",
+            "icon": group_icon,
+            "opened": False,
+            "type": node_type,
+            "has_children": True,
+        }
+        for key, node_type, label, group_icon, _ in RESOURCE_TREE_GROUPS
+        if getattr(resource, f'{key}_tree_count')
+    ]
+
+
+@replica_reads
+@period_conditional
+def resource_tree_children(request, year=None, month=None):
+    """
+    Direct children of one node of the resource tree, for canvases that expand
+    nodes on demand.
+
+    Without ``node`` the resource nodes are returned in tree order (optionally
+    just ``resource_id``), each with its collapsed POC / responsible /
+    assigned group nodes, which come from the same query's counts.
+    ``node=resource:<id>`` gives those group nodes alone and
+    ``node=resource:<id>:<poc|responsible|assigned>`` the group's projects.
+    """
+    # Get year and month from the URL, else the session default
+    selected_year, selected_month = resolve_period(request, year, month)
+
+    projects = Project.objects.filter(is_active=True)
+    if selected_year and selected_month:
+        projects = projects.filter(year=selected_year, month=selected_month)
+
+    node = request.GET.get('node')
+    if not node:
+        resources = Resource.objects.filter(is_active=True)
+        if selected_year and selected_month:
+            resources = resources.filter(year=selected_year, month=selected_month)
+        selected_resource_id = request.GET.get('resource_id')
+        if selected_resource_id and selected_resource_id.isdigit():
+            resources = resources.filter(id=selected_resource_id)
+
+        return JsonResponse([
+            _resource_node(
+                resource,
+                _lazy_resource_groups(resource),
+                {key: getattr(resource, f'{key}_tree_count') for key, *_ in RESOURCE_TREE_GROUPS},
+            ) | {"id": f"resource:{resource.id}", "has_children": resource.tree_total > 0}
+            for resource in _resources_by_tree_total(resources, projects).only('id', 'resource_name')
+        ], safe=False)
+
+    kind, _, rest = node.partition(':')
+    resource_id, _, group = rest.partition(':')
+    groups = {key: (node_type, project_icon) for key, node_type, _, _, project_icon in RESOURCE_TREE_GROUPS}
+    if kind != 'resource' or not resource_id.isdigit() or (group and group not in groups):
+        return JsonResponse({'error': 'Invalid node'}, status=400)
+
+    if group:
+        role_projects = _role_projects(projects, group, int(resource_id)).only('project_name')
+        return JsonResponse(_group_project_nodes(role_projects, groups[group][1]), safe=False)
+
+    resource = _resources_by_tree_total(
+        Resource.objects.filter(is_active=True, pk=resource_id), projects
+    ).only('id').first()
+    if resource is None:
+        return JsonResponse({'error': 'Unknown node'}, status=404)
+    return JsonResponse(_lazy_resource_groups(resource), safe=False)
+
+
+def _encode_cursor(row):
+    """Opaque keyset cursor pointing just after ``row`` in list-API order."""
+    payload = json.dumps([row['total_projects'], row['resource_name'], row['id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """Reverse of ``_encode_cursor``; returns None for a malformed cursor."""
+    try:
+        total, name, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(total), str(name), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+@replica_reads
+@period_conditional
+async def resource_list_api(request, year=None, month=None):
+    """
+    API endpoint that returns a list of resources for selection (async ORM).
+
+    Project counts are computed by one annotated query. Pass ``limit`` (and the
+    ``next_cursor`` of the previous page as ``cursor``) to page through the
+    list; the response is then an object with ``results`` and ``next_cursor``.
+    """
+    # Get year and month from the URL, else the session default
+    selected_year, selected_month = await aresolve_period(request, year, month)
     
     resources = Resource.objects.filter(is_active=True)
     
     if selected_year and selected_month:
         resources = resources.filter(year=selected_year, month=selected_month)
-    
-    # Get project counts for each resource
-    resource_list = []
-    for resource in resources:
-        # Count total projects for this resource
-        poc_count = Project.objects.filter(poc=resource, is_active=True).count()
-        responsible_count = Project.objects.filter(assign_project=resource, is_active=True).count()
-        assigned_count = Project.objects.filter(resources=resource, is_active=True).count()
-        
+
+    # Count only active projects (of the selected period, when there is one)
+    def project_filter(relation):
+        conditions = {f'{relation}__is_active': True}
         if selected_year and selected_month:
-            poc_count = Project.objects.filter(
-                poc=resource, is_active=True, year=selected_year, month=selected_month
-            ).count()
-            responsible_count = Project.objects.filter(
-                assign_project=resource, is_active=True, year=selected_year, month=selected_month
-            ).count()
-            assigned_count = Project.objects.filter(
-                resources=resource, is_active=True, year=selected_year, month=selected_month
-            ).count()
-        
-        total_projects = poc_count + responsible_count + assigned_count
-        
-        resource_list.append({
-            'id': resource.id,
-            'name': resource.resource_name,
-            'total_projects': total_projects,
-            'poc_count': poc_count,
-            'responsible_count': responsible_count,
-            'assigned_count': assigned_count
-        })
-    
-    # Sort by total projects (descending) and then by name
-    resource_list.sort(key=lambda x: (-x['total_projects'], x['name']))
-    
+            conditions.update({f'{relation}__year': selected_year, f'{relation}__month': selected_month})
+        return Q(**conditions)
+
+    # distinct=True because the three joins multiply each other's rows
+    resources = resources.annotate(
+        poc_count=Count('poc', filter=project_filter('poc'), distinct=True),
+        responsible_count=Count(
+            'project_assigned_to', filter=project_filter('project_assigned_to'), distinct=True
+        ),
+        assigned_count=Count('assigned_projects', filter=project_filter('assigned_projects'), distinct=True),
+    ).annotate(
+        total_projects=F('poc_count') + F('responsible_count') + F('assigned_count'),
+    ).order_by('-total_projects', 'resource_name', 'id').values(
+        'id', 'resource_name', 'total_projects', 'poc_count', 'responsible_count', 'assigned_count'
+    )
+
+    limit = request.GET.get('limit')
+    if limit:
+        try:
+            limit = max(1, min(int(limit), 500))
+        except ValueError:
+            return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+        cursor = request.GET.get('cursor')
+        if cursor:
+            position = _decode_cursor(cursor)
+            if position is None:
+                return JsonResponse({'error': 'Invalid cursor'}, status=400)
+            total, name, pk = position
+            # Keyset condition matching the ORDER BY above (runs as HAVING)
+            resources = resources.filter(
+                Q(total_projects__lt=total)
+                | Q(total_projects=total, resource_name__gt=name)
+                | Q(total_projects=total, resource_name=name, id__gt=pk)
+            )
+
+        async def read_page():
+            # Fetch one extra row to know whether another page exists
+            rows = [row async for row in resources[:limit + 1]]
+            next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+            return {
+                'results': [_resource_list_entry(row) for row in rows[:limit]],
+                'next_cursor': next_cursor,
+            }
+
+        page = await acached_read(
+            'resource_list_api', selected_year, selected_month, read_page, limit=limit, cursor=cursor
+        )
+        return JsonResponse(page)
+
+    async def read_resources():
+        return [_resource_list_entry(row) async for row in resources]
+
+    resource_list = await acached_read('resource_list_api', selected_year, selected_month, read_resources)
     return JsonResponse(resource_list, safe=False)
+
+
+def _resource_list_entry(row):
+    return {
+        'id': row['id'],
+        'name': row['resource_name'],
+        'total_projects': row['total_projects'],
+        'poc_count': row['poc_count'],
+        'responsible_count': row['responsible_count'],
+        'assigned_count': row['assigned_count']
+    }
@@ -0,0 +1,93 @@
+"""
+Working-day calendar used for Resource.working_days.
+
+A month's working days are Mon–Fri plus the first Saturday, minus the
+holidays in ``settings.WORKING_CALENDAR['HOLIDAYS']``. Each date in
+``settings.WORKING_CALENDAR['HALF_DAYS']`` that would otherwise be worked
+counts as half a day.
+
+Single months are memoised; ``working_days_for_periods`` and
+``working_days_range`` compute many months in one vectorised numpy pass for
+bulk imports and reports. numpy is imported on first use so that loading the
+models does not pay for it.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+WEEKMASK = '1111100'  # Mon–Fri; the first Saturday is added separately
+
+
+def _calendar_setting(name):
+    return tuple(sorted(set(getattr(settings, 'WORKING_CALENDAR', {}).get(name, ()))))
+
+
+@lru_cache(maxsize=None)
+def _calendar_tables():
+    """Holiday and (worked) half-day dates as sorted numpy date arrays."""
+    import numpy as np
+
+    holidays = np.array(_calendar_setting('HOLIDAYS'), dtype='datetime64[D]')
+    half_days = np.array(_calendar_setting('HALF_DAYS'), dtype='datetime64[D]')
+    if half_days.size:
+        # A half day only counts if the date is otherwise a working day
+        day_of_month = (half_days - half_days.astype('datetime64[M]')).astype(int) + 1
+        first_saturday = np.is_busday(half_days, weekmask='0000010') & (day_of_month <= 7)
+        worked = np.is_busday(half_days, weekmask=WEEKMASK) | first_saturday
+        half_days = half_days[worked & ~np.isin(half_days, holidays)]
+    return holidays, half_days
+
+
+def working_days_for_periods(periods):
+    """Return {(year, month): working days} for any iterable of periods in one pass."""
+    import numpy as np
+
+    periods = list(dict.fromkeys((int(year), int(month)) for year, month in periods))
+    if not periods:
+        return {}
+    holidays, half_days = _calendar_tables()
+
+    starts = np.array([f'{year:04d}-{month:02d}' for year, month in periods], dtype='datetime64[M]')
+    starts_d = starts.astype('datetime64[D]')
+    ends_d = (starts + 1).astype('datetime64[D]')
+
+    weekdays = np.busday_count(starts_d, ends_d, weekmask=WEEKMASK, holidays=holidays)
+    # Day offset of the first Saturday: 1970-01-01 was a Thursday (weekday 3)
+    weekday_of_start = (starts_d.astype(int) + 3) % 7
+    first_saturdays = starts_d + (5 - weekday_of_start) % 7
+    saturdays = (~np.isin(first_saturdays, holidays)).astype(int)
+    halves = np.searchsorted(half_days, ends_d) - np.searchsorted(half_days, starts_d)
+
+    totals = weekdays + saturdays - 0.5 * halves
+    return {
+        period: int(total) if float(total).is_integer() else float(total)
+        for period, total in zip(periods, totals.tolist())
+    }
+
+
+def working_days_range(start, end):
+    """Working days for every month from ``start`` to ``end`` inclusive, as (year, month) pairs."""
+    (start_year, start_month), (end_year, end_month) = start, end
+    first = start_year * 12 + start_month - 1
+    last = end_year * 12 + end_month - 1
+    return working_days_for_periods((index // 12, index % 12 + 1) for index in range(first, last + 1))
+
+
+@lru_cache(maxsize=512)
+def working_days(year, month):
+    """Working days of one month (memoised)."""
+    return working_days_for_periods([(year, month)])[(int(year), int(month))]
+
+
+def clear_cache():
+    """Forget memoised results, e.g. after the holiday table changed."""
+    _calendar_tables.cache_clear()
+    working_days.cache_clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting == 'WORKING_CALENDAR':
+        clear_cache()